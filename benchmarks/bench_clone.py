@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""Compare building a virtual environment from scratch with cloning a template.
+
+A golden template is built once for the interpreter. It is then cloned with
+each method of '_CLONE_METHODS'. Methods the file system does not support
+fall back to the next one, which the table reports.
+
+Usage:
+    python benchmarks/bench_clone.py [PYTHON]
+
+PYTHON is the path of an interpreter. The default is the interpreter running
+the benchmark.
+"""
+
+# Core Library modules
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+_SCRATCH = Path(tempfile.mkdtemp(prefix="pynball-bench-"))
+if sys.platform != "win32":
+    os.environ.setdefault("PYNBALL_STORE", str(_SCRATCH / "unused.json"))
+
+# First party modules
+from pynball import pynball as pb  # noqa: E402
+
+REPEAT = 5
+
+
+def _report(label: str, used: str, timings: list[float]) -> None:
+    """Prints one row of the latency table."""
+    best, mean = min(timings) * 1000, statistics.mean(timings) * 1000
+    print(f"{label:>12}{used:>16}{best:>12.1f}{mean:>12.1f}")
+
+
+def main() -> None:
+    """Prints the creation latency of each way to make a virtual environment."""
+    python_path = Path(sys.argv[1]) if len(sys.argv) > 1 else Path(sys.executable)
+    pb._WORKON_HOME = _SCRATCH
+    print(f"{'method':>12}{'used':>16}{'best (ms)':>12}{'mean (ms)':>12}")
+
+    timings = []
+    for run in range(REPEAT):
+        venv_path = _SCRATCH / f"scratch-{run}"
+        start = time.perf_counter()
+        used = pb._create_venv(python_path, venv_path)
+        timings.append(time.perf_counter() - start)
+    _report("scratch", used, timings)
+
+    template = pb._ensure_template("bench", python_path)
+    if template is None:
+        print(f"Could not build a template for {python_path}")
+        return
+    for method in pb._CLONE_METHODS:
+        timings = []
+        for run in range(REPEAT):
+            venv_path = _SCRATCH / f"{method}-{run}"
+            start = time.perf_counter()
+            used = pb._clone_tree(template, venv_path, (method,))
+            pb._patch_venv(venv_path, template)
+            timings.append(time.perf_counter() - start)
+        _report(method, used, timings)
+    shutil.rmtree(_SCRATCH, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
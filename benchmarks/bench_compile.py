@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""Compare the first import in a fresh virtual environment with and without
+precompiled bytecode.
+
+A virtual environment is created and every __pycache__ directory is removed,
+as in an environment that nothing has imported yet. The first import of MODULE
+is then timed, once without precompiling and once after '_compile_venv'.
+
+Usage:
+    python benchmarks/bench_compile.py [MODULE]
+
+MODULE defaults to 'pip._internal.cli.main', which is installed in every new
+virtual environment.
+"""
+
+# Core Library modules
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+_SCRATCH = Path(tempfile.mkdtemp(prefix="pynball-bench-"))
+if sys.platform != "win32":
+    os.environ.setdefault("PYNBALL_STORE", str(_SCRATCH / "unused.json"))
+
+# First party modules
+from pynball import pynball as pb  # noqa: E402
+
+REPEAT = 5
+
+
+def _strip_bytecode(venv_path: Path) -> None:
+    """Removes every __pycache__ directory of the virtual environment."""
+    for cache in list(venv_path.rglob("__pycache__")):
+        shutil.rmtree(cache, ignore_errors=True)
+
+
+def _import_seconds(venv_path: Path, module: str) -> float:
+    """Returns the wall time of a process that imports module."""
+    start = time.perf_counter()
+    pb._execute(pb._venv_python(venv_path), "-c", f"import {module}")
+    return time.perf_counter() - start
+
+
+def _report(label: str, timings: list[float]) -> None:
+    """Prints one row of the timing table."""
+    best, mean = min(timings) * 1000, statistics.mean(timings) * 1000
+    print(f"{label:>28}{best:>12.0f}{mean:>12.0f}")
+
+
+def main() -> None:
+    """Prints first-import timings with and without precompiled bytecode."""
+    module = sys.argv[1] if len(sys.argv) > 1 else "pip._internal.cli.main"
+    venv_path = _SCRATCH / "env"
+    pb._create_venv(Path(sys.executable), venv_path)
+    cold, compiling, precompiled = [], [], []
+    for _ in range(REPEAT):
+        _strip_bytecode(venv_path)
+        cold.append(_import_seconds(venv_path, module))
+        _strip_bytecode(venv_path)
+        start = time.perf_counter()
+        pb._compile_venv(venv_path)
+        compiling.append(time.perf_counter() - start)
+        precompiled.append(_import_seconds(venv_path, module))
+    print(f"First import of {module}")
+    print(f"{'':>28}{'best (ms)':>12}{'mean (ms)':>12}")
+    _report("without bytecode", cold)
+    _report("compile (mkproject)", compiling)
+    _report("after compile", precompiled)
+    shutil.rmtree(_SCRATCH, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""Compare decoding the legacy 'str(dict)' PYNBALL value with the tagged JSON format.
+
+Both formats are timed twice: parsing alone ('ast.literal_eval' against
+'json.loads'), and end to end through '_decode_pynball', which also builds the
+VersionRegistry and so includes the same ordering work for both formats.
+
+Usage:
+    python benchmarks/bench_serialization.py
+"""
+
+# Core Library modules
+import ast
+import json
+import os
+import sys
+import tempfile
+import timeit
+
+if sys.platform != "win32":
+    os.environ.setdefault(
+        "PYNBALL_STORE", os.path.join(tempfile.mkdtemp(), "pynball.json")
+    )
+
+# First party modules
+from pynball import pynball as pb  # noqa: E402
+
+SIZES = (10, 100, 1000)
+REPEAT = 5
+
+
+def _make_registry(size: int) -> pb.VersionRegistry:
+    """Returns a registry holding size fake installations."""
+    names = [f"3.{n // 100}.{n % 100}" for n in range(size)]
+    return pb.VersionRegistry({name: f"C:\\Python\\{name}" for name in names})
+
+
+def _best(statement, number: int) -> float:
+    """Returns the best time per call in microseconds."""
+    return min(timeit.repeat(statement, number=number, repeat=REPEAT)) / number * 1e6
+
+
+def main() -> None:
+    """Prints a table of decode timings for each configuration size."""
+    print(f"{'':>8}{'parse only (us)':>30}{'_decode_pynball (us)':>30}")
+    print(f"{'entries':>8}", end="")
+    print(f"{'literal_eval':>14}{'json':>8}{'speedup':>8}" * 2)
+    for size in SIZES:
+        registry = _make_registry(size)
+        legacy = str(registry.to_dict())
+        encoded = pb._encode_pynball(registry)
+        number = max(10, 10000 // size)
+        row = f"{size:>8}"
+        for legacy_parse, encoded_parse in (
+            (lambda: ast.literal_eval(legacy), lambda: json.loads(encoded[1:])),
+            (lambda: pb._decode_pynball(legacy), lambda: pb._decode_pynball(encoded)),
+        ):
+            legacy_time = _best(legacy_parse, number)
+            encoded_time = _best(encoded_parse, number)
+            speedup = legacy_time / encoded_time
+            row += f"{legacy_time:>14.1f}{encoded_time:>8.1f}{speedup:>7.1f}x"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""Compare the single value PYNBALL layout with the index + per-version layout.
+
+Every operation starts from a cold cache, as a fresh 'pynball' process would.
+The file store is always measured; on Windows the registry store is measured
+too, using scratch 'PYNBALL_BENCH*' values that are deleted afterwards.
+
+Usage:
+    python benchmarks/bench_sharding.py
+"""
+
+# Core Library modules
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+_SCRATCH = Path(tempfile.mkdtemp(prefix="pynball-bench-"))
+if sys.platform != "win32":
+    os.environ.setdefault("PYNBALL_STORE", str(_SCRATCH / "unused.json"))
+
+# First party modules
+from pynball import pynball as pb  # noqa: E402
+
+SIZES = (1000, 5000)
+SINGLE = "PYNBALL_BENCH_SINGLE"
+SHARDED = "PYNBALL_BENCH"
+REPEAT = 20
+
+
+def _best(operation, restore=None) -> float:
+    """Returns the best cold-cache time of operation in milliseconds."""
+    timings = []
+    for _ in range(REPEAT):
+        pb._clear_env_cache()
+        pb._FILE_STORES.clear()
+        start = time.perf_counter()
+        operation()
+        timings.append(time.perf_counter() - start)
+        if restore is not None:
+            restore()
+    return min(timings) * 1e3
+
+
+def _measure(label: str, store, size: int) -> None:
+    """Prints names / lookup / delete timings of both layouts for one store."""
+    names = [f"3.{n // 100}.{n % 100}" for n in range(size)]
+    registry = pb.VersionRegistry({name: f"C:\\Python\\{name}" for name in names})
+    target = names[size // 2]
+    store.write("user", SINGLE, pb._encode_pynball(registry))
+    pb._set_registry(registry, SHARDED)
+
+    def single_registry() -> pb.VersionRegistry:
+        return pb._decode_pynball(pb._getenv("user", SINGLE))
+
+    def single_delete() -> None:
+        shrunk = single_registry()
+        shrunk.remove(target)
+        pb._setenv("user", SINGLE, pb._encode_pynball(shrunk))
+
+    def restore_single() -> None:
+        store.write("user", SINGLE, pb._encode_pynball(registry))
+
+    def restore_sharded() -> None:
+        pb._clear_env_cache()
+        pb._set_registry(registry, SHARDED)
+
+    rows = (
+        (
+            "names",
+            (lambda: single_registry().names(), None),
+            (lambda: pb._get_index(SHARDED), None),
+        ),
+        (
+            "lookup",
+            (lambda: single_registry().path(target), None),
+            (lambda: pb._get_version_path(target, SHARDED), None),
+        ),
+        (
+            "delete",
+            (single_delete, restore_single),
+            (lambda: pb._remove_version(target, SHARDED), restore_sharded),
+        ),
+    )
+    for operation, single_args, sharded_args in rows:
+        single_time = _best(*single_args)
+        sharded_time = _best(*sharded_args)
+        print(
+            f"{label:>10}{size:>8}{operation:>8}{single_time:>14.2f}"
+            f"{sharded_time:>14.2f}{single_time / sharded_time:>9.1f}x"
+        )
+
+    pb._clear_env_cache()
+    store.delete("user", SINGLE)
+    with pb._env_transaction():
+        for name in names:
+            pb._delenv(pb._SHARD_SCOPE, pb._shard_name(SHARDED, name))
+        pb._delenv("user", SHARDED)
+
+
+def main() -> None:
+    """Prints a table of timings for each store and configuration size."""
+    print(
+        f"{'store':>10}{'entries':>8}{'op':>8}{'single (ms)':>14}"
+        f"{'sharded (ms)':>14}{'speedup':>10}"
+    )
+    stores = [("file", _SCRATCH / "pynball.json")]
+    if sys.platform == "win32":
+        stores.insert(0, ("registry", Path("")))
+    for label, store_path in stores:
+        pb._STORE_PATH = store_path
+        for size in SIZES:
+            pb._FILE_STORES.clear()
+            _measure(label, pb._get_store(), size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""Compare read and write latency of the registry and file configuration stores.
+
+The registry store is only measured on Windows. Its writes go to a scratch
+'PYNBALL_BENCH' value in the user environment, which is deleted afterwards.
+
+Usage:
+    python benchmarks/bench_store.py
+"""
+
+# Core Library modules
+import os
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+
+_SCRATCH = Path(tempfile.mkdtemp(prefix="pynball-bench-"))
+if sys.platform != "win32":
+    os.environ.setdefault("PYNBALL_STORE", str(_SCRATCH / "unused.json"))
+
+# First party modules
+from pynball import pynball as pb  # noqa: E402
+
+NAME = "PYNBALL_BENCH"
+VALUE = pb._encode_pynball(
+    pb.VersionRegistry({f"3.{n}.0": f"C:\\Python\\3.{n}.0" for n in range(50)})
+)
+NUMBER = 200
+REPEAT = 5
+
+
+def _best(statement) -> float:
+    """Returns the best time per call in microseconds."""
+    return min(timeit.repeat(statement, number=NUMBER, repeat=REPEAT)) / NUMBER * 1e6
+
+
+def _measure(label: str, store) -> None:
+    """Prints the write, warm read and cold read latency of a store."""
+    store.write("user", NAME, VALUE)
+    write_time = _best(lambda: store.write("user", NAME, VALUE))
+    read_time = _best(lambda: store.read("user", NAME))
+
+    def cold_read() -> None:
+        fresh = pb._FileStore(store.path) if isinstance(store, pb._FileStore) else store
+        fresh.read("user", NAME)
+
+    cold_time = _best(cold_read)
+    store.delete("user", NAME)
+    print(f"{label:>10}{write_time:>14.1f}{read_time:>14.1f}{cold_time:>14.1f}")
+
+
+def main() -> None:
+    """Prints a latency table for each available store."""
+    print(f"{'store':>10}{'write (us)':>14}{'read (us)':>14}{'cold (us)':>14}")
+    if sys.platform == "win32":
+        _measure("registry", pb._RegistryStore())
+    _measure("file", pb._FileStore(_SCRATCH / "pynball.json"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""Compare virtual environment creation latency of each backend per interpreter.
+
+Every backend that can serve an interpreter is measured: the virtualenv API
+(if virtualenv is installed), the stdlib venv module (for the interpreter
+running the benchmark) and a subprocess.
+
+Usage:
+    python benchmarks/bench_venv.py [PYTHON ...]
+
+Each PYTHON is the path of an interpreter. The default is the interpreter
+running the benchmark.
+"""
+
+# Core Library modules
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+_SCRATCH = Path(tempfile.mkdtemp(prefix="pynball-bench-"))
+if sys.platform != "win32":
+    os.environ.setdefault("PYNBALL_STORE", str(_SCRATCH / "unused.json"))
+
+# First party modules
+from pynball import pynball as pb  # noqa: E402
+
+REPEAT = 3
+
+
+def _backends(python_path: Path) -> list[str]:
+    """Returns the backends that can create environments for an interpreter."""
+    backends = []
+    if pb.importlib.util.find_spec("virtualenv") is not None:
+        backends.append("virtualenv-api")
+    if pb._is_running_interpreter(python_path):
+        backends.append("venv")
+    return backends + ["subprocess"]
+
+
+def _measure(python_path: Path, version: str, backend: str) -> None:
+    """Prints the best and mean creation time of one backend."""
+    timings = []
+    for run in range(REPEAT):
+        venv_path = _SCRATCH / f"{backend}-{run}"
+        start = time.perf_counter()
+        used = pb._create_venv(python_path, venv_path, backend)
+        timings.append(time.perf_counter() - start)
+        shutil.rmtree(venv_path, ignore_errors=True)
+        if used != backend:
+            print(f"{version:>10}{backend:>16}  failed - fell back to {used}")
+            return
+    best, mean = min(timings) * 1000, statistics.mean(timings) * 1000
+    print(f"{version:>10}{backend:>16}{best:>12.0f}{mean:>12.0f}")
+
+
+def main() -> None:
+    """Prints a creation latency table for each interpreter and backend."""
+    interpreters = [Path(arg) for arg in sys.argv[1:]] or [Path(sys.executable)]
+    print(f"{'version':>10}{'backend':>16}{'best (ms)':>12}{'mean (ms)':>12}")
+    for python_path in interpreters:
+        probe, error = pb._run_probe(python_path)
+        version = probe["version"] if probe else python_path.name
+        for backend in _backends(python_path):
+            _measure(python_path, version, backend)
+    shutil.rmtree(_SCRATCH, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,19 +5,34 @@
 
 # Core Library modules
 import ast
+import asyncio
+import bisect
+import collections
 import configparser
+import contextlib
+import ctypes
 import fnmatch
+import hashlib
+import importlib.util
+import json
+import mmap
+import operator
 import os
 import re
 import shutil
+import signal
 import stat
+import struct
 import subprocess
 import sys
-
-# TODO: implement conditional imports based on OS
-import winreg
+import tempfile
+import threading
+import time
+import tomllib
+import venv
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Iterable, Iterator, Sequence
 
 # Third party modules
 import click
@@ -25,22 +40,52 @@
 
 #: Specifies the operating system to which the module is installed
 _PLATFORM = sys.platform
-if _PLATFORM != "win32":
+if _PLATFORM != "win32" and not os.environ.get("PYNBALL_STORE"):
     print(
         "Your Operating system is not supported yet."
         "Linux will be supported in version 2."
+        " Set 'PYNBALL_STORE' to a configuration file path to use one instead."
     )
     sys.exit(1)
+if _PLATFORM == "win32":
+    import winreg
+
+    _USER_KEY = winreg.HKEY_CURRENT_USER
+    _SYSTEM_KEY = winreg.HKEY_LOCAL_MACHINE
 _IDLEMODE = 1 if "idlelib.run" in sys.modules else 0
 _ENV_VARIABLES = os.environ
 _ENVIRONMENT = os.name
-_USER_KEY = winreg.HKEY_CURRENT_USER
 _USER_SUBKEY = "Environment"
-_SYSTEM_KEY = winreg.HKEY_LOCAL_MACHINE
 _SYSTEM_SUBKEY = r"System\CurrentControlSet\Control\Session Manager\Environment"
+_PYNBALL_SUBKEY = r"Software\pynball"
+#: Scope holding one value per configured version, named '<varname>:<name>'
+_SHARD_SCOPE = "pynball"
+_SCOPES = ("user", "system", _SHARD_SCOPE)
 
 config = configparser.ConfigParser()
 
+#: Session cache of environment values read from the store: {(scope, name): value}
+_ENV_CACHE: dict[tuple[str, str], Any] = {}
+#: Counts the environment reads that actually reached the store
+_ENV_CACHE_STATS = {"reads": 0, "invalidations": 0}
+#: Stack of staged writes for active transactions: [{(scope, name): value | None}]
+_ENV_TRANSACTION: list[dict[tuple[str, str], str | None]] = []
+#: Non-empty while a batch read that has already checked the store for outside
+#: changes runs, so its reads skip the check
+_ENV_BATCH: list[str] = []
+#: Header byte of a complete Pynball configuration held in a single value
+_PYNBALL_FORMAT = "1"
+#: Header byte of a PYNBALL index listing names whose paths are stored separately
+_PYNBALL_INDEX_FORMAT = "2"
+#: Parsed Pynball configurations keyed by the raw values they were parsed from
+_PYNBALL_PARSE_CACHE: dict[Any, "VersionRegistry"] = {}
+#: Interpreter entries of the system PATH keyed by the PATH value they came from
+_PATH_SCAN_CACHE: dict[str, list[str]] = {}
+#: Seconds to wait for a PATH entry before treating it as unavailable
+_PATH_STAT_TIMEOUT = 2.0
+#: PATH entries slower than this many seconds are reported
+_PATH_SLOW_SECONDS = 0.25
+
 
 def get_environ(env_name: str) -> Path:
     """Return the Path given the environment variable name."""
@@ -54,11 +99,41 @@ def get_environ(env_name: str) -> Path:
 _WORKON_HOME = get_environ("WORKON_HOME")
 _PROJECT_HOME = get_environ("PROJECT_HOME")
 _PYENV_HOME = get_environ("PYENV_HOME")
+_STORE_PATH = get_environ("PYNBALL_STORE")
+#: Default number of jobs, such as interpreter probes, run at the same time
+_DEFAULT_JOBS = min(32, (os.cpu_count() or 1) + 4)
+#: Worker count and failure policy of '_JobRunner', set by the global options
+_JOB_SETTINGS: dict[str, Any] = {"workers": _DEFAULT_JOBS, "fail_fast": False}
+#: The cancellation event of the job running on the current thread
+_JOB_CONTEXT = threading.local()
+#: Seconds between checks for cancellation while a job's command runs
+_CANCEL_POLL_SECONDS = 0.1
+#: Seconds an interpreter gets to run '_PROBE_SCRIPT' before it is killed
+_PROBE_TIMEOUT = 30.0
+#: Seconds a virtual environment build or a 'compileall' run gets
+_VENV_TIMEOUT = 600.0
+#: Seconds a pip install of a requirements file gets
+_PIP_TIMEOUT = 1800.0
 
 
 @click.group()
-def cli() -> None:
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=_DEFAULT_JOBS,
+    show_default=True,
+    help="Number of jobs, such as interpreter probes, run at the same time.",
+)
+@click.option(
+    "--fail-fast/--keep-going",
+    default=False,
+    help="Stop the remaining jobs after the first failure.",
+)
+def cli(jobs: int, fail_fast: bool) -> None:
     """Manage development with various versions of Python."""
+    _JOB_SETTINGS["workers"] = jobs
+    _JOB_SETTINGS["fail_fast"] = fail_fast
 
 
 def del_rw(action, name, exc):  # type: ignore
@@ -99,24 +174,373 @@ def _file_word_replace(filepath: Path, old_word: str, new_word: str) -> Any:
         file.write(file_data)
 
 
-def _execute(*args: Any, supress_exception: bool = False) -> Any:
+class CommandResult:
+    """The outcome of a command run by '_run' or '_run_async'."""
+
+    __slots__ = (
+        "args",
+        "returncode",
+        "stdout",
+        "stderr",
+        "duration",
+        "timed_out",
+        "cancelled",
+    )
+
+    def __init__(
+        self,
+        args: tuple[str, ...],
+        returncode: int | None,
+        stdout: str,
+        stderr: str,
+        duration: float,
+        timed_out: bool = False,
+        cancelled: bool = False,
+    ) -> None:
+        self.args = args
+        self.returncode = returncode
+        self.stdout = stdout
+        self.stderr = stderr
+        self.duration = duration
+        self.timed_out = timed_out
+        self.cancelled = cancelled
+
+    def __repr__(self) -> str:
+        return (
+            f"CommandResult(args={self.args!r}, returncode={self.returncode}, "
+            f"duration={self.duration:.3f}, timed_out={self.timed_out}, "
+            f"cancelled={self.cancelled})"
+        )
+
+    @property
+    def ok(self) -> bool:
+        """True if the command finished in time with return code 0."""
+        return self.returncode == 0 and not self.timed_out and not self.cancelled
+
+
+#: Keyword arguments that start a command in its own process group, so the
+#: whole tree can be killed on timeout
+_PROCESS_GROUP: dict[str, Any] = (
+    {"creationflags": getattr(subprocess, "CREATE_NEW_PROCESS_GROUP", 0)}
+    if os.name == "nt"
+    else {"start_new_session": True}
+)
+
+
+def _kill_tree(pid: int) -> None:
+    """Kills a process started by '_run' and every process it started."""
+    if os.name == "nt":
+        subprocess.run(
+            ["taskkill", "/F", "/T", "/PID", str(pid)],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+    else:
+        with contextlib.suppress(ProcessLookupError, PermissionError):
+            os.killpg(pid, signal.SIGKILL)
+
+
+def _run(
+    *args: Any,
+    timeout: float | None = None,
+    on_output: Callable[[str, str], None] | None = None,
+    cwd: Path | None = None,
+) -> CommandResult:
+    """Runs a command, streaming its output line by line.
+
+    Args:
+        *args:      The command and its arguments.
+        timeout:    Seconds to wait before the process tree is killed.
+        on_output:  Called with ("stdout" or "stderr", line) for each line as
+                    it is written.
+        cwd:        Working directory of the command.
+
+    Returns:
+        The CommandResult.
+
+    Raises:
+        OSError:    If the command cannot be started.
+    """
+    command = tuple(str(arg) for arg in args)
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        command,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        cwd=cwd,
+        **_PROCESS_GROUP,
+    )
+    output: dict[str, list[str]] = {"stdout": [], "stderr": []}
+    lock = threading.Lock()
+
+    def read(name: str, stream: Any) -> None:
+        for raw_line in iter(stream.readline, b""):
+            line = raw_line.decode("utf-8", errors="replace")
+            output[name].append(line)
+            if on_output is not None:
+                with lock:
+                    on_output(name, line.rstrip("\r\n"))
+        stream.close()
+
+    readers = [
+        threading.Thread(target=read, args=(name, getattr(proc, name)), daemon=True)
+        for name in output
+    ]
+    for reader in readers:
+        reader.start()
+    cancel = getattr(_JOB_CONTEXT, "cancel", None)
+    deadline = None if timeout is None else start + timeout
+    timed_out = cancelled = False
+    try:
+        while True:
+            wait = (
+                None if deadline is None else max(0.0, deadline - time.perf_counter())
+            )
+            if cancel is not None:
+                wait = (
+                    _CANCEL_POLL_SECONDS
+                    if wait is None
+                    else min(wait, _CANCEL_POLL_SECONDS)
+                )
+            try:
+                proc.wait(wait)
+                break
+            except subprocess.TimeoutExpired:
+                cancelled = cancel is not None and cancel.is_set()
+                timed_out = deadline is not None and time.perf_counter() >= deadline
+                if cancelled or timed_out:
+                    _kill_tree(proc.pid)
+                    proc.kill()
+                    proc.wait()
+                    break
+    except BaseException:
+        # The child is in its own process group, so a Ctrl-C at the terminal
+        # only reaches pynball
+        _kill_tree(proc.pid)
+        proc.kill()
+        proc.wait()
+        raise
+    stopped = timed_out or cancelled
+    for reader in readers:
+        reader.join(None if not stopped else 1.0)
+    return CommandResult(
+        command,
+        None if stopped else proc.returncode,
+        "".join(output["stdout"]),
+        "".join(output["stderr"]),
+        time.perf_counter() - start,
+        timed_out,
+        cancelled,
+    )
+
+
+async def _run_async(
+    *args: Any,
+    timeout: float | None = None,
+    on_output: Callable[[str, str], None] | None = None,
+    cwd: Path | None = None,
+) -> CommandResult:
+    """The asyncio version of '_run', so that several commands can run at once.
+
+    Raises:
+        OSError:    If the command cannot be started.
+    """
+    command = tuple(str(arg) for arg in args)
+    start = time.perf_counter()
+    proc = await asyncio.create_subprocess_exec(
+        *command,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        cwd=cwd,
+        **_PROCESS_GROUP,
+    )
+    output: dict[str, list[str]] = {"stdout": [], "stderr": []}
+
+    async def read(name: str, stream: asyncio.StreamReader) -> None:
+        while raw_line := await stream.readline():
+            line = raw_line.decode("utf-8", errors="replace")
+            output[name].append(line)
+            if on_output is not None:
+                on_output(name, line.rstrip("\r\n"))
+
+    readers = asyncio.gather(
+        read("stdout", proc.stdout), read("stderr", proc.stderr)  # type: ignore
+    )
+    timed_out = False
+    try:
+        await asyncio.wait_for(proc.wait(), timeout)
+    except asyncio.TimeoutError:
+        timed_out = True
+        _kill_tree(proc.pid)
+        with contextlib.suppress(ProcessLookupError):
+            proc.kill()
+        await proc.wait()
+    except BaseException:
+        _kill_tree(proc.pid)
+        with contextlib.suppress(ProcessLookupError):
+            proc.kill()
+        raise
+    with contextlib.suppress(asyncio.TimeoutError):
+        await asyncio.wait_for(readers, None if not timed_out else 1.0)
+    return CommandResult(
+        command,
+        None if timed_out else proc.returncode,
+        "".join(output["stdout"]),
+        "".join(output["stderr"]),
+        time.perf_counter() - start,
+        timed_out,
+    )
+
+
+def _run_all(
+    commands: list[Sequence[Any]], timeout: float | None = None
+) -> list[CommandResult]:
+    """Runs several commands at once and returns their results in order."""
+
+    async def run_all() -> list[CommandResult]:
+        return list(
+            await asyncio.gather(
+                *(_run_async(*command, timeout=timeout) for command in commands)
+            )
+        )
+
+    return asyncio.run(run_all())
+
+
+def _execute(
+    *args: Any,
+    supress_exception: bool = False,
+    timeout: float | None = None,
+    stream: bool = False,
+) -> Any:
     """A utility method to run command line tools.
 
     Args:
-        *args:  The commands typically entered at the command line.
-                e.g. "virtualenv", f"-p={version_path}\\python.exe", str(new_path)
+        *args:              The commands typically entered at the command line.
+                            e.g. "virtualenv", f"-p={version_path}\\python.exe",
+                            str(new_path)
+        supress_exception:  Return the output even if the command failed.
+        timeout:            Seconds to wait before the command is killed.
+        stream:             Echo the output of the command as it is written.
+
+    Returns:
+        The standard output of the command, or None if it could not be started.
+
+    Raises:
+        Exception:  If the command fails or times out, with its error output.
     """
+    on_output = (lambda _name, line: click.echo(line)) if stream else None
     try:
-        proc = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        out, err = proc.communicate()
-        decoded_out = out.decode("utf-8")
-        decoded_err = err.decode("utf-8")
-        if err and not supress_exception:
-            raise Exception(decoded_err)
-        else:
-            return decoded_out
+        result = _run(*args, timeout=timeout, on_output=on_output)
     except OSError as e:
         print(e)
+        return None
+    if not result.ok and not supress_exception:
+        if result.timed_out:
+            raise Exception(f"'{result.args[0]}' timed out after {timeout}s")
+        if result.cancelled:
+            raise Exception(f"'{result.args[0]}' was cancelled")
+        raise Exception(
+            result.stderr
+            or f"'{result.args[0]}' exited with return code {result.returncode}"
+        )
+    return result.stdout
+
+
+class JobResult:
+    """The outcome of a job run by '_JobRunner'."""
+
+    __slots__ = ("name", "value", "error", "duration", "cancelled")
+
+    def __init__(
+        self,
+        name: str,
+        value: Any = None,
+        error: BaseException | None = None,
+        duration: float = 0.0,
+        cancelled: bool = False,
+    ) -> None:
+        self.name = name
+        self.value = value
+        self.error = error
+        self.duration = duration
+        self.cancelled = cancelled
+
+    def __repr__(self) -> str:
+        return (
+            f"JobResult(name={self.name!r}, error={self.error!r}, "
+            f"duration={self.duration:.3f}, cancelled={self.cancelled})"
+        )
+
+    @property
+    def ok(self) -> bool:
+        """True if the job ran to completion without raising."""
+        return self.error is None and not self.cancelled
+
+
+class _JobRunner:
+    """Runs jobs on a bounded pool of worker threads.
+
+    Every job is timed. Cancelling the runner drops the jobs that have not
+    started and kills the commands that running jobs started with '_run'.
+    With 'fail_fast' the first failing job cancels the runner; otherwise
+    every job runs and the errors are collected in the results.
+
+    Example:
+        with _JobRunner() as runner:
+            results = runner.run([("3.11", probe, (path,))])
+    """
+
+    __slots__ = ("workers", "fail_fast", "_executor", "_cancel")
+
+    def __init__(self, workers: int | None = None, fail_fast: bool | None = None):
+        self.workers = workers or _JOB_SETTINGS["workers"]
+        self.fail_fast = _JOB_SETTINGS["fail_fast"] if fail_fast is None else fail_fast
+        self._executor = ThreadPoolExecutor(max_workers=self.workers)
+        self._cancel = threading.Event()
+
+    def __enter__(self) -> "_JobRunner":
+        return self
+
+    def __exit__(self, exc_type: Any, *_: Any) -> None:
+        if exc_type is not None:
+            self.cancel()
+        self._executor.shutdown(wait=True, cancel_futures=exc_type is not None)
+
+    @property
+    def cancelled(self) -> bool:
+        """True once the runner has been cancelled."""
+        return self._cancel.is_set()
+
+    def cancel(self) -> None:
+        """Drops the jobs that have not started and stops the running ones."""
+        self._cancel.set()
+
+    def _call(self, name: str, func: Callable[..., Any], args: tuple) -> JobResult:
+        if self._cancel.is_set():
+            return JobResult(name, cancelled=True)
+        _JOB_CONTEXT.cancel = self._cancel
+        start = time.perf_counter()
+        try:
+            value = func(*args)
+        except Exception as e:
+            if self.fail_fast:
+                self.cancel()
+            return JobResult(name, error=e, duration=time.perf_counter() - start)
+        finally:
+            _JOB_CONTEXT.cancel = None
+        return JobResult(name, value, duration=time.perf_counter() - start)
+
+    def submit(self, name: str, func: Callable[..., Any], *args: Any) -> Future:
+        """Schedules func(*args) and returns a Future of its JobResult."""
+        return self._executor.submit(self._call, name, func, args)
+
+    def run(
+        self, jobs: Iterable[tuple[str, Callable[..., Any], tuple]]
+    ) -> list[JobResult]:
+        """Runs (name, func, args) jobs and returns their results in order."""
+        futures = [self.submit(name, func, *args) for name, func, args in jobs]
+        return [future.result() for future in futures]
 
 
 def _check_virtual_env() -> int:
@@ -148,6 +572,404 @@ def _check_pyenv() -> int:
     return 0
 
 
+#: RegNotifyChangeKeyValue filter: a value was added, deleted or changed
+_REG_NOTIFY_CHANGE_NAME = 0x1
+_REG_NOTIFY_CHANGE_LAST_SET = 0x4
+#: inotify flags: the events that mean a file in the watched directory changed
+_IN_MODIFY = 0x2
+_IN_CLOSE_WRITE = 0x8
+_IN_MOVED_FROM = 0x40
+_IN_MOVED_TO = 0x80
+_IN_CREATE = 0x100
+_IN_DELETE = 0x200
+_INOTIFY_EVENT = struct.Struct("iIII")
+
+
+class _RegistryWatcher:
+    """Detects changes to registry keys with RegNotifyChangeKeyValue.
+
+    Each key is registered asynchronously against an auto-reset event, so
+    checking for a change is a zero-timeout wait on the events.
+    """
+
+    __slots__ = ("_watches",)
+
+    def __init__(self, keys: list[tuple[Any, str]]) -> None:
+        """Registers for change notifications on each (root key, subkey) pair.
+
+        Raises:
+            AttributeError:  If the Windows APIs are not available.
+            OSError:         If a key cannot be watched.
+        """
+        self._watches = []
+        for root, subkey in keys:
+            key = winreg.CreateKeyEx(root, subkey, 0, winreg.KEY_NOTIFY)
+            event = ctypes.windll.kernel32.CreateEventW(None, False, False, None)
+            if not event:
+                raise OSError("CreateEventW failed")
+            self._watches.append((key, event))
+            self._arm(key, event)
+
+    @staticmethod
+    def _arm(key: Any, event: int) -> None:
+        """Requests a single notification of the next change to key."""
+        status = ctypes.windll.advapi32.RegNotifyChangeKeyValue(
+            ctypes.c_void_p(key.handle),
+            False,
+            _REG_NOTIFY_CHANGE_NAME | _REG_NOTIFY_CHANGE_LAST_SET,
+            ctypes.c_void_p(event),
+            True,
+        )
+        if status != 0:
+            raise OSError(status, "RegNotifyChangeKeyValue failed")
+
+    def changed(self) -> bool:
+        """Returns True if any watched key changed since the last call."""
+        changed = False
+        for key, event in self._watches:
+            signalled = ctypes.windll.kernel32.WaitForSingleObject(
+                ctypes.c_void_p(event), 0
+            )
+            if signalled == 0:
+                self._arm(key, event)
+                changed = True
+        return changed
+
+
+class _InotifyWatcher:
+    """Detects changes to a file through inotify events on its directory.
+
+    The directory is watched rather than the file, because every write
+    replaces the file with a new one.
+    """
+
+    __slots__ = ("path", "_fd")
+
+    def __init__(self, path: Path) -> None:
+        """Starts watching the directory of path.
+
+        Raises:
+            OSError:  If inotify is not available or the directory does not exist.
+        """
+        self.path = path
+        libc = ctypes.CDLL(None, use_errno=True)
+        self._fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        mask = (
+            _IN_MODIFY
+            | _IN_CLOSE_WRITE
+            | _IN_MOVED_FROM
+            | _IN_MOVED_TO
+            | _IN_CREATE
+            | _IN_DELETE
+        )
+        if libc.inotify_add_watch(self._fd, os.fsencode(path.parent), mask) < 0:
+            error = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(error, f"Cannot watch {path.parent}")
+
+    def changed(self) -> bool:
+        """Returns True if the file changed since the last call."""
+        target = os.fsencode(self.path.name)
+        changed = False
+        while True:
+            try:
+                data = os.read(self._fd, 65536)
+            except BlockingIOError:
+                return changed
+            offset = 0
+            while offset < len(data):
+                _, _, _, length = _INOTIFY_EVENT.unpack_from(data, offset)
+                offset += _INOTIFY_EVENT.size
+                name = data[offset : offset + length].rstrip(b"\0")
+                offset += length
+                changed = changed or name == target
+
+
+class _StatWatcher:
+    """Detects changes to a file by polling its (mtime, size, inode) signature."""
+
+    __slots__ = ("path", "_signature")
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._signature = self._stat()
+
+    def _stat(self) -> tuple[int, int, int] | None:
+        try:
+            file_stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return file_stat.st_mtime_ns, file_stat.st_size, file_stat.st_ino
+
+    def changed(self) -> bool:
+        """Returns True if the file changed since the last call."""
+        signature = self._stat()
+        if signature == self._signature:
+            return False
+        self._signature = signature
+        return True
+
+
+class _RegistryStore:
+    """Keeps environment variables in the Windows registry.
+
+    'user' values live in HKEY_CURRENT_USER\\Environment and 'system' values in
+    the machine-wide Session Manager environment key. The per-version values
+    of the 'pynball' scope live in HKEY_CURRENT_USER\\Software\\pynball, so
+    they do not become environment variables.
+    """
+
+    __slots__ = ("_watcher",)
+
+    def __init__(self) -> None:
+        self._watcher: _RegistryWatcher | None | bool = None
+
+    def changed(self) -> bool:
+        """Returns True if another process changed a value since the last call.
+
+        Note:
+            The first call starts watching the keys. Where notifications are not
+            available, changes are never reported.
+        """
+        if self._watcher is None:
+            keys = [
+                (_USER_KEY, _USER_SUBKEY),
+                (_SYSTEM_KEY, _SYSTEM_SUBKEY),
+                (_USER_KEY, _PYNBALL_SUBKEY),
+            ]
+            try:
+                self._watcher = _RegistryWatcher(keys)
+            except (AttributeError, OSError, ctypes.ArgumentError):
+                self._watcher = False
+            return False
+        return bool(self._watcher) and self._watcher.changed()  # type: ignore
+
+    @staticmethod
+    def _open_key(scope: str) -> Any:
+        """Opens the environment key of a scope for writing."""
+        if scope == "user":
+            return winreg.OpenKey(_USER_KEY, _USER_SUBKEY, 0, winreg.KEY_ALL_ACCESS)
+        if scope == _SHARD_SCOPE:
+            return winreg.CreateKey(_USER_KEY, _PYNBALL_SUBKEY)
+        return winreg.OpenKey(_SYSTEM_KEY, _SYSTEM_SUBKEY, 0, winreg.KEY_ALL_ACCESS)
+
+    @staticmethod
+    def _create_key(scope: str) -> Any:
+        """Returns the environment key of a scope, creating it if necessary."""
+        if scope == "user":
+            return winreg.CreateKey(_USER_KEY, _USER_SUBKEY)
+        if scope == _SHARD_SCOPE:
+            return winreg.CreateKey(_USER_KEY, _PYNBALL_SUBKEY)
+        return winreg.CreateKey(_SYSTEM_KEY, _SYSTEM_SUBKEY)
+
+    def read(self, scope: str, name: str) -> str | None:
+        """Returns the value of name, or None if it is not set."""
+        key = self._create_key(scope)
+        try:
+            value, _ = winreg.QueryValueEx(key, name)  # noqa
+        except FileNotFoundError:
+            value = None
+        return value
+
+    def read_many(self, scope: str, names: list[str]) -> dict[str, str | None]:
+        """Returns {name: value or None} for several names with one key open."""
+        key = self._create_key(scope)
+        values: dict[str, str | None] = {}
+        for name in names:
+            try:
+                values[name], _ = winreg.QueryValueEx(key, name)  # noqa
+            except FileNotFoundError:
+                values[name] = None
+        return values
+
+    def write(self, scope: str, name: str, value: str) -> None:
+        """Sets name to value."""
+        key = self._open_key(scope)
+        winreg.SetValueEx(key, name, 0, winreg.REG_SZ, value)  # noqa
+        winreg.CloseKey(key)
+
+    def delete(self, scope: str, name: str) -> None:
+        """Deletes name.
+
+        Raises:
+            OSError:  If the deletion failed.
+        """
+        key = self._create_key(scope)
+        winreg.DeleteValue(key, name)  # noqa
+
+    def write_many(self, scope: str, changes: dict[str, str | None]) -> dict[str, str]:
+        """Applies several changes with the key opened once.
+
+        Args:
+            changes:  Format: {name: value} - a value of None is a deletion.
+
+        Returns:
+            Format: {name: error message} for every change that failed.
+        """
+        failures = {}
+        key = self._open_key(scope)
+        try:
+            for name, value in changes.items():
+                if value is None:
+                    try:
+                        winreg.DeleteValue(key, name)  # noqa
+                    except OSError as e:
+                        failures[name] = str(e)
+                else:
+                    winreg.SetValueEx(key, name, 0, winreg.REG_SZ, value)  # noqa
+        finally:
+            winreg.CloseKey(key)
+        return failures
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    """Replaces the file at path with text, so readers never see a partial file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    handle, temp_name = tempfile.mkstemp(
+        dir=path.parent, prefix=f".{path.name}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(handle, "w", encoding="utf-8") as file:
+            file.write(text)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_name, path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(temp_name)
+        raise
+
+
+class _FileStore:
+    """Keeps environment variables in a JSON file.
+
+    The file holds {"user": {name: value}, "system": {name: value}}. It is read
+    through a memory map and only re-parsed when its (mtime, size, inode)
+    signature changes. Every write goes to a temporary file that atomically
+    replaces the original, so readers never see a partial file.
+    """
+
+    __slots__ = ("path", "_document", "_signature", "_watcher")
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._document: dict[str, dict[str, str]] = {}
+        self._signature: tuple[int, int, int] | None = None
+        self._watcher: _InotifyWatcher | _StatWatcher | None = None
+
+    def changed(self) -> bool:
+        """Returns True if the file changed since the last call.
+
+        Note:
+            The first call starts watching the file, with inotify on Linux and by
+            polling its signature elsewhere or when inotify is unavailable.
+        """
+        if self._watcher is None:
+            try:
+                if not sys.platform.startswith("linux"):
+                    raise OSError("inotify is only available on Linux")
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._watcher = _InotifyWatcher(self.path)
+            except (AttributeError, OSError):
+                self._watcher = _StatWatcher(self.path)
+            return False
+        return self._watcher.changed()
+
+    def _load(self) -> dict[str, dict[str, str]]:
+        """Returns the parsed file, re-reading it only if it has changed."""
+        try:
+            file_stat = os.stat(self.path)
+        except FileNotFoundError:
+            self._document, self._signature = {}, None
+            return self._document
+        signature = (file_stat.st_mtime_ns, file_stat.st_size, file_stat.st_ino)
+        if signature != self._signature:
+            document = {}
+            if file_stat.st_size > 0:
+                with open(self.path, "rb") as file:
+                    with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                        document = json.loads(view[:])
+            self._document, self._signature = document, signature
+        return self._document
+
+    def _save(self, document: dict[str, dict[str, str]]) -> None:
+        """Atomically replaces the file with document."""
+        _write_atomic(self.path, json.dumps(document, separators=(",", ":")))
+        file_stat = os.stat(self.path)
+        self._document = document
+        self._signature = (file_stat.st_mtime_ns, file_stat.st_size, file_stat.st_ino)
+
+    def read(self, scope: str, name: str) -> str | None:
+        """Returns the value of name, or None if it is not set."""
+        return self._load().get(scope, {}).get(name)
+
+    def read_many(self, scope: str, names: list[str]) -> dict[str, str | None]:
+        """Returns {name: value or None} for several names."""
+        values = self._load().get(scope, {})
+        return {name: values.get(name) for name in names}
+
+    def write(self, scope: str, name: str, value: str) -> None:
+        """Sets name to value."""
+        self.write_many(scope, {name: value})
+
+    def delete(self, scope: str, name: str) -> None:
+        """Deletes name.
+
+        Raises:
+            FileNotFoundError:  If name is not set.
+        """
+        failures = self.write_many(scope, {name: None})
+        if failures:
+            raise FileNotFoundError(failures[name])
+
+    def write_many(self, scope: str, changes: dict[str, str | None]) -> dict[str, str]:
+        """Applies several changes with a single file replacement.
+
+        Args:
+            changes:  Format: {name: value} - a value of None is a deletion.
+
+        Returns:
+            Format: {name: error message} for every change that failed.
+        """
+        failures = {}
+        document = {key: dict(values) for key, values in self._load().items()}
+        values = document.setdefault(scope, {})
+        for name, value in changes.items():
+            if value is not None:
+                values[name] = value
+            elif name in values:
+                del values[name]
+            else:
+                failures[name] = f"'{name}' is not set in {self.path}"
+        if len(failures) < len(changes):
+            self._save(document)
+        return failures
+
+
+_REGISTRY_STORE = _RegistryStore()
+#: File stores opened this session, keyed by the path of their file
+_FILE_STORES: dict[Path, _FileStore] = {}
+
+
+def _get_store() -> Any:
+    """Returns the backend that holds the environment variables.
+
+    Returns:
+        _FileStore:      If 'PYNBALL_STORE' names a configuration file.
+        _RegistryStore:  On Windows otherwise.
+        None:            If there is nowhere to store the configuration.
+    """
+    if _STORE_PATH != Path(""):
+        if _STORE_PATH not in _FILE_STORES:
+            _FILE_STORES[_STORE_PATH] = _FileStore(_STORE_PATH)
+        return _FILE_STORES[_STORE_PATH]
+    if _PLATFORM == "win32":
+        return _REGISTRY_STORE
+    return None
+
+
 def _setenv(scope: str, name: str, value: str) -> None:
     """sets an environment variable given a scope, variable name and a value.
 
@@ -160,27 +982,33 @@ def _setenv(scope: str, name: str, value: str) -> None:
         error:  message if scope is neither 'user' nor 'system'.
         None:   If registry write is successful.
     """
-    if _PLATFORM == "win32":
-        if scope not in ("user", "system"):
-            message = "Scope value must be 'user' or 'system'"
-            _feedback(message, "warning")
-            return
-        if scope == "user":
-            key = winreg.OpenKey(_USER_KEY, _USER_SUBKEY, 0, winreg.KEY_ALL_ACCESS)
-        elif scope == "system":
-            key = winreg.OpenKey(_SYSTEM_KEY, _SYSTEM_SUBKEY, 0, winreg.KEY_ALL_ACCESS)
-        winreg.SetValueEx(key, name, 0, winreg.REG_SZ, value)  # noqa
-        winreg.CloseKey(key)
-    else:
-        pass
-        # TODO: generate linux version of _setenv
+    store = _get_store()
+    if store is None:
+        return
+    if scope not in _SCOPES:
+        message = "Scope value must be 'user' or 'system'"
+        _feedback(message, "warning")
+        return
+    if _ENV_TRANSACTION:
+        _ENV_TRANSACTION[-1][(scope, name)] = value
+        return
+    _check_env_changes()
+    if _ENV_CACHE.get((scope, name)) == value:
+        return
+    store.write(scope, name, value)
+    store.changed()  # consume the notification of our own write
+    _ENV_CACHE[(scope, name)] = value
 
 
 def _getenv(scope: str, name: str) -> Any:
     """Gets an environment variable given a scope and key name.
 
     Note:
-        No need to open the key as they are one of the predefined HKEY_* constants.
+        Values are cached for the lifetime of the process, so each (scope, name)
+        pair is only read from the store once. '_setenv' and '_delenv' keep
+        the cache up to date, and the cache is emptied when the store reports
+        a change made by another process. Inside '_env_transaction' the staged
+        value is returned.
 
     Args:
         scope:  Must be either 'user' or 'system'
@@ -190,468 +1018,2786 @@ def _getenv(scope: str, name: str) -> Any:
         error:  Message if scope is neither 'user' nor 'system'.
         value:  Registry key value on successful read
         None:   Read failed.
-
-    Raises:
-        FileNotFoundError:  When the key is not found
     """
-    if _PLATFORM == "win32":
-        if scope not in ("user", "system"):
-            message = "Scope value must be 'user' or 'system'"
-            _feedback(message, "warning")
-            return None
-        elif scope == "user":
-            key = winreg.CreateKey(_USER_KEY, _USER_SUBKEY)
-        elif scope == "system":
-            key = winreg.CreateKey(_SYSTEM_KEY, _SYSTEM_SUBKEY)
-        try:
-            value, _ = winreg.QueryValueEx(key, name)  # noqa
-        except FileNotFoundError:
-            value = None
-        return value
-    else:
-        pass
-        # TODO: generate linux version of _getenv
+    store = _get_store()
+    if store is None:
+        return None
+    if scope not in _SCOPES:
+        message = "Scope value must be 'user' or 'system'"
+        _feedback(message, "warning")
+        return None
+    if _ENV_TRANSACTION and (scope, name) in _ENV_TRANSACTION[-1]:
+        return _ENV_TRANSACTION[-1][(scope, name)]
+    _check_env_changes()
+    if (scope, name) in _ENV_CACHE:
+        return _ENV_CACHE[(scope, name)]
+    value = store.read(scope, name)
+    _ENV_CACHE_STATS["reads"] += 1
+    _ENV_CACHE[(scope, name)] = value
+    return value
 
 
 def _delenv(scope: str, name: str) -> None:
     """A utility method to delete an environment variable key from the named scope.
 
-    Note:
-        No need to open the key as they are one of the predefined HKEY_* constants.
-
     Args:
         scope:  Must be either 'user' or 'system'.
         name:   The registry key name.
 
     Returns:
         error:  Message if scope is neither 'user' nor 'system'.
-
-    Raises:
-        OSError:  If the deletion failed.
     """
-    if _PLATFORM == "win32":
-        if scope not in ("user", "system"):
-            message = "Scope value must be 'user' or 'system'"
-            _feedback(message, "warning")
-            return
-        elif scope == "user":
-            key = winreg.CreateKey(_USER_KEY, _USER_SUBKEY)
-        elif scope == "system":
-            key = winreg.CreateKey(_SYSTEM_KEY, _SYSTEM_SUBKEY)
-        try:
-            winreg.DeleteValue(key, name)  # noqa
-        except OSError as e:
-            message = f"Deletion of key: '{name}' failed -\n {e}"
-            _feedback(message, "warning")
+    store = _get_store()
+    if store is None:
+        return
+    if scope not in _SCOPES:
+        message = "Scope value must be 'user' or 'system'"
+        _feedback(message, "warning")
+        return
+    if _ENV_TRANSACTION:
+        _ENV_TRANSACTION[-1][(scope, name)] = None
+        return
+    _check_env_changes()
+    if (scope, name) in _ENV_CACHE and _ENV_CACHE[(scope, name)] is None:
+        return
+    try:
+        store.delete(scope, name)
+        store.changed()  # consume the notification of our own write
+    except OSError as e:
+        _ENV_CACHE.pop((scope, name), None)
+        message = f"Deletion of key: '{name}' failed -\n {e}"
+        _feedback(message, "warning")
     else:
-        pass
-        # TODO: generate linux version of _delenv
+        _ENV_CACHE[(scope, name)] = None
+
 
+def _check_env_changes() -> None:
+    """Empties the caches if the store reports a change made by another process."""
+    if _ENV_BATCH:
+        return
+    store = _get_store()
+    if store is not None and store.changed():
+        _ENV_CACHE.clear()
+        _PYNBALL_PARSE_CACHE.clear()
+        _PATH_SCAN_CACHE.clear()
+        _ENV_CACHE_STATS["invalidations"] += 1
+
+
+def _prefetch_env(scope: str, names: list[str]) -> None:
+    """Reads every uncached name of a scope into the cache in one store round trip."""
+    _check_env_changes()
+    store = _get_store()
+    missing = [name for name in names if (scope, name) not in _ENV_CACHE]
+    if store is None or not missing:
+        return
+    for name, value in store.read_many(scope, missing).items():
+        _ENV_CACHE[(scope, name)] = value
+    _ENV_CACHE_STATS["reads"] += len(missing)
 
-def _set_pynball(dict_object: dict[str, Path], varname: str) -> None:
-    """Accepts and converts a dictionary object, then writes to the registry.
 
-    Args:
-        dict_object:  The dictionary. Format: {"name: str": "path to version": Path,}
+def _getenv_many(scope: str, names: list[str]) -> list[Any]:
+    """Gets several values of a scope, like '_getenv' for each name.
+
+    The store is checked for changes made by another process once for the
+    whole batch rather than once per name, as each check may stat a file on a
+    network share.
     """
-    pynball_raw_dict = {name: str(path) for name, path in dict_object.items()}
-    pynball = str(pynball_raw_dict)
-    _setenv("user", varname, pynball)
+    _prefetch_env(scope, names)
+    _ENV_BATCH.append(scope)
+    try:
+        return [_getenv(scope, name) for name in names]
+    finally:
+        _ENV_BATCH.pop()
 
 
-def _get_pynball(returntype: str, varname: str) -> Any:
-    """Reads the environment variable 'PYNBALL' from the user scope as a string.
+def _flush_env(staged: dict[tuple[str, str], str | None]) -> None:
+    """Writes staged environment changes with one store round trip per scope.
 
-    The string is then converted to the data structure specified by the
-    returntype
+    Values that already hold the staged value (or deletions of values that do
+    not exist) are skipped, so a transaction that changed nothing writes nothing.
 
     Args:
-        returntype: The data structure and values to be returned
+        staged:  Format: {(scope, name): value} - a value of None is a deletion.
+    """
+    store = _get_store()
+    # Per-version values go first, so an index never names a value not yet written
+    for scope in (_SHARD_SCOPE, "system", "user"):
+        pending = {
+            name: value
+            for (stage_scope, name), value in staged.items()
+            if stage_scope == scope
+        }
+        if not pending:
+            continue
+        _prefetch_env(scope, list(pending))
+        changes = {
+            name: value
+            for name, value in pending.items()
+            if _ENV_CACHE.get((scope, name)) != value
+        }
+        if not changes:
+            continue
+        failures = store.write_many(scope, changes)
+        store.changed()  # consume the notification of our own write
+        for name, value in changes.items():
+            if name in failures:
+                _ENV_CACHE.pop((scope, name), None)
+                message = f"Deletion of key: '{name}' failed -\n {failures[name]}"
+                _feedback(message, "warning")
+            else:
+                _ENV_CACHE[(scope, name)] = value
 
-    Returns:
-        error:  If the returntype is not recognised.
-        str:    If returntype is 'string'
-        dict:   If return type is 'dict' or 'dict_path_object'
-        list:   if return type is 'names' or 'paths'
+
+@contextlib.contextmanager
+def _env_transaction() -> Iterator[None]:
+    """Batches '_setenv' / '_delenv' calls into a single write per value.
+
+    Writes are staged (and visible to '_getenv') until the block exits, then
+    flushed with one store round trip per scope. If the block raises, the
+    staged writes are discarded. A nested transaction joins the outermost one.
     """
-    names_list = []
-    paths_list = []
-    returntypes = ("string", "dict", "dict_path_object", "names", "paths")
-    if returntype not in returntypes:
-        message = f"Please use a correct returntype - {returntypes}"
-        _feedback(message, "warning")
+    if _get_store() is None or _ENV_TRANSACTION:
+        yield
         return
-    pynball_var = _getenv("user", varname)
-    if pynball_var is None:
-        return None
-    if returntype == "string":
-        return pynball_var
-    elif returntype == "dict":
-        pynball_raw_dict = ast.literal_eval(pynball_var)
-        return pynball_raw_dict
-    elif returntype == "dict_path_object":
-        pynball_raw_dict = ast.literal_eval(pynball_var)
-        pynball_versions = {name: Path(path) for name, path in pynball_raw_dict.items()}
-        return pynball_versions
-    elif returntype == "names":
-        pynball_raw_dict = ast.literal_eval(pynball_var)
-        for name in pynball_raw_dict:
-            names_list.append(name)
-        return names_list
+    staged: dict[tuple[str, str], str | None] = {}
+    _ENV_TRANSACTION.append(staged)
+    try:
+        yield
+    finally:
+        _ENV_TRANSACTION.pop()
+    _flush_env(staged)
+
+
+#: Splits a version name into implementation, release and pre-release parts.
+#: A pre-release tag must be followed by its number or end the name, so
+#: platform suffixes such as '-arm64', '-amd64' or '-arm' are ignored
+_VERSION_NAME_PATTERN = re.compile(
+    r"(?P<impl>[A-Za-z]*)[-_]?(?P<release>\d+(?:\.\d+)*)"
+    r"(?:[.-]?(?P<pre>alpha|beta|rc|a|b|c)(?=\.?\d|$)\.?(?P<prenum>\d*))?",
+    re.IGNORECASE,
+)
+_PRE_RELEASE_RANKS = {"a": 0, "alpha": 0, "b": 1, "beta": 1, "c": 2, "rc": 2}
+#: Implementation prefixes that name CPython, such as in 'python3.11'
+_CPYTHON_NAMES = ("", "cpython", "python")
+
+
+def _version_key(name: str) -> tuple:
+    """Returns the sort key of a version name, in ascending version order.
+
+    The key is (release, pre-release, implementation, name), e.g.
+    '3.13.0rc1' -> ((3, 13, 0), (2, 1), (True, 'cpython'), '3.13.0rc1').
+    A final release sorts after its pre-releases, CPython sorts after other
+    implementations of the same release, and names without a version number
+    sort before everything else.
+    """
+    match = _VERSION_NAME_PATTERN.search(name)
+    if match is None:
+        return (), (-1, 0), (False, ""), name
+    release = tuple(int(part) for part in match["release"].split("."))
+    if match["pre"]:
+        rank = _PRE_RELEASE_RANKS[match["pre"].lower()]
+        pre_release = (rank, int(match["prenum"] or 0))
     else:
-        pynball_raw_dict = ast.literal_eval(pynball_var)
-        for name in pynball_raw_dict:
-            paths_list.append(pynball_raw_dict[name])
-        return paths_list
+        pre_release = (3, 0)
+    implementation = match["impl"].lower()
+    if implementation in _CPYTHON_NAMES:
+        implementation = "cpython"
+    return release, pre_release, (implementation == "cpython", implementation), name
 
 
-def _get_system_path() -> tuple[list, list]:
-    """Returns Python system Interpreter if set and corresponding Pynball 'name' if set.
+class VersionRegistry:
+    """The Pynball configuration: a mapping of names to installation paths.
 
-    Returns:
-        System Interpreter: list, Pynball 'name': list
+    The registry keeps two hash indexes - name -> path and normalised path ->
+    name - so membership tests and reverse lookups never scan the versions.
+    Each name's '_version_key' is computed once and kept in a sorted list, so
+    the registry is always ordered newest version first and a new name is
+    placed with a binary search instead of a re-sort.
     """
-    python_system_paths = []
-    python_system_paths_objects = []
-    pynball_system_names = []
-    pynball_versions = _get_pynball("dict_path_object", "PYNBALL")
-    system_path_string = _getenv("system", "PATH")
-    system_path_variables = system_path_string.split(";")
-    for path in system_path_variables:
-        pathobject = Path(path)
-        if (pathobject / "python.exe").is_file() and os.path.getsize(
-            pathobject / "python.exe"
-        ) > 0:
-            python_system_paths.append(path)
-            python_system_paths_objects.append(pathobject)
-
-    if pynball_versions:
-        for pathobject in python_system_paths_objects:
-            for name, path in pynball_versions.items():
-                if path == pathobject:
-                    pynball_system_names.append(name)
 
-    return python_system_paths, pynball_system_names
+    __slots__ = ("_paths", "_names_by_path", "_keys", "_order")
+
+    def __init__(self, versions: dict[str, Any] | None = None) -> None:
+        """Builds the registry from a {name: path} dictionary.
+
+        Args:
+            versions:  The dictionary. Format: {"name: str": "path to version",}
+        """
+        self._paths: dict[str, str] = {}
+        self._names_by_path: dict[str, str] = {}
+        self._keys: dict[str, tuple] = {}
+        self._order: list[tuple] = []
+        if versions:
+            self.update(versions.items())
+
+    @staticmethod
+    def normalize(path: Any) -> str:
+        """Returns the form of a path used as the reverse lookup key."""
+        return os.path.normcase(os.path.normpath(str(path)))
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._paths
+
+    def __iter__(self) -> Any:
+        return iter(self.names())
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def __repr__(self) -> str:
+        return f"VersionRegistry({self.to_dict()!r})"
+
+    def copy(self) -> "VersionRegistry":
+        """Returns an independent copy of the registry."""
+        duplicate = VersionRegistry()
+        duplicate._paths = dict(self._paths)
+        duplicate._names_by_path = dict(self._names_by_path)
+        duplicate._keys = dict(self._keys)
+        duplicate._order = list(self._order)
+        return duplicate
+
+    def path(self, name: str) -> Path | None:
+        """Returns the installation path configured for a name."""
+        try:
+            return Path(self._paths[name])
+        except KeyError:
+            return None
 
+    def name_for(self, path: Any) -> str | None:
+        """Returns the name configured for an installation path."""
+        return self._names_by_path.get(self.normalize(path))
+
+    def key(self, name: str) -> tuple:
+        """Returns the precomputed version key of a configured name."""
+        return self._keys[name]
+
+    def _index(self, name: str, path: Any) -> tuple:
+        """Adds a name to the hash indexes and returns its version key."""
+        key = _version_key(name)
+        self._paths[name] = str(path)
+        self._names_by_path[self.normalize(path)] = name
+        self._keys[name] = key
+        return key
+
+    def set(self, name: str, path: Any) -> None:
+        """Adds a name / path or points an existing name at a new path."""
+        self.remove(name)
+        bisect.insort(self._order, self._index(name, path))
+
+    def update(self, items: Any) -> None:
+        """Adds many (name, path) pairs, sorting the version order once."""
+        versions = dict(items)
+        for name in versions:
+            self.remove(name)
+        for name, path in versions.items():
+            self._order.append(self._index(name, path))
+        self._order.sort()
+
+    def remove(self, name: str) -> bool:
+        """Removes a name from the registry.
+
+        Returns:
+            True:   If the name was present.
+            False:  If there was nothing to remove.
+        """
+        path = self._paths.pop(name, None)
+        if path is None:
+            return False
+        normalized = self.normalize(path)
+        if self._names_by_path.get(normalized) == name:
+            del self._names_by_path[normalized]
+        key = self._keys.pop(name)
+        del self._order[bisect.bisect_left(self._order, key)]
+        return True
+
+    def names(self) -> list[str]:
+        """Returns the configured names, newest version first."""
+        return [key[-1] for key in reversed(self._order)]
+
+    def paths(self) -> list[str]:
+        """Returns the configured paths, newest version first."""
+        return [self._paths[name] for name in self.names()]
+
+    def items(self) -> list[tuple[str, Path]]:
+        """Returns the (name, path) pairs, newest version first."""
+        return [(name, Path(self._paths[name])) for name in self.names()]
+
+    def to_dict(self) -> dict[str, str]:
+        """Returns a plain {name: path string} dictionary, newest version first."""
+        return {name: self._paths[name] for name in self.names()}
+
+
+def _clear_env_cache() -> None:
+    """Forget every cached environment value and reset the read counter."""
+    _ENV_CACHE.clear()
+    _PYNBALL_PARSE_CACHE.clear()
+    _PATH_SCAN_CACHE.clear()
+    _ENV_CACHE_STATS["reads"] = 0
+    _ENV_CACHE_STATS["invalidations"] = 0
+
+
+def _encode_pynball(registry: VersionRegistry) -> str:
+    """Serialises the registry as the format header followed by compact JSON.
 
-@cli.command()
-@click.argument("name")
-@click.argument("version_path", type=click.Path())
-def add(name: str, version_path: str) -> None:
-    """Adds a name / path of an installation of Python.
+    Note:
+        This is the self-contained single value format used by 'exportconf'.
+        A JSON object keeps the order of the names, which is the order
+        presented by the 'versions' command.
+    """
+    body = json.dumps(registry.to_dict(), separators=(",", ":"))
+    return f"{_PYNBALL_FORMAT}{body}"
+
+
+def _decode_pynball(pynball_var: str) -> VersionRegistry:
+    """Converts a single value Pynball configuration into a registry.
 
-    \b
     Args:
-        name:           Friendly name of a python installation. Can be any string.
-                        e.g. 3.6
-        version_path:   The path to the python interpreter
-                        e.g. /PYTHON/python3.6
+        pynball_var:  The raw string. Either the header-tagged JSON format or the
+                      legacy 'str(dict)' format.
+
+    Raises:
+        ValueError:  If the string was written in an unknown format.
     """
-    sorted_versions = []
-    sorted_versions_dict = {}
-    pynball_versions = _get_pynball("dict_path_object", "PYNBALL")
-    pynball_dict = _get_pynball("dict", "PYNBALL")
+    if pynball_var.startswith("{"):
+        return VersionRegistry(ast.literal_eval(pynball_var))
+    if pynball_var[:1] == _PYNBALL_FORMAT:
+        return VersionRegistry(json.loads(pynball_var[1:]))
+    raise ValueError(f"Unknown Pynball configuration format: {pynball_var[:1]!r}")
 
-    path_object = Path(version_path)
-    if not (path_object / "python.exe").is_file():
-        message = "There is no Python Interpreter on that path"
-        _feedback(message, "warning")
-        return
-    if pynball_versions:
-        if version_path in _get_pynball("paths", "PYNBALL"):
-            existing_name = list(pynball_dict.keys())[
-                list(pynball_dict.values()).index(version_path)
-            ]
-            message = f"'{name}' already added to configuration as '{existing_name}'"
-            _feedback(message, "warning")
-            return
-        for ver in pynball_versions:
-            sorted_versions.append(ver)
-        sorted_versions.append(str(name))
-        sorted_versions.sort(reverse=True, key=lambda s: list(map(int, s.split("."))))
-        for ver in sorted_versions:
-            if ver == str(name):
-                sorted_versions_dict[ver] = path_object
-            else:
-                sorted_versions_dict[ver] = pynball_versions[ver]
-    else:
-        sorted_versions_dict[name] = path_object
 
-    _set_pynball(sorted_versions_dict, "PYNBALL")
-    message = f"'{name}' Successfully added to configuration"
-    _feedback(message, "nominal")
+def _parse_pynball(pynball_var: str) -> VersionRegistry:
+    """Converts a single value Pynball configuration, parsing each string once.
+
+    Args:
+        pynball_var:  The raw string.
+
+    Returns:
+        VersionRegistry:    A fresh copy that the caller may mutate.
+    """
+    if pynball_var not in _PYNBALL_PARSE_CACHE:
+        _PYNBALL_PARSE_CACHE[pynball_var] = _decode_pynball(pynball_var)
+    return _PYNBALL_PARSE_CACHE[pynball_var].copy()
+
+
+def _shard_name(varname: str, name: str) -> str:
+    """Returns the name of the value holding the path of one configured version."""
+    return f"{varname}:{name}"
+
+
+def _encode_index(names: list[str]) -> str:
+    """Serialises the list of configured names as the PYNBALL index."""
+    return f"{_PYNBALL_INDEX_FORMAT}{json.dumps(names, separators=(',', ':'))}"
+
+
+def _decode_index(pynball_var: str) -> list[str]:
+    """Returns the names listed by a PYNBALL index."""
+    return json.loads(pynball_var[1:])
+
+
+def _load_shards(pynball_var: str, varname: str) -> VersionRegistry:
+    """Builds the registry from an index and the per-version values it names.
+
+    Returns:
+        VersionRegistry:    A fresh copy that the caller may mutate.
+    """
+    names = _decode_index(pynball_var)
+    shards = [_shard_name(varname, name) for name in names]
+    paths = tuple(_getenv_many(_SHARD_SCOPE, shards))
+    if (pynball_var, paths) not in _PYNBALL_PARSE_CACHE:
+        _PYNBALL_PARSE_CACHE[(pynball_var, paths)] = VersionRegistry(
+            {name: path for name, path in zip(names, paths) if path is not None}
+        )
+    return _PYNBALL_PARSE_CACHE[(pynball_var, paths)].copy()
+
+
+def _get_registry(varname: str) -> VersionRegistry | None:
+    """Reads the named Pynball configuration.
+
+    Note:
+        The configuration is stored as an index value in the user scope that
+        lists the names, plus one value per name in the 'pynball' scope holding
+        its path. A configuration still held in a single value (the legacy
+        'str(dict)' format or the JSON format written by 'exportconf') is
+        rewritten in that layout the first time it is read.
+
+    Returns:
+        VersionRegistry:    The configured versions.
+        None:               If the configuration has never been written.
+    """
+    pynball_var = _getenv("user", varname)
+    if pynball_var is None:
+        return None
+    try:
+        if pynball_var[:1] == _PYNBALL_INDEX_FORMAT:
+            return _load_shards(pynball_var, varname)
+        registry = _parse_pynball(pynball_var)
+    except (ValueError, SyntaxError) as e:
+        message = f"Cannot read the Pynball configuration - {e}"
+        _feedback(message, "error")
+        sys.exit(1)
+    _set_registry(registry, varname)
+    return registry
+
+
+def _set_registry(registry: VersionRegistry, varname: str) -> None:
+    """Writes the registry as an index plus one value per configured version.
+
+    Only the per-version values that changed are written, and the values of
+    names no longer configured are deleted.
+    """
+    pynball_var = _getenv("user", varname)
+    old_names: set[str] = set()
+    if pynball_var and pynball_var[:1] == _PYNBALL_INDEX_FORMAT:
+        old_names.update(_decode_index(pynball_var))
+    with _env_transaction():
+        for name, path in registry.to_dict().items():
+            _setenv(_SHARD_SCOPE, _shard_name(varname, name), path)
+        for name in old_names.difference(registry):
+            _delenv(_SHARD_SCOPE, _shard_name(varname, name))
+        _setenv("user", varname, _encode_index(registry.names()))
+
+
+def _get_index(varname: str) -> list[str] | None:
+    """Returns the configured names without reading their paths.
+
+    Returns:
+        list:   The names, newest version first.
+        None:   If the configuration has never been written.
+    """
+    pynball_var = _getenv("user", varname)
+    if pynball_var is None:
+        return None
+    if pynball_var[:1] != _PYNBALL_INDEX_FORMAT:
+        _get_registry(varname)
+        pynball_var = _getenv("user", varname)
+    return _decode_index(pynball_var)
+
+
+def _get_version_path(name: str, varname: str) -> Path | None:
+    """Returns the path configured for a single name, reading only that value."""
+    names = _get_index(varname)
+    if names is None or name not in names:
+        return None
+    path = _getenv(_SHARD_SCOPE, _shard_name(varname, name))
+    return None if path is None else Path(path)
+
+
+def _remove_version(name: str, varname: str) -> bool:
+    """Removes a single name, rewriting only the index and deleting its value.
+
+    Returns:
+        True:   If the name was configured.
+        False:  If there was nothing to remove.
+    """
+    names = _get_index(varname)
+    if names is None or name not in names:
+        return False
+    names.remove(name)
+    with _env_transaction():
+        _delenv(_SHARD_SCOPE, _shard_name(varname, name))
+        _setenv("user", varname, _encode_index(names))
+    return True
+
+
+def _stat_entries(
+    paths: list[Path], timeout: float
+) -> list[tuple[os.stat_result | None, float | None]]:
+    """Stats several paths concurrently, giving up on any that hang.
+
+    Each stat runs in a daemon thread, so a dead network share cannot keep
+    the process alive.
+
+    Args:
+        paths:      Paths to stat.
+        timeout:    Seconds to wait for each path.
+
+    Returns:
+        A (stat result or None, seconds taken or None if it timed out) pair for
+        each path, in the same order.
+    """
+    results: list[tuple[os.stat_result | None, float | None]]
+    results = [(None, None)] * len(paths)
+
+    def run(index: int, path: Path) -> None:
+        start = time.perf_counter()
+        try:
+            path_stat: os.stat_result | None = os.stat(path)
+        except OSError:
+            path_stat = None
+        results[index] = path_stat, time.perf_counter() - start
+
+    threads = [
+        threading.Thread(target=run, args=(index, path), daemon=True)
+        for index, path in enumerate(paths)
+    ]
+    for thread in threads:
+        thread.start()
+    deadline = time.perf_counter() + timeout
+    for thread in threads:
+        thread.join(max(0.0, deadline - time.perf_counter()))
+    return list(results)
+
+
+def _get_system_interpreters() -> list[str]:
+    """Returns the entries of the system PATH that hold a Python interpreter.
+
+    Entries are deduplicated after normalization and python.exe is stat'ed
+    once per entry. Entries that take longer than '_PATH_SLOW_SECONDS' are
+    reported, and entries that do not answer within '_PATH_STAT_TIMEOUT' are
+    treated as holding no interpreter. The result is cached for the session.
+    """
+    system_path_string = _getenv("system", "PATH") or ""
+    if system_path_string in _PATH_SCAN_CACHE:
+        return list(_PATH_SCAN_CACHE[system_path_string])
+    entries: dict[str, str] = {}
+    for entry in system_path_string.split(";"):
+        entry = entry.strip().strip('"')
+        if entry:
+            entries.setdefault(VersionRegistry.normalize(entry), entry)
+    candidates = list(entries.values())
+    stats = _stat_entries(
+        [Path(entry) / "python.exe" for entry in candidates], _PATH_STAT_TIMEOUT
+    )
+    python_system_paths = []
+    for entry, (exe_stat, seconds) in zip(candidates, stats):
+        if seconds is None:
+            message = (
+                f"PATH entry '{entry}' did not respond within "
+                f"{_PATH_STAT_TIMEOUT:g}s and was skipped"
+            )
+            _feedback(message, "warning")
+        elif seconds > _PATH_SLOW_SECONDS:
+            message = f"PATH entry '{entry}' is slow ({seconds * 1000:.0f} ms)"
+            _feedback(message, "warning")
+        if exe_stat and stat.S_ISREG(exe_stat.st_mode) and exe_stat.st_size > 0:
+            python_system_paths.append(entry)
+    _PATH_SCAN_CACHE[system_path_string] = python_system_paths
+    return list(python_system_paths)
+
+
+def _get_system_path() -> tuple[list, list]:
+    """Returns Python system Interpreter if set and corresponding Pynball 'name' if set.
+
+    Returns:
+        System Interpreter: list, Pynball 'name': list
+    """
+    pynball_system_names = []
+    registry = _get_registry("PYNBALL")
+    python_system_paths = _get_system_interpreters()
+    if registry:
+        for path in python_system_paths:
+            name = registry.name_for(path)
+            if name is not None:
+                pynball_system_names.append(name)
+
+    return python_system_paths, pynball_system_names
+
+
+def _merge_versions(
+    registry: VersionRegistry, discovered: list[tuple[str, Path]]
+) -> dict[str, list[tuple[str, str]]]:
+    """Merges discovered installations into the registry, sorting it once.
+
+    A discovered installation is a duplicate if its path is already configured,
+    or if its name is already taken by another path - the existing entry wins.
+    The new entries are placed in version order with a single sort.
+
+    Args:
+        registry:    The configuration to merge into. Modified in place.
+        discovered:  Format: [(name, path to version),]
+
+    Returns:
+        Format: {"added": [(name, path),], "duplicated": [(name, existing name),]}
+    """
+    summary: dict[str, list[tuple[str, str]]] = {"added": [], "duplicated": []}
+    new_versions: dict[str, Path] = {}
+    new_paths: dict[str, str] = {}
+    for name, path in discovered:
+        existing_name = registry.name_for(path) or new_paths.get(
+            VersionRegistry.normalize(path)
+        )
+        if existing_name is None and (name in registry or name in new_versions):
+            existing_name = name
+        if existing_name is not None:
+            summary["duplicated"].append((name, existing_name))
+            continue
+        new_versions[name] = path
+        new_paths[VersionRegistry.normalize(path)] = name
+        summary["added"].append((name, str(path)))
+    registry.update(new_versions.items())
+    return summary
+
+
+@cli.command()
+@click.argument("name")
+@click.argument("version_path", type=click.Path())
+def add(name: str, version_path: str) -> None:
+    """Adds a name / path of an installation of Python.
+
+    \b
+    Args:
+        name:           Friendly name of a python installation. Can be any string.
+                        e.g. 3.6
+        version_path:   The path to the python interpreter
+                        e.g. /PYTHON/python3.6
+    """
+    registry = _get_registry("PYNBALL") or VersionRegistry()
+    path_object = Path(version_path)
+    if not (path_object / "python.exe").is_file():
+        message = "There is no Python Interpreter on that path"
+        _feedback(message, "warning")
+        return
+    existing_name = registry.name_for(path_object)
+    if existing_name is not None:
+        message = f"'{name}' already added to configuration as '{existing_name}'"
+        _feedback(message, "warning")
+        return
+    registry.set(str(name), path_object)
+    _set_registry(registry, "PYNBALL")
+    message = f"'{name}' Successfully added to configuration"
+    _feedback(message, "nominal")
+
+
+#: One clause of a version specifier, e.g. '>=3.10', '==3.11.4' or '3.11'
+_SPEC_CLAUSE_PATTERN = re.compile(
+    r"^(?P<op>>=|<=|==|!=|~=|>|<)?\s*(?P<version>\d+(?:\.\d+)*)$"
+)
+#: Comparisons of a release with the version of a specifier clause
+_SPEC_OPERATORS = {
+    ">=": operator.ge,
+    "<=": operator.le,
+    ">": operator.gt,
+    "<": operator.lt,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+
+def _parse_spec(spec: str) -> tuple[str, list[tuple[str, tuple[int, ...]]]]:
+    """Splits a version specifier into an implementation and its clauses.
+
+    Args:
+        spec:   e.g. '3.11', '>=3.10,<3.12', 'pypy3' or 'pypy>=3.9'.
+                Without an implementation, 'cpython' is assumed.
+
+    Returns:
+        The implementation, and (operator, version) clauses. A clause without
+        an operator, such as '3.11', has the operator ''.
+
+    Raises:
+        ValueError: If the specifier cannot be parsed.
+    """
+    match = re.fullmatch(r"\s*(?P<impl>[A-Za-z]*)\s*(?P<clauses>.*?)\s*", spec)
+    if match is None:
+        raise ValueError(spec)
+    clauses = []
+    if match["clauses"]:
+        for clause in match["clauses"].split(","):
+            clause_match = _SPEC_CLAUSE_PATTERN.fullmatch(clause.strip())
+            if clause_match is None:
+                raise ValueError(spec)
+            version = tuple(int(part) for part in clause_match["version"].split("."))
+            clauses.append((clause_match["op"] or "", version))
+    implementation = match["impl"].lower()
+    if implementation in _CPYTHON_NAMES:
+        implementation = "cpython"
+    return implementation, clauses
+
+
+def _spec_matches(
+    name: str, implementation: str, clauses: list[tuple[str, tuple[int, ...]]]
+) -> bool:
+    """Returns True if a configured name satisfies a parsed specifier."""
+    release, _, (_, name_implementation), _ = _version_key(name)
+    if not release or name_implementation != implementation:
+        return False
+    for op, version in clauses:
+        width = max(len(release), len(version))
+        padded_release = release + (0,) * (width - len(release))
+        padded_version = version + (0,) * (width - len(version))
+        if op == "":
+            matched = release[: len(version)] == version
+        elif op == "~=":
+            prefix = version[:-1]
+            matched = padded_release >= padded_version and (
+                release[: len(prefix)] == prefix
+            )
+        else:
+            matched = _SPEC_OPERATORS[op](padded_release, padded_version)
+        if not matched:
+            return False
+    return True
+
+
+def _resolve_spec(names: list[str], spec: str) -> str | None:
+    """Returns the newest configured name that satisfies a specifier.
+
+    A name that equals the specifier is always chosen.
+
+    Args:
+        names:  Configured names, newest version first.
+        spec:   See '_parse_spec'.
+
+    Raises:
+        ValueError: If the specifier cannot be parsed.
+    """
+    if spec in names:
+        return spec
+    implementation, clauses = _parse_spec(spec)
+    for name in names:
+        if _spec_matches(name, implementation, clauses):
+            return name
+    return None
+
+
+#: PY_VERSION as defined in an installation's patchlevel.h, such as '3.13.0rc1'
+_PATCHLEVEL_PATTERN = re.compile(
+    rb'#define\s+PY_VERSION\s+"(\d+\.\d+\.\d+(?:(?:a|b|rc)\d+)?)'
+)
+#: Pre-release suffixes of the release levels in sys.version_info
+_RELEASE_LEVELS = {"alpha": "a", "beta": "b", "candidate": "rc", "final": ""}
+#: Pre-release suffixes of PY_RELEASE_LEVEL as stored in a PE version resource
+_PE_RELEASE_LEVELS = {0xA: "a", 0xB: "b", 0xC: "rc", 0xF: ""}
+#: pythonXY.dll on Windows and libpythonX.Y.so elsewhere
+_LIBRARY_PATTERN = re.compile(r"^(?:python(\d)(\d+)\.dll|libpython(\d)\.(\d+)\.so)")
+#: Signature of the VS_FIXEDFILEINFO block in a PE version resource
+_PE_VERSION_SIGNATURE = struct.pack("<I", 0xFEEF04BD)
+
+
+def _patchlevel_version(directory: Path) -> str | None:
+    """Reads PY_VERSION from the patchlevel.h header of an installation."""
+    headers = [directory / "include" / "patchlevel.h"]
+    headers += directory.glob("include/python*/patchlevel.h")
+    if (directory / "Include").is_dir():
+        headers.append(directory / "Include" / "patchlevel.h")
+    for header in headers:
+        try:
+            match = _PATCHLEVEL_PATTERN.search(header.read_bytes())
+        except OSError:
+            continue
+        if match:
+            return match.group(1).decode()
+    return None
+
+
+def _pe_version(exe: Path) -> str | None:
+    """Reads the version from the PE version resource of an executable.
+
+    Note:
+        CPython stores micro * 1000 + release level * 10 + serial in the third
+        field of the file version. The release level is PY_RELEASE_LEVEL, 0xA
+        to 0xC for the pre-releases and 0xF for a final release.
+    """
+    try:
+        with open(exe, "rb") as file:
+            if file.read(2) != b"MZ":
+                return None
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                offset = view.rfind(_PE_VERSION_SIGNATURE)
+                if offset < 0 or offset + 16 > len(view):
+                    return None
+                version_ms, version_ls = struct.unpack_from("<II", view, offset + 8)
+    except (OSError, ValueError):
+        return None
+    major, minor = version_ms >> 16, version_ms & 0xFFFF
+    micro, release = divmod(version_ls >> 16, 1000)
+    level, serial = divmod(release, 10)
+    if level not in _PE_RELEASE_LEVELS:
+        return None
+    suffix = _PE_RELEASE_LEVELS[level]
+    return f"{major}.{minor}.{micro}{suffix}{serial if suffix else ''}"
+
+
+def _layout_series(directory: Path) -> set[str]:
+    """Finds the 'X.Y' series named by the libraries and lib directories."""
+    series = set()
+    for folder in (directory, directory / "lib"):
+        try:
+            entries = list(os.scandir(folder))
+        except OSError:
+            continue
+        for entry in entries:
+            match = _LIBRARY_PATTERN.match(entry.name)
+            if match:
+                major, minor = (group for group in match.groups() if group)
+                series.add(f"{major}.{minor}")
+            elif folder.name == "lib" and entry.is_dir():
+                match = re.fullmatch(r"python(\d)\.(\d+)", entry.name)
+                if match:
+                    series.add(".".join(match.groups()))
+    return series
+
+
+def _static_version(directory: Path) -> str | None:
+    """Reads an installation's version from its files without running it.
+
+    The full version comes from patchlevel.h and the PE version resource of
+    python.exe. The library names and lib layout only give the 'X.Y' series
+    and are used to check it.
+
+    Args:
+        directory:  Root directory of a Python installation.
+
+    Returns:
+        The version, or None if it is missing or the sources disagree.
+    """
+    sources = (_patchlevel_version(directory), _pe_version(directory / "python.exe"))
+    versions = {version for version in sources if version is not None}
+    if len(versions) != 1:
+        return None
+    version = versions.pop()
+    series = _layout_series(directory)
+    if series and series != {".".join(version.split(".")[:2])}:
+        return None
+    return version
+
+
+#: Run with -I -S to collect an interpreter's metadata as JSON in one process start
+_PROBE_SCRIPT = """\
+import importlib.util, json, struct, sys, sysconfig
+print(json.dumps({
+    "version_info": list(sys.version_info),
+    "implementation": sys.implementation.name,
+    "pointer_size": struct.calcsize("P") * 8,
+    "platform": sysconfig.get_platform(),
+    "abiflags": getattr(sys, "abiflags", ""),
+    "paths": sysconfig.get_paths(),
+    "venv": sys.prefix == getattr(sys, "base_prefix", sys.prefix)
+    and importlib.util.find_spec("venv") is not None,
+    "ensurepip": importlib.util.find_spec("ensurepip") is not None,
+}))
+"""
+#: Machine field of a PE header mapped to the architecture it names
+_PE_MACHINES = {0x014C: "x86", 0x8664: "AMD64", 0xAA64: "ARM64"}
+#: sysconfig platforms of Windows mapped to the same names as '_PE_MACHINES'
+_PLATFORM_MACHINES = {"win32": "x86", "win-amd64": "AMD64", "win-arm64": "ARM64"}
+#: Files that identify a PyPy installation
+_PYPY_PATTERN = re.compile(r"^(?:pypy3?(?:\.\d+)?(?:w)?\.exe|libpypy3[\w.-]*)$")
+#: Format of the interpreter metadata cache file
+_METADATA_CACHE_FORMAT = "2"
+#: Number of interpreters kept in the metadata cache before the oldest are evicted
+_METADATA_CACHE_LIMIT = 256
+#: File holding the interpreter metadata cache
+_METADATA_CACHE_PATH = get_environ("PYNBALL_CACHE")
+if _METADATA_CACHE_PATH == Path(""):
+    _METADATA_CACHE_PATH = (
+        Path(os.environ.get("LOCALAPPDATA") or Path.home() / ".cache")
+        / "pynball"
+        / "interpreters.json"
+    )
+
+
+def _pe_machine(exe: Path) -> str | None:
+    """Reads the target architecture from the PE header of an executable."""
+    try:
+        with open(exe, "rb") as file:
+            header = file.read(64)
+            if len(header) < 64 or header[:2] != b"MZ":
+                return None
+            (offset,) = struct.unpack_from("<I", header, 0x3C)
+            file.seek(offset)
+            signature = file.read(6)
+    except OSError:
+        return None
+    if len(signature) < 6 or signature[:4] != b"PE\0\0":
+        return None
+    (machine,) = struct.unpack_from("<H", signature, 4)
+    return _PE_MACHINES.get(machine)
+
+
+def _run_probe(exe: Path) -> tuple[dict | None, str | None]:
+    """Runs '_PROBE_SCRIPT' in an interpreter, its only process start.
+
+    Args:
+        exe:    The interpreter.
+
+    Returns:
+        A (probe, error) pair. Probe is the decoded JSON, or holds just the
+        'version' if the interpreter printed something else, such as a
+        '--version' banner. It is None if no version could be found.
+    """
+    try:
+        output = _execute(exe, "-I", "-S", "-c", _PROBE_SCRIPT, timeout=_PROBE_TIMEOUT)
+    except Exception as e:
+        return None, str(e).strip() or type(e).__name__
+    if output is None:
+        return None, f"Could not run {exe}"
+    try:
+        probe = json.loads(output)
+    except ValueError:
+        match = re.search(r"\d{1,2}\.\d{1,2}\.\d{1,2}(?:(?:a|b|rc)\d+)?", output)
+        return ({"version": match.group(0)} if match else None), None
+    major, minor, micro, level, serial = probe["version_info"]
+    suffix = _RELEASE_LEVELS.get(level, "")
+    probe["version"] = f"{major}.{minor}.{micro}{suffix}{serial if suffix else ''}"
+    return probe, None
+
+
+def _probe_interpreter(directory: Path) -> tuple[dict | None, str | None]:
+    """Collects the metadata of the interpreter in a directory.
+
+    The metadata is read from the installation's files when they agree on
+    the version. Otherwise the interpreter is started once to run
+    '_PROBE_SCRIPT'.
+
+    Args:
+        directory:  Directory expected to contain python.exe.
+
+    Returns:
+        A (metadata, error) pair. Metadata holds the version, architecture
+        (one of the '_PE_MACHINES' names, or None if unknown), implementation
+        and whether the interpreter is an installation that can be the base
+        of a virtual environment. After a probe it also holds
+        the pointer size, ABI flags, sysconfig paths and whether ensurepip is
+        available. It is None if the directory has no interpreter or its
+        version cannot be found. Error holds the reason a probe failed, so
+        one failure does not stop the other probes.
+    """
+    exe = directory / "python.exe"
+    if not exe.exists():
+        return None, None
+    architecture = _pe_machine(exe)
+    version = _static_version(directory)
+    if version is None:
+        probe, error = _run_probe(exe)
+        if probe is None:
+            return None, error
+        if "version_info" in probe:
+            return {
+                "version": probe["version"],
+                "architecture": architecture
+                or _PLATFORM_MACHINES.get(probe.get("platform", "")),
+                "implementation": probe["implementation"],
+                "venv_base": probe["venv"],
+                "pointer_size": probe["pointer_size"],
+                "abiflags": probe["abiflags"],
+                "paths": probe["paths"],
+                "ensurepip": probe["ensurepip"],
+            }, None
+        version = probe["version"]
+    try:
+        names = [entry.name for entry in os.scandir(directory)]
+    except OSError:
+        names = []
+    pypy = any(_PYPY_PATTERN.match(name) for name in names)
+    metadata = {
+        "version": version,
+        "architecture": architecture,
+        "implementation": "pypy" if pypy else "cpython",
+        "venv_base": "pyvenv.cfg" not in names
+        and not (directory.parent / "pyvenv.cfg").exists(),
+    }
+    return metadata, None
+
+
+class _InterpreterCache:
+    """Interpreter metadata kept on disk between runs.
+
+    Entries are keyed by the normalized installation directory and are only
+    valid while the (mtime, size, inode) fingerprint of its python.exe is
+    unchanged. The least recently used entries are evicted once there are
+    more than 'limit'.
+    """
+
+    __slots__ = ("path", "limit", "_entries", "_dirty")
+
+    def __init__(self, path: Path, limit: int = _METADATA_CACHE_LIMIT) -> None:
+        self.path = path
+        self.limit = limit
+        self._dirty = False
+        self._entries: dict[str, dict] = {}
+        try:
+            document = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if document.get("format") == _METADATA_CACHE_FORMAT:
+            self._entries = document.get("interpreters", {})
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def fingerprint(directory: Path) -> list[int] | None:
+        """Returns the (mtime, size, inode) of python.exe, or None if it is missing."""
+        try:
+            exe_stat = os.stat(directory / "python.exe")
+        except OSError:
+            return None
+        return [exe_stat.st_mtime_ns, exe_stat.st_size, exe_stat.st_ino]
+
+    def get(self, directory: Path, fingerprint: list[int] | None) -> dict | None:
+        """Returns the cached metadata if python.exe is unchanged, else None."""
+        key = VersionRegistry.normalize(directory)
+        entry = self._entries.get(key)
+        if entry is None or fingerprint is None or entry["fingerprint"] != fingerprint:
+            return None
+        # Only the order in memory changes - it is written along with the next
+        # put, so a run that only hits the cache never rewrites it
+        self._entries[key] = self._entries.pop(key)
+        return entry["metadata"]
+
+    def put(self, directory: Path, fingerprint: list[int], metadata: dict) -> None:
+        """Stores metadata, evicting the least recently used entries if full."""
+        key = VersionRegistry.normalize(directory)
+        self._entries.pop(key, None)
+        self._entries[key] = {"fingerprint": fingerprint, "metadata": metadata}
+        while len(self._entries) > self.limit:
+            del self._entries[next(iter(self._entries))]
+        self._dirty = True
+
+    def save(self) -> None:
+        """Writes the cache if it changed. A cache that cannot be written is skipped."""
+        if not self._dirty:
+            return
+        document = {"format": _METADATA_CACHE_FORMAT, "interpreters": self._entries}
+        with contextlib.suppress(OSError):
+            _write_atomic(self.path, json.dumps(document, separators=(",", ":")))
+        self._dirty = False
+
+
+#: Directory names that never hold another installation, so discovery skips them
+_PRUNED_DIRS = frozenset(
+    {
+        "__pycache__",
+        "dlls",
+        "doc",
+        "include",
+        "lib",
+        "libs",
+        "node_modules",
+        "scripts",
+        "share",
+        "site-packages",
+        "tcl",
+        "tools",
+    }
+)
+
+
+def _walk_installations(
+    roots: list[Path], max_depth: int = 1
+) -> Iterator[tuple[Path, bool]]:
+    """Walks directory trees looking for Python installations.
+
+    Each directory is read once with os.scandir, and the type information of
+    its entries is reused, so no entry is stat'ed separately. The walk does
+    not descend into installations, hidden directories or the directories
+    named in '_PRUNED_DIRS'. Entries are visited in name order, so the output
+    is deterministic.
+
+    Args:
+        roots:      Directories to search.
+        max_depth:  How many levels below each root to search.
+
+    Yields:
+        (directory, True) for each directory holding python.exe, and
+        (directory, False) for each directory at the depth limit without one.
+    """
+    stack = [(root, 0) for root in reversed(roots)]
+    while stack:
+        directory, depth = stack.pop()
+        try:
+            with os.scandir(directory) as scan:
+                entries = sorted(scan, key=lambda entry: entry.name)
+        except OSError:
+            continue
+        if any(e.name.lower() == "python.exe" and e.is_file() for e in entries):
+            yield directory, True
+            continue
+        if depth >= max_depth:
+            if depth > 0:
+                yield directory, False
+            continue
+        children = [
+            Path(entry.path)
+            for entry in entries
+            if entry.is_dir()
+            and not entry.name.startswith(".")
+            and entry.name.lower() not in _PRUNED_DIRS
+        ]
+        stack.extend((child, depth + 1) for child in reversed(children))
+
+
+def _probe_job(directory: Path) -> dict | None:
+    """Runs '_probe_interpreter' as a job, raising its error so it is recorded."""
+    metadata, error = _probe_interpreter(directory)
+    if error is not None:
+        raise Exception(error)
+    return metadata
+
+
+def _discover_interpreters(
+    found: Iterable[tuple[Path, bool]], jobs: int | None = None, refresh: bool = False
+) -> Iterator[tuple[Path, dict | None, str | None]]:
+    """Collects the metadata of the interpreters found by '_walk_installations'.
+
+    Unchanged interpreters are read from the metadata cache and the others are
+    probed on a '_JobRunner' while the walk goes on. Each result is yielded as
+    soon as it and every result before it are ready.
+
+    Args:
+        found:      (directory, holds python.exe) pairs.
+        jobs:       Number of interpreters probed at the same time. Defaults to
+                    the global --jobs option.
+        refresh:    Probe every interpreter, ignoring the cache.
+
+    Yields:
+        (directory, metadata, error) for each directory, in walk order.
+    """
+    cache = _InterpreterCache(_METADATA_CACHE_PATH)
+    queue: collections.deque[tuple[Path, list[int] | None, Future]] = (
+        collections.deque()
+    )
+
+    def finish() -> tuple[Path, dict | None, str | None]:
+        directory, fingerprint, future = queue.popleft()
+        job = future.result()
+        if job.cancelled:
+            return directory, None, "cancelled"
+        if job.error is not None:
+            return directory, None, str(job.error)
+        if fingerprint is not None and job.value is not None:
+            cache.put(directory, fingerprint, job.value)
+        return directory, job.value, None
+
+    try:
+        with _JobRunner(jobs) as runner:
+            for directory, has_interpreter in found:
+                fingerprint = cache.fingerprint(directory) if has_interpreter else None
+                metadata = None
+                if fingerprint is not None and not refresh:
+                    metadata = cache.get(directory, fingerprint)
+                if metadata is not None or not has_interpreter:
+                    future: Future = Future()
+                    future.set_result(JobResult(str(directory), metadata))
+                    fingerprint = None
+                else:
+                    future = runner.submit(str(directory), _probe_job, directory)
+                queue.append((directory, fingerprint, future))
+                while queue and queue[0][2].done():
+                    yield finish()
+            while queue:
+                yield finish()
+    finally:
+        cache.save()
+
+
+@cli.command()
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Number of interpreters to probe at the same time. "
+    "Defaults to the global --jobs option.",
+)
+@click.option(
+    "--refresh",
+    is_flag=True,
+    help="Probe every interpreter again instead of using cached metadata.",
+)
+@click.option(
+    "-r",
+    "--root",
+    "roots",
+    multiple=True,
+    type=click.Path(exists=True, file_okay=False, resolve_path=True, path_type=Path),
+    help="Directory to search. May be repeated. Defaults to PYNBALL_HOME.",
+)
+@click.option(
+    "-d",
+    "--depth",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="How many directory levels below each root to search.",
+)
+def addall(
+    jobs: int | None, refresh: bool, roots: tuple[Path, ...], depth: int
+) -> None:
+    """Add all versions to the Pynball configuration.
+
+    \b
+    Note:
+        PYNBALL_HOME may hold several roots separated by the path separator.
+    """
+    search_roots = list(roots)
+    if not search_roots:
+        pynball_home = os.environ.get("PYNBALL_HOME", "")
+        search_roots = [Path(root) for root in pynball_home.split(os.pathsep) if root]
+
+    if not search_roots:
+        message = "Please specify the root directory of your Python installations: "
+        _feedback(message, "nominal")
+        try:
+            while True:
+                path = Path(input(""))
+                if path.exists():
+                    search_roots = [path]
+                    break
+        except KeyboardInterrupt:
+            return
+    # The roots are stored in PYNBALL_HOME and the registry, which are read
+    # from any working directory
+    search_roots = [root.resolve() for root in search_roots]
+    found = _walk_installations(search_roots, depth)
+
+    discovered: list[tuple[str, Path]] = []
+    skipped: list[Path] = []
+    for directory, metadata, error in _discover_interpreters(found, jobs, refresh):
+        if error is not None:
+            message = f"Could not probe '{directory}' -\n {error}"
+            _feedback(message, "warning")
+        if metadata is None:
+            skipped.append(directory)
+            continue
+        discovered.append((metadata["version"], directory))
+
+    with _env_transaction():
+        if discovered:
+            registry = _get_registry("PYNBALL") or VersionRegistry()
+            summary = _merge_versions(registry, discovered)
+            if summary["added"]:
+                _set_registry(registry, "PYNBALL")
+            pynball_home = os.pathsep.join(str(root) for root in search_roots)
+            _setenv("user", "PYNBALL_HOME", pynball_home)
+        else:
+            summary = {"added": [], "duplicated": []}
+
+    for name, _ in summary["added"]:
+        message = f"'{name}' Successfully added to configuration"
+        _feedback(message, "nominal")
+    for name, existing_name in summary["duplicated"]:
+        message = f"'{name}' already added to configuration as '{existing_name}'"
+        _feedback(message, "warning")
+    message = (
+        f"Added: {len(summary['added'])}, Skipped: {len(skipped)}, "
+        f"Duplicated: {len(summary['duplicated'])}"
+    )
+    _feedback(message, "null")
+
+
+@cli.command()
+@click.argument("name")
+def delete(name: str) -> None:
+    """Deletes a name / path of an installation of Python.
+
+    \b
+    Note:
+        This only deletes the name / path in the Pynball configuration.
+        It does not delete the Python installation.
+
+    \b
+    Args:
+        name:   Friendly name of a python installation configured in Pynball.
+                e.g. 3.6
+    """
+    name = str(name)
+    version_path = _get_version_path(name, "PYNBALL")
+    if version_path is None:
+        message = f"{name} is not in Pynballs' configuration"
+        _feedback(message, "warning")
+        return
+    system_paths = {VersionRegistry.normalize(p) for p in _get_system_interpreters()}
+    if VersionRegistry.normalize(version_path) in system_paths:
+        message = "Cannot delete System Interpreter"
+        _feedback(message, "warning")
+        versions()
+        return
+    _remove_version(name, "PYNBALL")
+
+
+@cli.command()
+def reset() -> None:
+    """Deletes all names / paths."""
+    names = _get_index("PYNBALL") or []
+    with _env_transaction():
+        for name in names:
+            _delenv(_SHARD_SCOPE, _shard_name("PYNBALL", name))
+        _delenv("user", "PYNBALL")
+
+
+@cli.command()
+def version() -> None:
+    """Display details about the system Python Interpreter."""
+    info = sys.version_info
+    message = (
+        f"{info.major}.{info.minor}.{info.micro}  ReleaseLevel: {info.releaselevel},"
+        f" Serial: {info.serial}"
+    )
+    _feedback(message, "nominal")
+
+
+@cli.command()
+def versions() -> None:
+    """Lists the names / paths of the configured Python installations."""
+    system_paths, pynball_names = _get_system_path()
+    registry = _get_registry("PYNBALL")
+    if not system_paths:
+        message = "System Interpreter is not configured"
+        _feedback(message, "warning")
+    if not pynball_names and system_paths:
+        for path in system_paths:
+            message = f"{path} : --> System Interpreter"
+            _feedback(message, "nominal")
+    if registry is None:
+        message = "Pynball configuration is empty - use 'add' command"
+        _feedback(message, "warning")
+    else:
+        for ver, path in registry.items():
+            if ver in pynball_names:
+                message = f"{ver:10}{path} : --> System Interpreter"
+                _feedback(message, "nominal")
+            else:
+                print(f"{ver:10}{path}")
+    if registry and system_paths and not pynball_names:
+        message = "System Interpreter is not in Pynball Configuration"
+        _feedback(message, "warning")
+
+
+@cli.command()
+@click.argument("spec")
+def which(spec: str) -> None:
+    """Prints the path of the newest installation matching a version spec.
+
+    \b
+    Note:
+        Only the configuration is read. Neither the PATH nor any interpreter
+        is touched, so this is cheap enough to call from build scripts.
+
+    \b
+    Args:
+        spec:   A configured name, a version prefix such as 3.11, a
+                specifier such as '>=3.10,<3.12', or an implementation
+                and version such as pypy3.
+    """
+    names = _get_index("PYNBALL") or []
+    try:
+        name = _resolve_spec(names, spec)
+    except ValueError:
+        message = f"'{spec}' is not a valid version specifier"
+        _feedback(message, "error")
+        sys.exit(1)
+    version_path = None if name is None else _get_version_path(name, "PYNBALL")
+    if version_path is None:
+        message = f"No configured installation matches '{spec}'"
+        _feedback(message, "error")
+        sys.exit(1)
+    click.echo(str(version_path))
+
+
+@cli.command()
+@click.argument("name")
+@click.pass_context
+def system(ctx: Any, name: str) -> None:
+    """Changes the system Python Interpreter version.
+
+    \b
+    Args:
+        name:  The Pynball friendly name of the Python Installation
+        \f
+        ctx:   The click context - Implementation detail that enables this
+               command to call another click command.
+               (click says this is quite naughty. But I still did it anyway)
+    """
+    name = str(name)
+    all_paths: str = _getenv("system", "PATH")
+    system_paths, pynball_names = _get_system_path()
+    registry = _get_registry("PYNBALL") or VersionRegistry()
+    pypath_new = registry.path(name)
+    if pypath_new is None:
+        message = f"{name} is not in Pynballs' configuration"
+        _feedback(message, "warning")
+        ctx.invoke(versions)
+        return
+    if len(system_paths) > 1 or len(pynball_names) > 1:
+        message = (
+            "Multiple system interpreters have been detected - "
+            "There can be only one! (see: Highlander)"
+        )
+        _feedback(message, "error")
+        return
+    if name in pynball_names:
+        message = f"{name} is already configured as the system interpreter"
+        _feedback(message, "warning")
+        ctx.invoke(versions)
+        return
+    pypath_scripts_new = pypath_new / "Scripts"
+    if len(system_paths) == 1:
+        pypath_old = Path(system_paths[0])
+        pypath_scripts_old = pypath_old / "Scripts"
+        all_paths = all_paths.replace(str(pypath_scripts_old), str(pypath_scripts_new))
+        all_paths = all_paths.replace(str(pypath_old), str(pypath_new))
+    else:
+        all_paths = "".join([str(pypath_scripts_new), ";", all_paths])
+        all_paths = "".join([str(pypath_new), ";", all_paths])
+    _setenv("system", "PATH", all_paths)
+    message = "New version set"
+    _feedback(message, "nominal")
+    message = "Remember to restart the shell to use the new version"
+    _feedback(message, "warning")
+
+
+def _diff_pyenv(
+    registry: VersionRegistry, dirs: dict[str, Path], use: bool, force: bool
+) -> dict[str, list[tuple[str, str]]]:
+    """Works out the changes that bring the configuration in line with pyenv.
+
+    System interpreters are never changed. With 'use', versions not in the
+    configuration are added, and versions already configured under the same
+    name are only replaced with 'force'. A pyenv installation already
+    configured under another name is reported as a duplicate. Without 'use',
+    the entries pointing at pyenv installations are removed.
+
+    Args:
+        registry:   The configuration, updated in place.
+        dirs:       pyenv installation directories keyed by version.
+        use:        Include the pyenv versions rather than remove them.
+        force:      pyenv versions override manual versions of the same name.
+
+    Returns:
+        {"added", "replaced", "removed", "duplicated", "missing"} lists of
+        (name, path or existing name) pairs.
+    """
+    system_paths = {VersionRegistry.normalize(p) for p in _get_system_interpreters()}
+    system_names = {
+        name
+        for name, path in registry.items()
+        if VersionRegistry.normalize(path) in system_paths
+    }
+    diff: dict[str, list[tuple[str, str]]] = {
+        "added": [],
+        "replaced": [],
+        "removed": [],
+        "duplicated": [],
+        "missing": [],
+    }
+    for ver, path in dirs.items():
+        existing_name = registry.name_for(path)
+        if not use:
+            if existing_name is not None and existing_name not in system_names:
+                registry.remove(existing_name)
+                diff["removed"].append((existing_name, str(path)))
+            continue
+        if ver in system_names or (ver in registry and not force):
+            continue
+        if existing_name is not None:
+            if existing_name != ver:
+                diff["duplicated"].append((ver, existing_name))
+            continue
+        if not (path / "python.exe").is_file():
+            diff["missing"].append((ver, str(path)))
+            continue
+        diff["replaced" if ver in registry else "added"].append((ver, str(path)))
+        registry.set(ver, path)
+    return diff
+
+
+@cli.command()
+@click.option("--nouse", "use_pyenv", flag_value="n", default=True)
+@click.option("-u", "--use", "use_pyenv", flag_value="y")
+@click.option("--noforce", "use_force", flag_value="n", default=True)
+@click.option("-f", "--force", "use_force", flag_value="y")
+def pyenv(use_pyenv: str, use_force: str) -> None:
+    """Automatically include the pyenv versions in Pynball.
+
+    Only the versions that are added, replaced or removed are listed.
+
+    \b
+    Args:
+        -u --use:       Include pyenv versions
+        -f --force:     Pyenv versions override manual versions if the name is the same
+        \f
+        use_force:      Pyenv versions override manual versions
+        use_pyenv:      Include pyenv versions
+    """
+    if _check_pyenv() == 1:
+        return
+    vers = _PYENV_HOME / "versions"
+    with os.scandir(vers) as scan:
+        dirs = {
+            e.name: Path(e.path)
+            for e in sorted(scan, key=lambda e: e.name)
+            if e.is_dir()
+        }
+    with _env_transaction():
+        registry = _get_registry("PYNBALL") or VersionRegistry()
+        diff = _diff_pyenv(registry, dirs, use_pyenv.lower() == "y", use_force == "y")
+        if diff["added"] or diff["replaced"] or diff["removed"]:
+            _set_registry(registry, "PYNBALL")
+
+    for name, _ in diff["added"]:
+        message = f"'{name}' Successfully added to configuration"
+        _feedback(message, "nominal")
+    for name, path in diff["replaced"]:
+        message = f"'{name}' now points to '{path}'"
+        _feedback(message, "nominal")
+    for name, _ in diff["removed"]:
+        message = f"'{name}' removed from configuration"
+        _feedback(message, "nominal")
+    for name, existing_name in diff["duplicated"]:
+        message = f"'{name}' already added to configuration as '{existing_name}'"
+        _feedback(message, "warning")
+    for _, path in diff["missing"]:
+        message = f"There is no Python Interpreter in '{path}'"
+        _feedback(message, "warning")
+    if not any(diff.values()):
+        message = "Pynball configuration is already in sync with pyenv"
+        _feedback(message, "null")
+
+
+#: Ways '_create_venv' can create a virtual environment, fastest first
+_VENV_BACKENDS = ("virtualenv-api", "venv", "subprocess")
+
+
+def _is_running_interpreter(python_path: Path) -> bool:
+    """Returns True if python_path is the base interpreter running pynball."""
+    base_executable = getattr(sys, "_base_executable", sys.executable)
+    try:
+        return os.path.samefile(python_path, base_executable)
+    except OSError:
+        return False
+
+
+def _venv_backend(python_path: Path) -> str:
+    """Chooses the fastest way to create a virtual environment for an interpreter.
+
+    The virtualenv API works in-process for any interpreter. The stdlib venv
+    module works in-process only for the interpreter running pynball. Anything
+    else starts a process.
+    """
+    if not python_path.is_file():
+        return "subprocess"
+    if importlib.util.find_spec("virtualenv") is not None:
+        return "virtualenv-api"
+    if _is_running_interpreter(python_path):
+        return "venv"
+    return "subprocess"
+
+
+def _create_venv(python_path: Path, venv_path: Path, backend: str = "") -> str:
+    """Creates a virtual environment, in-process where the interpreter allows it.
+
+    Args:
+        python_path:    The base interpreter.
+        venv_path:      Directory of the new virtual environment.
+        backend:        One of '_VENV_BACKENDS'. Chosen by '_venv_backend' if
+                        not given.
+
+    Returns:
+        The backend that created the environment. If an in-process backend
+        fails, the environment is created in a subprocess instead.
+
+    Raises:
+        Exception:  If the subprocess fails.
+    """
+    backend = backend or _venv_backend(python_path)
+    if backend == "virtualenv-api":
+        with contextlib.suppress(Exception, SystemExit):
+            virtualenv = importlib.import_module("virtualenv")
+            virtualenv.cli_run(
+                [str(venv_path), f"-p={str(python_path)}"], setup_logging=False
+            )
+            return backend
+    elif backend == "venv":
+        with contextlib.suppress(Exception):
+            venv.EnvBuilder(with_pip=True, symlinks=os.name != "nt").create(venv_path)
+            return backend
+    if shutil.which("virtualenv") is not None:
+        command = ["virtualenv", f"-p={str(python_path)}", str(venv_path)]
+    else:
+        command = [str(python_path), "-m", "venv", str(venv_path)]
+    _execute(*command, stream=True, timeout=_VENV_TIMEOUT)
+    return "subprocess"
+
+
+#: Directory under WORKON_HOME that holds pynball's own virtual environments
+_STATE_DIR_NAME = ".pynball"
+#: Ways '_clone_tree' can copy a file, cheapest first
+_CLONE_METHODS = ("reflink", "hardlink", "copy")
+#: File in a golden template or pool spare holding the '_interpreter_stamp' of
+#: the interpreter it was built from
+_TEMPLATE_MARKER = ".pynball-template"
+#: Linux ioctl that makes a file share the data of another (FICLONE)
+_FICLONE = 0x40049409
+#: Serialise building the golden template of a version: {name: lock}
+_TEMPLATE_LOCKS: dict[str, threading.Lock] = {}
+_TEMPLATE_LOCKS_GUARD = threading.Lock()
+#: Seconds after which a lock file is considered abandoned by a crashed process
+_LOCK_STALE_SECONDS = 600
+
+
+def _interpreter_stamp(python_path: Path) -> str:
+    """Identifies an interpreter for the marker of a template or spare.
+
+    The stamp holds the interpreter's path and its '_InterpreterCache'
+    fingerprint, so an interpreter upgraded in place no longer matches.
+    """
+    fingerprint = _InterpreterCache.fingerprint(python_path.parent)
+    return json.dumps({"python": str(python_path), "fingerprint": fingerprint})
+
+
+def _template_path(name: str) -> Path:
+    """Returns the golden virtual environment kept for a version name."""
+    return _WORKON_HOME / _STATE_DIR_NAME / "templates" / name
+
+
+def _reflink(source: Path, target: Path) -> None:
+    """Makes target a copy-on-write clone of source, such as on Btrfs or XFS.
+
+    Raises:
+        OSError:    If the platform or file system cannot clone files.
+    """
+    try:
+        import fcntl
+    except ImportError:
+        raise OSError(f"Cannot clone {source} on this platform") from None
+    with open(source, "rb") as src, open(target, "wb") as dst:
+        fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+    shutil.copystat(source, target)
+
+
+def _clone_file(source: Path, target: Path, methods: list[str]) -> None:
+    """Copies a file with the first of methods that works.
+
+    Methods that fail are removed from the list, so the remaining files of a
+    tree do not retry them. The list always ends with 'copy'.
+    """
+    while methods[0] != "copy":
+        try:
+            if methods[0] == "reflink":
+                _reflink(source, target)
+            else:
+                os.link(source, target)
+            return
+        except OSError:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(target)
+            methods.pop(0)
+    shutil.copy2(source, target)
+
+
+def _clone_entries(source: Path, target: Path, methods: list[str]) -> None:
+    """Recursively clones the entries of source into target."""
+    target.mkdir(exist_ok=True)
+    with os.scandir(source) as entries:
+        for entry in entries:
+            destination = target / entry.name
+            if entry.is_symlink():
+                os.symlink(
+                    os.readlink(entry.path),
+                    destination,
+                    target_is_directory=entry.is_dir(),
+                )
+            elif entry.is_dir():
+                _clone_entries(Path(entry.path), destination, methods)
+            elif entry.name != _TEMPLATE_MARKER:
+                _clone_file(Path(entry.path), destination, methods)
+
+
+def _clone_tree(
+    source: Path, target: Path, methods: Sequence[str] = _CLONE_METHODS
+) -> str:
+    """Copies a directory tree, sharing file data with source where possible.
+
+    Args:
+        source:     The tree to copy.
+        target:     The new tree. It may already exist as an empty directory.
+        methods:    The '_CLONE_METHODS' to try, cheapest first. A plain copy
+                    is always the last resort.
+
+    Returns:
+        The cheapest method every file could use.
+    """
+    remaining = [method for method in methods if method != "copy"] + ["copy"]
+    _clone_entries(source, target, remaining)
+    return remaining[0]
+
+
+def _patch_file(path: Path, replacements: Iterable[tuple[bytes, bytes]]) -> None:
+    """Applies byte replacements to a file.
+
+    A changed file is written to a new file that replaces the original, so a
+    hardlinked template is never modified.
+    """
+    data = path.read_bytes()
+    patched = data
+    for old, new in replacements:
+        patched = patched.replace(old, new)
+    if patched == data:
+        return
+    handle, temp_name = tempfile.mkstemp(
+        dir=path.parent, prefix=f".{path.name}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(handle, "wb") as file:
+            file.write(patched)
+        shutil.copymode(path, temp_name)
+        os.replace(temp_name, path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(temp_name)
+        raise
+
+
+def _patch_venv(venv_path: Path, template: Path) -> None:
+    """Points the configuration and scripts of a cloned environment at itself.
+
+    'pyvenv.cfg', the activation scripts and the console script launchers name
+    the template's directory. They are rewritten for venv_path. The activation
+    scripts also carry the template's prompt, parenthesised before Python 3.13
+    and quoted from then on, and 'pyvenv.cfg' may set it too.
+    """
+    paths = [
+        (os.fsencode(template), os.fsencode(venv_path)),
+        (os.fsencode(template.as_posix()), os.fsencode(venv_path.as_posix())),
+    ]
+    old, new = template.name, venv_path.name
+    prompts = [
+        (f"({old}) ".encode(), f"({new}) ".encode()),
+        (f'"{old}"'.encode(), f'"{new}"'.encode()),
+        (f'={old}"'.encode(), f'={new}"'.encode()),
+        (f"prompt = {old}".encode(), f"prompt = {new}".encode()),
+    ]
+    scripts = venv_path / "Scripts"
+    if not scripts.is_dir():
+        scripts = venv_path / "bin"
+    files = [venv_path / "pyvenv.cfg"]
+    if scripts.is_dir():
+        files += [
+            file
+            for file in scripts.iterdir()
+            if file.is_file() and not file.is_symlink()
+        ]
+    for file in files:
+        prompted = file.name == "pyvenv.cfg" or file.name.lower().startswith("activate")
+        _patch_file(file, paths + prompts if prompted else paths)
+
+
+@contextlib.contextmanager
+def _lock_file(lock: Path) -> Iterator[bool]:
+    """Holds a lock file, shared by all processes, while the block runs.
+
+    A lock older than '_LOCK_STALE_SECONDS' was left by a crashed process and
+    is taken over.
+
+    Yields:
+        False if another process holds the lock, so the block should do nothing.
+    """
+    for _ in range(2):
+        try:
+            os.close(os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            break
+        except FileExistsError:
+            with contextlib.suppress(OSError):
+                if time.time() - lock.stat().st_mtime > _LOCK_STALE_SECONDS:
+                    lock.unlink()
+                    continue
+            yield False
+            return
+    else:
+        yield False
+        return
+    try:
+        yield True
+    finally:
+        with contextlib.suppress(FileNotFoundError):
+            lock.unlink()
+
+
+def _ensure_template(name: str, python_path: Path) -> Path | None:
+    """Returns the golden virtual environment of a version, building it if needed.
+
+    The template is rebuilt when the version points at another interpreter, or
+    its interpreter was upgraded in place. Its marker is written last, so an
+    interrupted build is not mistaken for a template. A lock file next to it
+    keeps other processes, such as a background 'pool warm', from building it
+    at the same time. Its site-packages are compiled once here, so clones of
+    it do not have to.
+
+    Args:
+        name:           The Pynball friendly version name.
+        python_path:    The version's interpreter.
+
+    Returns:
+        The template, or None if it could not be built.
+    """
+    template = _template_path(name)
+    marker = template / _TEMPLATE_MARKER
+    stamp = _interpreter_stamp(python_path)
+    with _TEMPLATE_LOCKS_GUARD:
+        lock = _TEMPLATE_LOCKS.setdefault(name, threading.Lock())
+    with lock:
+        with contextlib.suppress(OSError):
+            if marker.read_text(encoding="utf-8") == stamp:
+                return template
+        try:
+            template.parent.mkdir(parents=True, exist_ok=True)
+        except OSError:
+            return None
+        with _lock_file(template.with_name(f".{name}.lock")) as locked:
+            if not locked:
+                return None
+            with contextlib.suppress(OSError):
+                if marker.read_text(encoding="utf-8") == stamp:
+                    return template
+            shutil.rmtree(template, ignore_errors=True)
+            try:
+                template.mkdir()
+                _create_venv(python_path, template)
+                if not (template / "pyvenv.cfg").is_file():
+                    return None
+                with contextlib.suppress(OSError):
+                    _compile_venv(template)
+                marker.write_text(stamp, encoding="utf-8")
+            except Exception:
+                return None
+            finally:
+                if not marker.is_file():
+                    shutil.rmtree(template, ignore_errors=True)
+    return template
+
+
+def _make_venv(
+    name: str, python_path: Path, venv_path: Path, use_template: bool = True
+) -> str:
+    """Creates a project's virtual environment, cloning its version's template.
+
+    Args:
+        name:           The Pynball friendly version name.
+        python_path:    The version's interpreter.
+        venv_path:      Directory of the new virtual environment.
+        use_template:   Clone the golden template instead of building the
+                        environment from scratch.
+
+    Returns:
+        How the environment was made: one of '_CLONE_METHODS' if it was cloned,
+        otherwise one of '_VENV_BACKENDS'.
+    """
+    template = _ensure_template(name, python_path) if use_template else None
+    if template is None:
+        return _create_venv(python_path, venv_path)
+    method = _clone_tree(template, venv_path)
+    _patch_venv(venv_path, template)
+    return method
+
+
+#: Spare virtual environments each pool keeps ready when no size is given
+_POOL_DEFAULT_SIZE = 2
+#: Days a spare is kept before it is evicted, when no age limit is given
+_POOL_DEFAULT_MAX_AGE = 7.0
+#: File in a pool directory holding its size and age limit
+_POOL_SETTINGS = "pool.json"
+#: File in a pool directory held while 'pool warm' runs
+_POOL_LOCK = ".lock"
+#: Seconds after which an unfinished spare is considered abandoned
+_POOL_STALE_SECONDS = _LOCK_STALE_SECONDS
+#: Keyword arguments that start a process that outlives pynball
+_DETACHED: dict[str, Any] = (
+    {
+        "creationflags": getattr(subprocess, "DETACHED_PROCESS", 0)
+        | getattr(subprocess, "CREATE_NEW_PROCESS_GROUP", 0)
+    }
+    if os.name == "nt"
+    else {"start_new_session": True}
+)
+
+
+def _pool_path(name: str) -> Path:
+    """Returns the directory of spare virtual environments kept for a version."""
+    return _WORKON_HOME / _STATE_DIR_NAME / "pool" / name
+
+
+def _read_pool_settings(name: str) -> dict | None:
+    """Returns the size and age limit of a version's pool, or None if it has none."""
+    try:
+        settings = json.loads((_pool_path(name) / _POOL_SETTINGS).read_text())
+    except (OSError, ValueError):
+        return None
+    return settings if isinstance(settings, dict) else None
+
+
+def _pool_spares(name: str) -> list[tuple[Path, str, float]]:
+    """Returns the finished spares of a version's pool, oldest first.
+
+    Returns:
+        (spare, stamp, created) triples. Stamp is the '_interpreter_stamp' of
+        the interpreter the spare was built from and created is the time its
+        build finished.
+    """
+    spares = []
+    with contextlib.suppress(FileNotFoundError), os.scandir(_pool_path(name)) as it:
+        for entry in it:
+            marker = Path(entry.path) / _TEMPLATE_MARKER
+            if not entry.name.startswith("spare-"):
+                continue
+            with contextlib.suppress(OSError):
+                spares.append(
+                    (Path(entry.path), marker.read_text(), marker.stat().st_mtime)
+                )
+    return sorted(spares, key=operator.itemgetter(2))
+
+
+def _discard(path: Path) -> None:
+    """Deletes a directory, renaming it first so nobody can claim it meanwhile."""
+    doomed = path.with_name(f".evicted-{path.name}")
+    with contextlib.suppress(FileNotFoundError):
+        os.rename(path, doomed)
+        shutil.rmtree(doomed, onerror=del_rw)
+
+
+def _evict_spares(
+    name: str, python_path: Path, size: int, max_age: float, now: float
+) -> int:
+    """Deletes the spares that are stale or beyond the pool size.
+
+    A spare is stale if it was built from another interpreter, or from this
+    one before it was upgraded in place, or is more than max_age days old.
+    Unfinished spares abandoned by a crashed build go too.
+
+    Returns:
+        The number of spares deleted.
+    """
+    evicted = 0
+    fresh = []
+    stamp = _interpreter_stamp(python_path)
+    for spare, spare_stamp, created in _pool_spares(name):
+        if spare_stamp != stamp or now - created > max_age * 86400:
+            _discard(spare)
+            evicted += 1
+        else:
+            fresh.append(spare)
+    for spare in fresh[: max(0, len(fresh) - size)]:
+        _discard(spare)
+        evicted += 1
+    with os.scandir(_pool_path(name)) as it:
+        for entry in it:
+            abandoned = (
+                entry.name.startswith(".evicted-")
+                or not (Path(entry.path) / _TEMPLATE_MARKER).exists()
+            )
+            if not entry.is_dir() or not abandoned:
+                continue
+            with contextlib.suppress(OSError):
+                if now - entry.stat().st_mtime > _POOL_STALE_SECONDS:
+                    shutil.rmtree(entry.path, onerror=del_rw)
+    return evicted
+
+
+def _build_spare(name: str, python_path: Path) -> str:
+    """Adds one spare virtual environment to a version's pool.
+
+    The marker naming the interpreter is written last, so a spare is never
+    claimed before it is complete. A spare that was not cloned from the
+    template has its site-packages compiled here, off the claiming path.
+
+    Returns:
+        How the spare was made, as returned by '_make_venv'.
+    """
+    pool = _pool_path(name)
+    spare = Path(tempfile.mkdtemp(dir=pool, prefix="spare-"))
+    try:
+        # mkdtemp creates the directory 0700; give it the mode the umask gave
+        # the pool, like any other virtual environment
+        shutil.copymode(pool, spare)
+        method = _make_venv(name, python_path, spare)
+        if not (spare / "pyvenv.cfg").is_file():
+            raise OSError(f"No virtual environment was created in {spare}")
+        if method not in _CLONE_METHODS:
+            with contextlib.suppress(OSError):
+                _compile_venv(spare)
+        (spare / _TEMPLATE_MARKER).write_text(_interpreter_stamp(python_path))
+    except BaseException:
+        shutil.rmtree(spare, ignore_errors=True)
+        raise
+    return method
+
+
+def _pool_lock(name: str) -> contextlib.AbstractContextManager[bool]:
+    """Holds a version's pool lock while the block runs, see '_lock_file'."""
+    return _lock_file(_pool_path(name) / _POOL_LOCK)
+
+
+def _warm_pool(
+    name: str, python_path: Path, size: int, max_age: float
+) -> tuple[list[JobResult], int] | None:
+    """Evicts stale spares and builds new ones until a version's pool is full.
+
+    Args:
+        name:           The Pynball friendly version name.
+        python_path:    The version's interpreter.
+        size:           The number of spares to keep.
+        max_age:        Days a spare is kept.
+
+    Returns:
+        The results of the spare builds and the number of spares evicted, or
+        None if another process is already warming the pool.
+    """
+    pool = _pool_path(name)
+    pool.mkdir(parents=True, exist_ok=True)
+    with _pool_lock(name) as locked:
+        if not locked:
+            return None
+        settings = {"python": str(python_path), "size": size, "max_age": max_age}
+        _write_atomic(pool / _POOL_SETTINGS, json.dumps(settings, indent=2))
+        evicted = _evict_spares(name, python_path, size, max_age, time.time())
+        missing = size - len(_pool_spares(name))
+        with _JobRunner() as runner:
+            results = runner.run(
+                [(name, _build_spare, (name, python_path)) for _ in range(missing)]
+            )
+    return results, evicted
+
+
+def _refill_pool_later(name: str) -> None:
+    """Starts 'pool warm' for a version in a process that outlives pynball."""
+    with contextlib.suppress(OSError):
+        subprocess.Popen(
+            [sys.executable, "-c", "from pynball.pynball import cli; cli()"]
+            + ["pool", "warm", name],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            env={**os.environ, "WORKON_HOME": str(_WORKON_HOME)},
+            **_DETACHED,
+        )
+
+
+def _claim_spare(name: str, python_path: Path, venv_path: Path) -> bool:
+    """Turns a spare from a version's pool into a project's virtual environment.
+
+    The spare is claimed by renaming it to venv_path, which is atomic, so two
+    projects never get the same spare. Spares older than the pool's age limit
+    are deleted instead. The scripts of the claimed spare are then patched for
+    the new path and a refill of the pool is started in the background.
+
+    Args:
+        name:           The Pynball friendly version name.
+        python_path:    The version's interpreter. Spares of others are ignored.
+        venv_path:      The project's virtual environment. An empty directory.
+
+    Returns:
+        True if a spare was claimed, False if the pool had none.
+    """
+    settings = _read_pool_settings(name)
+    if settings is None:
+        return False
+    max_age = settings.get("max_age", _POOL_DEFAULT_MAX_AGE) * 86400
+    stamp = _interpreter_stamp(python_path)
+    claimed = None
+    venv_path.rmdir()
+    try:
+        for spare, spare_stamp, created in _pool_spares(name):
+            if spare_stamp != stamp:
+                continue
+            if time.time() - created > max_age:
+                _discard(spare)
+                continue
+            with contextlib.suppress(FileNotFoundError):
+                os.rename(spare, venv_path)
+                claimed = spare
+                break
+    finally:
+        if claimed is None:
+            venv_path.mkdir(exist_ok=True)
+    _refill_pool_later(name)
+    if claimed is None:
+        return False
+    (venv_path / _TEMPLATE_MARKER).unlink()
+    _patch_venv(venv_path, claimed)
+    return True
+
+
+#: File in a virtual environment recording the requirements installed into it
+_SYNC_STAMP = ".pynball-sync.json"
+#: Keys of 'pyvenv.cfg' that identify the interpreter of a virtual environment
+_INTERPRETER_KEYS = ("home", "version", "version_info")
+
+
+def _venv_python(venv_path: Path) -> Path:
+    """Returns the interpreter of a virtual environment."""
+    windows_python = venv_path / "Scripts" / "python.exe"
+    return windows_python if windows_python.exists() else venv_path / "bin" / "python"
+
+
+def _requirements_hash(requirements: Path, venv_path: Path) -> str:
+    """Returns a digest of a requirements file and a virtual environment's interpreter.
+
+    The interpreter is identified by the 'home' and version lines of
+    'pyvenv.cfg', so recreating the environment from another interpreter
+    changes the digest.
+
+    Raises:
+        OSError:    If the requirements file cannot be read.
+    """
+    digest = hashlib.sha256(requirements.read_bytes())
+    with contextlib.suppress(OSError):
+        for line in (venv_path / "pyvenv.cfg").read_text().splitlines():
+            if line.partition("=")[0].strip() in _INTERPRETER_KEYS:
+                digest.update(line.strip().encode())
+    return digest.hexdigest()
+
+
+def _read_sync_stamp(venv_path: Path) -> dict:
+    """Returns what '_sync_requirements' last recorded, or {} if nothing was."""
+    try:
+        stamp = json.loads((venv_path / _SYNC_STAMP).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return stamp if isinstance(stamp, dict) else {}
+
+
+def _sync_requirements(
+    venv_path: Path,
+    requirements: Path,
+    wheelhouse: Path | None = None,
+    force: bool = False,
+) -> bool:
+    """Installs requirements into a virtual environment unless they already are.
+
+    The digest of the requirements and interpreter is recorded in the
+    environment after every install, and the install is skipped while it still
+    matches. With a wheelhouse, pip installs only from that directory and never
+    touches the network.
+
+    Args:
+        venv_path:      The virtual environment.
+        requirements:   A pip requirements file.
+        wheelhouse:     A directory of wheels to install from.
+        force:          Install even if the digest matches.
+
+    Returns:
+        True if pip ran, False if the install was skipped.
+
+    Raises:
+        OSError:    If the requirements file cannot be read or pip cannot start.
+        Exception:  If pip fails.
+    """
+    requirements = requirements.resolve()
+    digest = _requirements_hash(requirements, venv_path)
+    if not force and _read_sync_stamp(venv_path).get("hash") == digest:
+        return False
+    args = ["-m", "pip", "install", "--disable-pip-version-check"]
+    if wheelhouse is not None:
+        wheelhouse = wheelhouse.resolve()
+        args += ["--no-index", "--find-links", str(wheelhouse)]
+    args += ["-r", str(requirements)]
+    python_path = _venv_python(venv_path)
+    if _execute(python_path, *args, stream=True, timeout=_PIP_TIMEOUT) is None:
+        raise OSError(f"Cannot run {python_path}")
+    stamp = {
+        "hash": digest,
+        "requirements": str(requirements),
+        "wheelhouse": None if wheelhouse is None else str(wheelhouse),
+    }
+    _write_atomic(venv_path / _SYNC_STAMP, json.dumps(stamp, indent=2))
+    return True
+
+
+def _compile_targets(
+    venv_path: Path, project_path: Path | None = None, site_packages: bool = True
+) -> list[Path]:
+    """Returns the site-packages of a virtual environment and the project tree."""
+    if not site_packages:
+        targets: list[Path] = []
+    elif (venv_path / "Scripts").is_dir():
+        targets = [venv_path / "Lib" / "site-packages"]
+    else:
+        targets = sorted(venv_path.glob("lib/python*/site-packages"))
+    if project_path is not None:
+        targets.append(project_path)
+    return [target for target in targets if target.is_dir()]
+
+
+def _compile_venv(
+    venv_path: Path,
+    project_path: Path | None = None,
+    site_packages: bool = True,
+    jobs: int | None = None,
+) -> list[tuple[Path, CommandResult]] | None:
+    """Precompiles the bytecode of a virtual environment and its project tree.
+
+    Each target is compiled by the environment's own interpreter with
+    'compileall', split across as many worker processes as the job runner
+    uses, so the bytecode matches the interpreter that imports it.
+
+    Args:
+        venv_path:      The virtual environment.
+        project_path:   The project tree, if any.
+        site_packages:  Compile the site-packages too. Environments cloned from
+                        a template or claimed from a pool already have them
+                        compiled.
+        jobs:           Worker processes per target, if not the job runner's.
+
+    Returns:
+        A (target, result) pair per compiled directory, or None if the
+        environment has no interpreter.
+
+    Raises:
+        OSError:    If the interpreter cannot be started.
+    """
+    python_path = _venv_python(venv_path)
+    if not python_path.exists():
+        return None
+    jobs = jobs or _JOB_SETTINGS["workers"]
+    command = [python_path, "-m", "compileall", "-q", "-j", jobs]
+    return [
+        (target, _run(*command, target, timeout=_VENV_TIMEOUT))
+        for target in _compile_targets(venv_path, project_path, site_packages)
+    ]
+
 
+def _report_compile_errors(compiled: list[tuple[Path, CommandResult]]) -> None:
+    """Warns about the targets in which some modules could not be compiled."""
+    for target, result in compiled:
+        if not result.ok:
+            errors = (result.stdout or result.stderr).strip().splitlines()
+            message = f"Some modules in '{target}' could not be compiled"
+            _feedback(f"{message} - {errors[0]}" if errors else message, "warning")
+
+
+#: Keys of a '[[project]]' entry in a 'mkproject --from' manifest and their types
+_MANIFEST_KEYS = {
+    "version": str,
+    "project": str,
+    "all": bool,
+    "template": bool,
+    "requirements": str,
+    "wheelhouse": str,
+    "compile": bool,
+}
+#: Keys every '[[project]]' entry of a manifest must have
+_MANIFEST_REQUIRED = ("version", "project")
+
+
+def _make_project(
+    ver: str,
+    version_path: Path,
+    project_name: str,
+    create_all: str = "y",
+    template: bool = True,
+    requirements: Path | None = None,
+    wheelhouse: Path | None = None,
+    compile_bytecode: bool = True,
+    compile_jobs: int | None = None,
+) -> str:
+    """Creates a project's virtual environment and its project directory.
 
-@cli.command()
-@click.pass_context
-def addall(ctx: Any) -> None:
-    """Add all versions to the Pynball configuration."""
-    try:
-        _PYNBALL_HOME = Path(os.environ["PYNBALL_HOME"])
-    except KeyError:
-        _PYNBALL_HOME = Path("")
+    Args:
+        ver:            The Pynball friendly version name.
+        version_path:   The version's installation directory.
+        project_name:   The project name only. Not the path.
+        create_all:     'n' skips the project directory.
+        template:       Claim a spare from the version's pool or clone its golden
+                        template, instead of building from scratch.
+        requirements:   A pip requirements file to install.
+        wheelhouse:     A directory of wheels to install the requirements from.
+        compile_bytecode:   Precompile the project tree, and the site-packages
+                            unless they came compiled from a pool or template.
+        compile_jobs:   Worker processes compiling each target, if not the
+                        job runner's.
 
-    active_dirs = 0
-    pattern = r"\d{1,2}.\d{1,2}.\d{1,2}"
-    if _PYNBALL_HOME == Path(""):
-        message = "Please specify the root directory of your Python installations: "
-        _feedback(message, "nominal")
+    Returns:
+        How the virtual environment was made: 'pool' if a spare was claimed,
+        otherwise as returned by '_make_venv'. The time spent compiling is
+        appended, such as 'hardlink, compiled in 0.42s'.
+
+    Raises:
+        FileExistsError:    If a directory of the project already exists.
+        FileNotFoundError:  If WORKON_HOME or PROJECT_HOME does not exist.
+        Exception:          If the virtual environment could not be created.
+                            Nothing is left behind. A failed install of the
+                            requirements is only reported, as the project is
+                            still usable.
+    """
+    venv_path = _WORKON_HOME / project_name
+    venv_path.mkdir(parents=False, exist_ok=False)
+    python_path = version_path / "python.exe"
+    try:
+        if template and _claim_spare(ver, python_path, venv_path):
+            method = "pool"
+        else:
+            method = _make_venv(ver, python_path, venv_path, template)
+        (venv_path / ".project").write_text(f"{_PROJECT_HOME / project_name}")
+    except BaseException:
+        # Leave nothing behind, so the project can simply be created again
+        shutil.rmtree(venv_path, ignore_errors=True)
+        raise
+    if requirements is not None:
         try:
-            while True:
-                path = Path(input(""))
-                if path.exists():
-                    _PYNBALL_HOME = path
-                    break
-        except KeyboardInterrupt:
-            return
-    dirs = [e for e in _PYNBALL_HOME.iterdir() if e.is_dir()]
-    for directory in dirs:
-        exe = directory / "python.exe"
-        if exe.exists():
-            active_dirs += 1
-            pyver_raw = _execute(exe, "--version")
-            pyver = re.search(pattern, pyver_raw).group(0)  # type: ignore
-            ctx.invoke(add, name=pyver, version_path=str(directory))
-    if active_dirs > 0:
-        _setenv("user", "PYNBALL_HOME", str(_PYNBALL_HOME))
+            _sync_requirements(venv_path, requirements, wheelhouse)
+        except Exception as e:
+            message = (
+                f"Requirements of '{project_name}' have NOT been installed - "
+                f"{str(e).strip() or type(e).__name__}\n"
+                " Use 'sync --requirements' to install them"
+            )
+            _feedback(message, "warning")
+    if create_all != "n":
+        (_PROJECT_HOME / project_name).mkdir(parents=False, exist_ok=False)
+    if compile_bytecode:
+        compiled = _compile_venv(
+            venv_path,
+            _PROJECT_HOME / project_name,
+            site_packages=method not in ("pool", *_CLONE_METHODS),
+            jobs=compile_jobs,
+        )
+        if compiled:
+            _report_compile_errors(compiled)
+            seconds = sum(result.duration for _, result in compiled)
+            method += f", compiled in {seconds:.2f}s"
+    return method
 
 
-@cli.command()
-@click.argument("name")
-def delete(name: str) -> None:
-    """Deletes a name / path of an installation of Python.
+def _describe_failure(job: JobResult) -> str:
+    """Returns a one line reason for a failed '_make_project' job."""
+    if job.error is None:
+        return "cancelled"
+    if isinstance(job.error, FileExistsError):
+        return f"{job.error.filename} already exists"
+    if isinstance(job.error, FileNotFoundError) and job.error.filename:
+        return f"{Path(job.error.filename).parent} does not exist"
+    return str(job.error).strip() or type(job.error).__name__
 
-    \b
-    Note:
-        This only deletes the name / path in the Pynball configuration.
-        It does not delete the Python installation.
 
-    \b
-    Args:
-        name:   Friendly name of a python installation configured in Pynball.
-                e.g. 3.6
+def _read_manifest(manifest: Path) -> tuple[list[dict], list[str]]:
+    """Reads the '[[project]]' entries of a 'mkproject --from' manifest.
+
+    Every entry needs a 'version' and a 'project'. The optional 'all',
+    'template' and 'compile' flags default to true, like the command line.
+    The optional 'requirements' file and 'wheelhouse' directory are relative
+    to the manifest.
+
+    Returns:
+        An (entries, problems) pair. Problems describe the invalid entries.
     """
-    pynball_versions = _get_pynball("dict", "PYNBALL")
-    _, sys_ver = _get_system_path()
-    if name in sys_ver:
-        message = "Cannot delete System Interpreter"
-        _feedback(message, "warning")
-        versions()
-        return
-    else:
-        pynball_versions.pop(str(name), None)
-        _set_pynball(pynball_versions, "PYNBALL")
+    try:
+        with open(manifest, "rb") as file:
+            document = tomllib.load(file)
+    except (OSError, tomllib.TOMLDecodeError) as e:
+        return [], [f"Cannot read '{manifest}' - {e}"]
+    entries = document.get("project", [])
+    if not isinstance(entries, list) or not entries:
+        return [], [f"'{manifest}' has no [[project]] entries"]
+    problems, seen = [], set()
+    for number, entry in enumerate(entries, start=1):
+        if not isinstance(entry, dict):
+            problems.append(f"Project {number}: must be a table")
+            continue
+        for key in sorted(set(entry) - set(_MANIFEST_KEYS)):
+            problems.append(f"Project {number}: unknown key '{key}'")
+        for key, kind in _MANIFEST_KEYS.items():
+            if key in entry and not isinstance(entry[key], kind):
+                problems.append(f"Project {number}: '{key}' must be a {kind.__name__}")
+            elif key not in entry and key in _MANIFEST_REQUIRED:
+                problems.append(f"Project {number}: '{key}' is missing")
+        name = entry.get("project")
+        if not isinstance(name, str):
+            continue
+        if name in seen:
+            problems.append(f"Project {number}: '{name}' is listed more than once")
+        seen.add(name)
+    return entries, problems
 
 
-@cli.command()
-def reset() -> None:
-    """Deletes all names / paths."""
-    _delenv("user", "PYNBALL")
+def _mkproject_batch(
+    manifest: Path,
+    create_all: str = "y",
+    template: bool = True,
+    compile_bytecode: bool = True,
+) -> None:
+    """Creates every project of a manifest in parallel and prints a summary.
 
+    All versions are checked against a single read of the configuration before
+    anything is created. Exits with status 1 if any project failed.
 
-@cli.command()
-def version() -> None:
-    """Display details about the system Python Interpreter."""
-    info = sys.version_info
-    message = (
-        f"{info.major}.{info.minor}.{info.micro}  ReleaseLevel: {info.releaselevel},"
-        f" Serial: {info.serial}"
+    Args:
+        manifest:       The manifest of projects to create.
+        create_all:     'n' makes 'all' default to false for every entry.
+        template:       The default of 'template' for every entry.
+        compile_bytecode:   The default of 'compile' for every entry.
+    """
+    entries, problems = _read_manifest(manifest)
+    if not problems:
+        registry = _get_registry("PYNBALL") or VersionRegistry()
+        for number, entry in enumerate(entries, start=1):
+            if entry["version"] not in registry:
+                problems.append(
+                    f"Project {number}: {entry['version']} is not configured in "
+                    f"Pynball - Use the 'add' command"
+                )
+    if problems:
+        _feedback("\n".join(problems), "warning")
+        sys.exit(1)
+    # The projects are created concurrently, so share the workers between the
+    # compileall runs instead of giving each of them all of them
+    workers = _JOB_SETTINGS["workers"]
+    compile_jobs = max(1, workers // min(workers, len(entries)))
+    jobs = []
+    for entry in entries:
+        requirements, wheelhouse = (
+            manifest.parent / entry[key] if key in entry else None
+            for key in ("requirements", "wheelhouse")
+        )
+        job_args = (
+            entry["version"],
+            registry.path(entry["version"]),
+            entry["project"],
+            "y" if entry.get("all", create_all != "n") else "n",
+            entry.get("template", template),
+            requirements,
+            wheelhouse,
+            entry.get("compile", compile_bytecode),
+            compile_jobs,
+        )
+        jobs.append((entry["project"], _make_project, job_args))
+    with _JobRunner() as runner:
+        results = runner.run(jobs)
+    head1, head2, head3, head4 = "Project Name", "Version", "Seconds", "Result"
+    print(f"{head1:25}{head2:15}{head3:>10}  {head4}")
+    rule1, rule2, rule3, rule4 = (
+        len(head) * "=" for head in (head1, head2, head3, head4)
     )
-    _feedback(message, "nominal")
+    print(f"{rule1:25}{rule2:15}{rule3:>10}  {rule4}")
+    for entry, job in zip(entries, results):
+        result = f"created ({job.value})" if job.ok else _describe_failure(job)
+        print(f"{job.name:25}{entry['version']:15}{job.duration:>10.2f}  {result}")
+    failed = sum(not job.ok for job in results)
+    if failed:
+        _feedback(f"{failed} of {len(results)} projects were NOT created", "error")
+        sys.exit(1)
+    _feedback(f"{len(results)} projects created", "nominal")
 
 
 @cli.command()
-def versions() -> None:
-    """Lists the names / paths of the configured Python installations."""
-    system_paths, pynball_names = _get_system_path()
-    pynball_versions = _get_pynball("dict", "PYNBALL")
-    if not system_paths:
-        message = "System Interpreter is not configured"
+@click.option("-n", "--noall", "create_all", flag_value="n")
+@click.option("-a", "--all", "create_all", flag_value="y", default=True)
+@click.option("--template/--no-template", default=True)
+@click.option("--compile/--no-compile", "compile_bytecode", default=True)
+@click.option(
+    "--from",
+    "manifest",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+)
+@click.option(
+    "-r",
+    "--requirements",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+)
+@click.option(
+    "-w",
+    "--wheelhouse",
+    type=click.Path(exists=True, file_okay=False, path_type=Path),
+)
+@click.argument("name", required=False)
+@click.argument("project_name", required=False)
+def mkproject(
+    create_all: str,
+    template: bool,
+    compile_bytecode: bool,
+    name: str | None,
+    project_name: str | None,
+    manifest: Path | None,
+    requirements: Path | None,
+    wheelhouse: Path | None,
+) -> None:
+    """Creates a Virtual Environment from a specific Python version.
+    \b
+    Options:
+        -n, --noall:      Only create the virtual environment. Skips project area.
+        --no-template:    Build the virtual environment from scratch instead of
+                          claiming a spare from the version's pool or cloning
+                          its golden template.
+        --no-compile:     Skip precompiling the bytecode of the site-packages and
+                          the project tree.
+        --from FILE:      Create every project listed in a TOML manifest, in
+                          parallel, instead of NAME and PROJECT_NAME. Each
+                          [[project]] entry has a 'version' and a 'project',
+                          plus optional 'all', 'template' and 'compile'
+                          flags and 'requirements' and 'wheelhouse' paths.
+                          --noall, --no-template and --no-compile set the
+                          default of every entry.
+        -r, --requirements FILE:
+                          Install a pip requirements file into the new
+                          virtual environment.
+        -w, --wheelhouse DIR:
+                          Install the requirements offline, only from the
+                          wheels in DIR.
+
+    \b
+    Args:
+        name:           The Pynball friendly version name.
+        project_name:   The project name only. Not the path.
+        \f
+        create_all:     Determines if the project folder gets created.
+        template:       Determines if a pool spare or the golden template is used.
+        compile_bytecode:   Determines if the bytecode gets precompiled.
+        manifest:       The manifest of projects to create.
+    """
+    if (manifest is None) == (name is None or project_name is None):
+        raise click.UsageError("Give either NAME and PROJECT_NAME or --from FILE")
+    if wheelhouse is not None and requirements is None:
+        raise click.UsageError("--wheelhouse needs --requirements")
+    if manifest is not None and requirements is not None:
+        raise click.UsageError("Give requirements in the manifest with --from FILE")
+    if _WORKON_HOME == Path("") or _PROJECT_HOME == Path(""):
+        message = """Virtualenv-wrapper is not configured on your system:
+        Please install Virtualenv and Virtualenv-wrapper and configure
+        'WORKON_HOME' and 'PROJECT_HOME' environment variables"""
         _feedback(message, "warning")
-    if not pynball_names and system_paths:
-        for path in system_paths:
-            message = f"{path} : --> System Interpreter"
-            _feedback(message, "nominal")
-    if pynball_versions is None:
-        message = "Pynball configuration is empty - use 'add' command"
+        return
+    if manifest is not None:
+        _mkproject_batch(manifest, create_all, template, compile_bytecode)
+        return
+    ver = str(name)
+    version_path = _get_version_path(ver, "PYNBALL") or Path("")
+    if version_path == Path(""):
+        message = f"{ver} is not configured in Pynball - Use the 'add' command"
         _feedback(message, "warning")
-    else:
-        for ver in pynball_versions:
-            if ver in pynball_names:
-                message = f"{ver:10}{pynball_versions[ver]} : --> System Interpreter"
-                _feedback(message, "nominal")
-            else:
-                print(f"{ver:10}{pynball_versions[ver]}")
-    if pynball_versions and system_paths and not pynball_names:
-        message = "System Interpreter is not in Pynball Configuration"
+        return
+    job_args = (
+        ver,
+        version_path,
+        project_name,
+        create_all,
+        template,
+        requirements,
+        wheelhouse,
+        compile_bytecode,
+    )
+    with _JobRunner(1) as runner:
+        (job,) = runner.run([(str(project_name), _make_project, job_args)])
+    if isinstance(job.error, FileNotFoundError) and job.error.filename:
+        message = (
+            f"Project: '{project_name}' has NOT be created - "
+            f"{Path(job.error.filename).parent} does not exist"
+        )
+        _feedback(message, "warning")
+    elif isinstance(job.error, FileExistsError):
+        message = f"The directory '{project_name}' already exits"
         _feedback(message, "warning")
+    elif not job.ok:
+        message = (
+            f"Virtual environment '{project_name}' has NOT been "
+            f"created - {job.error or 'cancelled'}"
+        )
+        _feedback(message, "error")
+    else:
+        message = f"'{project_name}' created ({job.value}) in {job.duration:.2f}s"
+        _feedback(message, "nominal")
 
 
 @cli.command()
-@click.argument("name")
-@click.pass_context
-def system(ctx: Any, name: str) -> None:
-    """Changes the system Python Interpreter version.
+@click.option("--noforce", "use_force", flag_value="n", default=True)
+@click.option("-f", "--force", "use_force", flag_value="y")
+@click.option(
+    "-r",
+    "--requirements",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+)
+@click.option(
+    "-w",
+    "--wheelhouse",
+    type=click.Path(exists=True, file_okay=False, path_type=Path),
+)
+@click.argument("project_name")
+def sync(
+    use_force: str,
+    requirements: Path | None,
+    wheelhouse: Path | None,
+    project_name: str,
+) -> None:
+    """Installs a project's requirements unless they are already installed.
+
+    The install is skipped while the requirements file and the interpreter are
+    unchanged since the last install by 'mkproject' or 'sync'.
+
+    \b
+    Options:
+        -f, --force:              Install even if nothing changed.
+        -r, --requirements FILE:  Use FILE instead of the recorded requirements.
+        -w, --wheelhouse DIR:     Install offline, only from the wheels in DIR,
+                                  instead of the recorded wheelhouse.
 
     \b
     Args:
-        name:  The Pynball friendly name of the Python Installation
+        project_name:   The project name only. Not the path.
         \f
-        ctx:   The click context - Implementation detail that enables this
-               command to call another click command.
-               (click says this is quite naughty. But I still did it anyway)
+        use_force:      Install even if nothing changed.
+        requirements:   The requirements file.
+        wheelhouse:     The wheel directory.
     """
-    name = str(name)
-    all_paths: str = _getenv("system", "PATH")
-    system_paths, pynball_names = _get_system_path()
-    pynball_versions = _get_pynball("dict_path_object", "PYNBALL")
-    if name not in _get_pynball("names", "PYNBALL"):
-        message = f"{name} is not in Pynballs' configuration"
+    if _check_virtual_env() == 1:
+        return
+    venv_path = _WORKON_HOME / project_name
+    if not (venv_path / "pyvenv.cfg").is_file():
+        message = f"Project: '{project_name}' does not exist"
         _feedback(message, "warning")
-        ctx.invoke(versions)
         return
-    if len(system_paths) > 1 or len(pynball_names) > 1:
+    stamp = _read_sync_stamp(venv_path)
+    if requirements is None and stamp.get("requirements"):
+        requirements = Path(stamp["requirements"])
+        if wheelhouse is None and stamp.get("wheelhouse"):
+            wheelhouse = Path(stamp["wheelhouse"])
+    if requirements is None:
         message = (
-            "Multiple system interpreters have been detected - "
-            "There can be only one! (see: Highlander)"
+            f"No requirements are recorded for '{project_name}' - Use --requirements"
         )
-        _feedback(message, "error")
-        return
-    if name in pynball_names:
-        message = f"{name} is already configured as the system interpreter"
         _feedback(message, "warning")
-        ctx.invoke(versions)
         return
-    pypath_new = pynball_versions[name]
-    pypath_scripts_new = pypath_new / "Scripts"
-    if len(system_paths) == 1:
-        pypath_old = Path(system_paths[0])
-        pypath_scripts_old = pypath_old / "Scripts"
-        all_paths = all_paths.replace(str(pypath_scripts_old), str(pypath_scripts_new))
-        all_paths = all_paths.replace(str(pypath_old), str(pypath_new))
+    try:
+        installed = _sync_requirements(
+            venv_path, requirements, wheelhouse, use_force == "y"
+        )
+    except Exception as e:
+        message = f"Requirements of '{project_name}' have NOT been installed - {e}"
+        _feedback(message, "error")
+        sys.exit(1)
+    if installed:
+        _feedback(f"Requirements of '{project_name}' installed", "nominal")
     else:
-        all_paths = "".join([str(pypath_scripts_new), ";", all_paths])
-        all_paths = "".join([str(pypath_new), ";", all_paths])
-    _setenv("system", "PATH", all_paths)
-    message = "New version set"
-    _feedback(message, "nominal")
-    message = "Remember to restart the shell to use the new version"
-    _feedback(message, "warning")
+        _feedback(f"'{project_name}' is already in sync", "nominal")
 
 
-@cli.command()
-@click.option("--nouse", "use_pyenv", flag_value="n", default=True)
-@click.option("-u", "--use", "use_pyenv", flag_value="y")
-@click.option("--noforce", "use_force", flag_value="n", default=True)
-@click.option("-f", "--force", "use_force", flag_value="y")
-@click.pass_context
-def pyenv(ctx: Any, use_pyenv: str, use_force: str) -> None:
-    """Automatically include the pyenv versions in Pynball.
+@cli.command(name="compile")
+@click.argument("project_name")
+def compile_project(project_name: str) -> None:
+    """Precompiles the bytecode of a project's virtual environment and tree.
+
+    The site-packages of the virtual environment and the project directory are
+    compiled by the project's interpreter, in parallel, so the first imports
+    do not have to. The time spent on each is listed.
 
     \b
     Args:
-        -u --use:       Include pyenv versions
-        -f --force:     Pyenv versions override manual versions if the name is the same
-        \f
-        use_force:      Pyenv versions override manual versions
-        use_pyenv:      Include pyenv versions
-        ctx:            The click context - Implementation detail that enables this
-                        command to call another click command.
-                        (click says this is quite naughty. But I still did it anyway)
+        project_name:   The project name only. Not the path.
     """
-    if _check_pyenv() == 1:
+    if _check_virtual_env() == 1:
         return
-    vers = _PYENV_HOME / "versions"
-    dirs = {e.name: e for e in vers.iterdir() if e.is_dir()}
-    _, sys_ver = _get_system_path()
-    if use_pyenv.lower() == "y":
-        pynball_names = _get_pynball("names", "PYNBALL")
-        for ver in dirs:
-            if ver in sys_ver:
-                continue  # do not overwrite system version
-            elif ver in pynball_names and use_force == "n":
-                continue  # manual precedence over pyenv
-            elif ver in pynball_names and use_force == "y":
-                ctx.invoke(add, name=str(ver), version_path=str(dirs[ver]))
-            elif ver not in pynball_names:
-                ctx.invoke(add, name=str(ver), version_path=str(dirs[ver]))
-            else:
-                continue
-    else:
-        pynball_paths = _get_pynball("dict_path_object", "PYNBALL")
-        for ver in dirs:
-            if ver in sys_ver:
-                continue  # do not delete system version
-            if dirs[ver] in pynball_paths.values():
-                ctx.invoke(delete, name=str(ver))
+    venv_path = _WORKON_HOME / project_name
+    if not (venv_path / "pyvenv.cfg").is_file():
+        message = f"Project: '{project_name}' does not exist"
+        _feedback(message, "warning")
+        return
+    try:
+        compiled = _compile_venv(venv_path, _PROJECT_HOME / project_name)
+    except OSError as e:
+        message = f"'{project_name}' has NOT been compiled - {e}"
+        _feedback(message, "error")
+        sys.exit(1)
+    if compiled is None:
+        message = f"'{project_name}' has no Python interpreter"
+        _feedback(message, "warning")
+        return
+    for target, result in compiled:
+        print(f"{result.duration:>8.2f}s  {target}")
+    _report_compile_errors(compiled)
+    seconds = sum(result.duration for _, result in compiled)
+    _feedback(f"'{project_name}' compiled in {seconds:.2f}s", "nominal")
 
-    ctx.invoke(versions)
 
+@cli.group()
+def pool() -> None:
+    """Keeps spare virtual environments ready for 'mkproject'."""
 
-@cli.command()
-@click.option("-n", "--noall", "create_all", flag_value="n")
-@click.option("-a", "--all", "create_all", flag_value="y", default=True)
+
+@pool.command()
+@click.option("-s", "--size", type=click.IntRange(min=0))
+@click.option("-a", "--max-age", type=click.FloatRange(min=0))
 @click.argument("name")
-@click.argument("project_name")
-def mkproject(create_all: str, name: str, project_name: str) -> None:
-    """Creates a Virtual Environment from a specific Python version.
+def warm(size: int | None, max_age: float | None, name: str) -> None:
+    """Fills the pool of a Python version with spare virtual environments.
+
+    'mkproject' claims a spare instead of creating a virtual environment and
+    then refills the pool in the background. Spares built from another
+    interpreter, older than the age limit or beyond the size are evicted.
+
     \b
     Options:
-        -n, --noall:      Only create the virtual environment. Skips project area.
+        -s, --size N:       Spares to keep. Defaults to the last size used.
+        -a, --max-age DAYS: Days to keep a spare. Defaults to the last limit used.
 
     \b
     Args:
-        name:           The Pynball friendly version name.
-        project_name:   The project name only. Not the path.
+        name:   The Pynball friendly version name.
         \f
-        create_all:     Determines if the project folder gets created.
+        size:       The number of spares to keep.
+        max_age:    Days a spare is kept.
     """
-    if _WORKON_HOME == Path("") or _PROJECT_HOME == Path(""):
-        message = """Virtualenv-wrapper is not configured on your system:
-        Please install Virtualenv and Virtualenv-wrapper and configure
-        'WORKON_HOME' and 'PROJECT_HOME' environment variables"""
-        _feedback(message, "warning")
+    if _check_virtual_env() == 1:
         return
-    ver = str(name)
-    version_path = Path("")
-    pynball_versions = _get_pynball("dict_path_object", "PYNBALL")
-    for label in pynball_versions:
-        if label == ver:
-            version_path = pynball_versions[label]
-            break
-    if version_path == Path(""):
-        message = f"{ver} is not configured in Pynball - Use the 'add' command"
+    version_path = _get_version_path(name, "PYNBALL")
+    if version_path is None:
+        message = f"{name} is not configured in Pynball - Use the 'add' command"
         _feedback(message, "warning")
         return
-    for directory in [_WORKON_HOME, _PROJECT_HOME]:
-        if directory == _PROJECT_HOME and create_all == "n":
-            continue
-        else:
-            new_path = directory / project_name
-            try:
-                new_path.mkdir(parents=False, exist_ok=False)
-                if directory == _WORKON_HOME:
-                    python_path = version_path / "python.exe"
-                    _execute(
-                        "virtualenv",
-                        f"-p={str(python_path)}",
-                        str(new_path),
-                    )
-                    (new_path / ".project").touch()
-                    (new_path / ".project").write_text(
-                        f"{_PROJECT_HOME / project_name}"
-                    )
-            except FileNotFoundError:
-                message = (
-                    f"Project: '{project_name}' has NOT be created - "
-                    f"{directory} does not exist"
-                )
-                _feedback(message, "warning")
-                return
-            except FileExistsError:
-                message = f"The directory '{project_name}' already exits"
-                _feedback(message, "warning")
-                return
+    settings = _read_pool_settings(name) or {}
+    if size is None:
+        size = settings.get("size", _POOL_DEFAULT_SIZE)
+    if max_age is None:
+        max_age = settings.get("max_age", _POOL_DEFAULT_MAX_AGE)
+    warmed = _warm_pool(name, version_path / "python.exe", size, max_age)
+    if warmed is None:
+        _feedback(f"The pool of {name} is already being warmed", "nominal")
+        return
+    results, evicted = warmed
+    for job in results:
+        if not job.ok:
+            message = (
+                f"A spare of {name} has NOT been created - {_describe_failure(job)}"
+            )
+            _feedback(message, "warning")
+    created = sum(job.ok for job in results)
+    message = (
+        f"The pool of {name} holds {len(_pool_spares(name))} of {size} spares "
+        f"({created} created, {evicted} evicted)"
+    )
+    _feedback(message, "nominal")
+
+
+@pool.command(name="list")
+def list_pools() -> None:
+    """Lists the pools and their ready spare virtual environments."""
+    if _check_virtual_env() == 1:
+        return
+    root = _WORKON_HOME / _STATE_DIR_NAME / "pool"
+    head1, head2, head3, head4 = "Version", "Spares", "Max Age", "Oldest"
+    print(f"{head1:15}{head2:>10}{head3:>12}{head4:>12}")
+    rule1, rule2, rule3, rule4 = (
+        len(head) * "=" for head in (head1, head2, head3, head4)
+    )
+    print(f"{rule1:15}{rule2:>10}{rule3:>12}{rule4:>12}")
+    names = (
+        sorted(e.name for e in root.iterdir() if e.is_dir()) if root.is_dir() else []
+    )
+    now = time.time()
+    for name in names:
+        settings = _read_pool_settings(name) or {}
+        spares = _pool_spares(name)
+        ready = f"{len(spares)}/{settings.get('size', '-')}"
+        max_age = f"{settings.get('max_age', '-')}d"
+        oldest = f"{(now - spares[0][2]) / 86400:.1f}d" if spares else "-"
+        print(f"{name:15}{ready:>10}{max_age:>12}{oldest:>12}")
+
+
+@pool.command()
+@click.argument("name", required=False)
+def clear(name: str | None) -> None:
+    """Deletes the spare virtual environments of one or every Python version.
+
+    \b
+    Args:
+        name:   The Pynball friendly version name. Every pool if not given.
+    """
+    if _check_virtual_env() == 1:
+        return
+    root = _WORKON_HOME / _STATE_DIR_NAME / "pool"
+    target = root if name is None else _pool_path(name)
+    if not target.is_dir():
+        _feedback(f"There is no pool for {name or 'any version'}", "warning")
+        return
+    shutil.rmtree(target, onerror=del_rw)
+    _feedback(f"The pool of {name or 'every version'} has been deleted", "nominal")
 
 
 @cli.command()
@@ -701,7 +3847,11 @@ def lsproject() -> None:
     """Displays all Virtual Environment projects."""
     if _check_virtual_env() == 1:
         return
-    dirs = [e.name for e in _WORKON_HOME.iterdir() if e.is_dir()]
+    dirs = [
+        e.name
+        for e in _WORKON_HOME.iterdir()
+        if e.is_dir() and e.name != _STATE_DIR_NAME
+    ]
     pattern1 = r"(?<=version_info = )\d{1,2}.\d{1,2}.\d{1,2}"
     pattern2 = r"(?<=version = )\d{1,2}.\d{1,2}.\d{1,2}"
     head1 = "Project Name"
@@ -733,6 +3883,31 @@ def lsproject() -> None:
         print(f"{virt:25}{virtver:25}{pyver}")
 
 
+def _replace_text(file: Path, old: str, new: str) -> None:
+    """Replaces every occurrence of 'old' with 'new' inside a text file."""
+    # TODO: find a solution to possible encoding issues here
+    text = file.read_text(encoding="utf-8", errors="ignore")
+    file.write_text(text.replace(old, new))
+
+
+def _replace_in_files(files: list[Path], old: str, new: str) -> None:
+    """Replaces text inside several files concurrently.
+
+    Args:
+        files:  The text files to update.
+        old:    The text to replace.
+        new:    The replacement text.
+    """
+    with _JobRunner() as runner:
+        jobs = runner.run(
+            (str(file), _replace_text, (file, old, new)) for file in files
+        )
+    for job in jobs:
+        if not job.ok:
+            message = f"Cannot update '{job.name}' - {job.error or 'cancelled'}"
+            _feedback(message, "warning")
+
+
 @cli.command()
 @click.pass_context
 @click.argument("old_name")
@@ -789,12 +3964,8 @@ def glob_to_re(glob_list: list) -> str:
         elif old_name in str(file) and file.stem not in ignore_dirs:
             dir_name_change.append(file)
 
-    # TODO: find a solution to possible encoding issues here
     # replace text inside files
-    for file in file_search:
-        text = file.read_text(encoding="utf-8", errors="ignore")
-        text = text.replace(old_name, new_name)
-        file.write_text(text)
+    _replace_in_files(file_search, old_name, new_name)
 
     # replace text in filenames
     for file in file_name_change:
@@ -845,7 +4016,8 @@ def glob_to_re(glob_list: list) -> str:
 def exportconf() -> None:
     """Creates a configuration file backup."""
     config["PYNBALL"] = {}
-    config["PYNBALL"]["PYNBALL"] = _get_pynball("string", "PYNBALL")
+    registry = _get_registry("PYNBALL") or VersionRegistry()
+    config["PYNBALL"]["PYNBALL"] = _encode_pynball(registry)
     with open("pynball.ini", "w") as configfile:
         config.write(configfile)
 
@@ -867,4 +4039,10 @@ def importconf(config_path: str) -> None:
         message = f"There is a problem with file: {file_name}"
         _feedback(message, "warning")
         return
-    _setenv("user", "PYNBALL", pynball)
+    try:
+        registry = _decode_pynball(pynball)
+    except (ValueError, SyntaxError):
+        message = f"There is a problem with file: {file_name}"
+        _feedback(message, "warning")
+        return
+    _set_registry(registry, "PYNBALL")
@@ -24,6 +24,7 @@
 DOCS_INDEX = "".join(['"', str(ROOT_DIR / "docs" / "_build" / "index.html"), '"'])
 LOG_DIR = ROOT_DIR.joinpath("logs")
 TEST_DIR = ROOT_DIR.joinpath("tests")
+BENCH_DIR = ROOT_DIR.joinpath("benchmarks")
 SRC_DIR = ROOT_DIR.joinpath("src")
 PKG_DIR = SRC_DIR.joinpath("pynball")
 PYTHON_FILES_ALL = list(ROOT_DIR.rglob("*.py"))
@@ -372,6 +373,14 @@ def tests(c, open_browser=False):
         webbrowser.open(cov_path)
 
 
+@task
+def bench(c):
+    """Run the performance benchmarks."""
+    for script in sorted(BENCH_DIR.glob("bench_*.py")):
+        print(f"--- {script.stem} ---")
+        c.run(f'python "{str(script)}"')
+
+
 @task(
     help={
         "open_browser": "Open  the docs in the web browser",
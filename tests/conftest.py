@@ -81,3 +81,24 @@ def _install_msvcrt_stub() -> types.ModuleType:
 def pb():
     """Return the imported pynball module for convenience."""
     return pynball
+
+
+@pytest.fixture(autouse=True)
+def clear_env_cache():
+    """The registry read cache lives for the whole process - isolate each test."""
+    pynball._clear_env_cache()
+    yield
+    pynball._clear_env_cache()
+
+
+@pytest.fixture(autouse=True)
+def isolate_metadata_cache(tmp_path_factory, monkeypatch):
+    """Keep the interpreter metadata cache out of the user's profile."""
+    cache_path = tmp_path_factory.mktemp("cache") / "interpreters.json"
+    monkeypatch.setattr(pynball, "_METADATA_CACHE_PATH", cache_path)
+
+
+@pytest.fixture(autouse=True)
+def reset_job_settings(monkeypatch):
+    """The global --jobs / --fail-fast options are process wide - isolate each test."""
+    monkeypatch.setattr(pynball, "_JOB_SETTINGS", dict(pynball._JOB_SETTINGS))
@@ -7,9 +7,18 @@
 
 from __future__ import annotations
 
+import asyncio
+import json
 import os
 import stat
+import struct
 import subprocess
+import sys
+import sysconfig
+import textwrap
+import threading
+import time
+import types
 from pathlib import Path
 from unittest import mock
 
@@ -34,27 +43,31 @@ def runner() -> CliRunner:
 def fake_registry(monkeypatch):
     """Replace _getenv/_setenv/_delenv with an in-memory dict-backed fake.
 
-    This lets higher-level code (_get_pynball, _get_system_path, and every
+    This lets higher-level code (_get_registry, _get_system_path, and every
     click command) run against a predictable, isolated "registry" without
     touching the real (stubbed) winreg calls, whose own behaviour is tested
     separately below.
     """
-    store: dict[str, dict[str, str]] = {"user": {}, "system": {"PATH": ""}}
+    store: dict[str, dict[str, str]] = {
+        "user": {},
+        "system": {"PATH": ""},
+        "pynball": {},
+    }
 
     def fake_getenv(scope, name):
-        if scope not in ("user", "system"):
+        if scope not in store:
             pb._feedback("Scope value must be 'user' or 'system'", "warning")
             return None
         return store[scope].get(name)
 
     def fake_setenv(scope, name, value):
-        if scope not in ("user", "system"):
+        if scope not in store:
             pb._feedback("Scope value must be 'user' or 'system'", "warning")
             return
         store[scope][name] = value
 
     def fake_delenv(scope, name):
-        if scope not in ("user", "system"):
+        if scope not in store:
             pb._feedback("Scope value must be 'user' or 'system'", "warning")
             return
         store[scope].pop(name, None)
@@ -166,34 +179,220 @@ def test_file_word_replace(tmp_path):
 # ---------------------------------------------------------------------------
 
 
-def test_execute_success(monkeypatch):
-    class FakeProc:
-        def communicate(self):
-            return b"output text", b""
+def python_command(code: str) -> tuple[str, ...]:
+    return sys.executable, "-c", textwrap.dedent(code)
 
-    monkeypatch.setattr(subprocess, "Popen", lambda *a, **k: FakeProc())
-    result = pb._execute("python", "--version")
-    assert result == "output text"
 
+def test_execute_success():
+    result = pb._execute(*python_command("print('output text')"))
+    assert result.strip() == "output text"
 
-def test_execute_raises_on_stderr(monkeypatch):
-    class FakeProc:
-        def communicate(self):
-            return b"", b"boom"
 
-    monkeypatch.setattr(subprocess, "Popen", lambda *a, **k: FakeProc())
+def test_execute_stderr_with_zero_return_code_is_not_failure():
+    code = "import sys; print('out'); print('warning', file=sys.stderr)"
+    assert pb._execute(*python_command(code)).strip() == "out"
+
+
+def test_execute_raises_on_failure():
+    code = "import sys; print('boom', file=sys.stderr); sys.exit(3)"
     with pytest.raises(Exception, match="boom"):
-        pb._execute("python", "--version")
+        pb._execute(*python_command(code))
+
+
+def test_execute_raises_on_failure_without_stderr():
+    with pytest.raises(Exception, match="return code 3"):
+        pb._execute(*python_command("import sys; sys.exit(3)"))
+
+
+def test_execute_suppress_exception():
+    code = "import sys; print('partial'); sys.exit(1)"
+    result = pb._execute(*python_command(code), supress_exception=True)
+    assert result.strip() == "partial"
+
+
+def test_execute_streams_output(capsys):
+    pb._execute(*python_command("print('line 1'); print('line 2')"), stream=True)
+    assert capsys.readouterr().out.splitlines() == ["line 1", "line 2"]
+
+
+def test_execute_timeout():
+    with pytest.raises(Exception, match="timed out after 0.5s"):
+        pb._execute(*python_command("import time; time.sleep(30)"), timeout=0.5)
+
+
+def test_run_result():
+    lines = []
+    code = """
+        import sys
+        print('a')
+        print('b', file=sys.stderr)
+        sys.exit(2)
+    """
+    result = pb._run(
+        *python_command(code), on_output=lambda name, line: lines.append((name, line))
+    )
+
+    assert result.returncode == 2
+    assert not result.ok
+    assert not result.timed_out
+    assert result.stdout.strip() == "a"
+    assert result.stderr.strip() == "b"
+    assert result.duration > 0
+    assert sorted(lines) == [("stderr", "b"), ("stdout", "a")]
+
+
+def test_run_kills_process_tree_on_timeout(tmp_path):
+    marker = tmp_path / "grandchild.txt"
+    code = f"""
+        import subprocess, sys
+        subprocess.Popen([sys.executable, "-c",
+            "import time; time.sleep(2); open({str(marker)!r}, 'w').close()"])
+        print('started', flush=True)
+        import time; time.sleep(30)
+    """
+    start = time.perf_counter()
+    result = pb._run(*python_command(code), timeout=1)
+
+    assert result.timed_out
+    assert result.returncode is None
+    assert not result.ok
+    assert time.perf_counter() - start < 10
+    time.sleep(2.5)
+    assert not marker.exists()
+
+
+def test_run_kills_process_tree_on_interrupt(tmp_path, monkeypatch):
+    marker = tmp_path / "grandchild.txt"
+    code = f"""
+        import subprocess, sys
+        subprocess.Popen([sys.executable, "-c",
+            "import time; time.sleep(2); open({str(marker)!r}, 'w').close()"])
+        import time; time.sleep(30)
+    """
+    popen_wait = subprocess.Popen.wait
+
+    def interrupted_wait(proc, timeout=None):
+        monkeypatch.setattr(subprocess.Popen, "wait", popen_wait)
+        time.sleep(1)  # give the child time to start its own child
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(subprocess.Popen, "wait", interrupted_wait)
+
+    with pytest.raises(KeyboardInterrupt):
+        pb._run(*python_command(code))
+
+    time.sleep(2.5)
+    assert not marker.exists()
+
+
+def test_run_all_runs_commands_concurrently():
+    command = python_command("import time; time.sleep(0.5); print('done')")
+    start = time.perf_counter()
+
+    results = pb._run_all([command] * 4, timeout=10)
+
+    assert time.perf_counter() - start < 1.8
+    assert [result.stdout.strip() for result in results] == ["done"] * 4
+    assert all(result.ok for result in results)
+
+
+def test_run_async_timeout():
+    command = python_command("import time; time.sleep(30)")
+
+    result = asyncio.run(pb._run_async(*command, timeout=0.5))
+
+    assert result.timed_out
+    assert result.duration < 10
+
+
+# ---------------------------------------------------------------------------
+# _JobRunner
+# ---------------------------------------------------------------------------
+
+
+def test_job_runner_returns_results_in_order():
+    def job(value):
+        time.sleep(0.05 * (3 - value))
+        return value * 10
+
+    with pb._JobRunner(3) as runner:
+        results = runner.run((str(n), job, (n,)) for n in range(3))
+
+    assert [result.value for result in results] == [0, 10, 20]
+    assert [result.name for result in results] == ["0", "1", "2"]
+    assert all(result.ok and result.duration > 0 for result in results)
+
+
+def test_job_runner_bounds_concurrency():
+    running, peak, lock = [0], [0], threading.Lock()
+
+    def job():
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.05)
+        with lock:
+            running[0] -= 1
+
+    with pb._JobRunner(2) as runner:
+        runner.run(("job", job, ()) for _ in range(6))
+
+    assert peak[0] == 2
 
 
-def test_execute_suppress_exception(monkeypatch):
-    class FakeProc:
-        def communicate(self):
-            return b"partial", b"boom"
+def test_job_runner_collects_errors():
+    def job(value):
+        if value == 1:
+            raise ValueError("bad value")
+        return value
 
-    monkeypatch.setattr(subprocess, "Popen", lambda *a, **k: FakeProc())
-    result = pb._execute("python", "--version", supress_exception=True)
-    assert result == "partial"
+    with pb._JobRunner(1, fail_fast=False) as runner:
+        results = runner.run((str(n), job, (n,)) for n in range(3))
+
+    assert [result.ok for result in results] == [True, False, True]
+    assert str(results[1].error) == "bad value"
+    assert results[2].value == 2
+
+
+def test_job_runner_fail_fast_cancels_pending_jobs():
+    def job(value):
+        if value == 0:
+            raise ValueError("bad value")
+        return value
+
+    with pb._JobRunner(1, fail_fast=True) as runner:
+        results = runner.run((str(n), job, (n,)) for n in range(3))
+
+    assert isinstance(results[0].error, ValueError)
+    assert [result.cancelled for result in results] == [False, True, True]
+    assert runner.cancelled
+
+
+def test_job_runner_cancel_kills_running_command():
+    command = python_command("import time; time.sleep(30)")
+
+    def fail_soon():
+        time.sleep(0.3)
+        raise RuntimeError("failed")
+
+    start = time.perf_counter()
+    with pb._JobRunner(2, fail_fast=True) as runner:
+        slow, failing = runner.run(
+            [("slow", pb._run, command), ("failing", fail_soon, ())]
+        )
+
+    assert time.perf_counter() - start < 10
+    assert slow.value.cancelled
+    assert not slow.value.ok
+    assert str(failing.error) == "failed"
+
+
+def test_cli_sets_job_settings(runner):
+    result = runner.invoke(pb.cli, ["--jobs", "3", "--fail-fast", "version"])
+
+    assert result.exit_code == 0
+    assert pb._JOB_SETTINGS == {"workers": 3, "fail_fast": True}
+    assert pb._JobRunner().workers == 3
 
 
 def test_execute_oserror(monkeypatch, capsys):
@@ -304,6 +503,70 @@ def raise_not_found(*a, **k):
     assert pb._getenv("system", "MYVAR") is None
 
 
+def test_getenv_reads_registry_once_per_name(monkeypatch):
+    monkeypatch.setattr(pb.winreg, "CreateKey", mock.MagicMock(return_value="HKEY"))
+    query = mock.MagicMock(return_value=("the-value", 1))
+    monkeypatch.setattr(pb.winreg, "QueryValueEx", query)
+
+    assert pb._getenv("user", "MYVAR") == "the-value"
+    assert pb._getenv("user", "MYVAR") == "the-value"
+    assert pb._getenv("system", "MYVAR") == "the-value"
+
+    assert query.call_count == 2
+    assert pb._ENV_CACHE_STATS["reads"] == 2
+
+
+def test_getenv_caches_missing_value(monkeypatch):
+    monkeypatch.setattr(pb.winreg, "CreateKey", mock.MagicMock(return_value="HKEY"))
+    query = mock.MagicMock(side_effect=FileNotFoundError)
+    monkeypatch.setattr(pb.winreg, "QueryValueEx", query)
+
+    assert pb._getenv("user", "MYVAR") is None
+    assert pb._getenv("user", "MYVAR") is None
+    assert query.call_count == 1
+
+
+def test_setenv_writes_through_cache(monkeypatch):
+    monkeypatch.setattr(pb.winreg, "OpenKey", mock.MagicMock(return_value="HKEY"))
+    monkeypatch.setattr(pb.winreg, "SetValueEx", mock.MagicMock())
+    monkeypatch.setattr(pb.winreg, "CloseKey", mock.MagicMock())
+    query = mock.MagicMock(return_value=("stale", 1))
+    monkeypatch.setattr(pb.winreg, "QueryValueEx", query)
+
+    pb._setenv("user", "MYVAR", "fresh")
+
+    assert pb._getenv("user", "MYVAR") == "fresh"
+    query.assert_not_called()
+
+
+def test_delenv_updates_cache(monkeypatch):
+    monkeypatch.setattr(pb.winreg, "CreateKey", mock.MagicMock(return_value="HKEY"))
+    monkeypatch.setattr(pb.winreg, "DeleteValue", mock.MagicMock())
+    query = mock.MagicMock(return_value=("the-value", 1))
+    monkeypatch.setattr(pb.winreg, "QueryValueEx", query)
+
+    assert pb._getenv("user", "MYVAR") == "the-value"
+    pb._delenv("user", "MYVAR")
+
+    assert pb._getenv("user", "MYVAR") is None
+    assert query.call_count == 1
+
+
+def test_delenv_failure_invalidates_cache(monkeypatch):
+    monkeypatch.setattr(pb.winreg, "CreateKey", mock.MagicMock(return_value="HKEY"))
+    monkeypatch.setattr(
+        pb.winreg, "DeleteValue", mock.MagicMock(side_effect=OSError("denied"))
+    )
+    query = mock.MagicMock(return_value=("the-value", 1))
+    monkeypatch.setattr(pb.winreg, "QueryValueEx", query)
+
+    pb._getenv("user", "MYVAR")
+    pb._delenv("user", "MYVAR")
+    pb._getenv("user", "MYVAR")
+
+    assert query.call_count == 2
+
+
 def test_getenv_non_windows_platform(monkeypatch):
     monkeypatch.setattr(pb, "_PLATFORM", "linux")
     assert pb._getenv("user", "NAME") is None
@@ -337,63 +600,426 @@ def raise_oserror(*a, **k):
     assert "Deletion of key" in capsys.readouterr().out
 
 
+def test_setenv_skips_unchanged_value(monkeypatch):
+    open_key = mock.MagicMock(return_value="HKEY")
+    set_value = mock.MagicMock()
+    monkeypatch.setattr(pb.winreg, "OpenKey", open_key)
+    monkeypatch.setattr(pb.winreg, "SetValueEx", set_value)
+    monkeypatch.setattr(pb.winreg, "CloseKey", mock.MagicMock())
+
+    pb._setenv("user", "MYVAR", "same")
+    pb._setenv("user", "MYVAR", "same")
+
+    set_value.assert_called_once()
+
+
+def test_delenv_skips_known_missing_value(monkeypatch):
+    monkeypatch.setattr(pb.winreg, "CreateKey", mock.MagicMock(return_value="HKEY"))
+    monkeypatch.setattr(
+        pb.winreg, "QueryValueEx", mock.MagicMock(side_effect=FileNotFoundError)
+    )
+    delete_value = mock.MagicMock()
+    monkeypatch.setattr(pb.winreg, "DeleteValue", delete_value)
+
+    assert pb._getenv("user", "MYVAR") is None
+    pb._delenv("user", "MYVAR")
+
+    delete_value.assert_not_called()
+
+
+@pytest.fixture()
+def stub_registry(monkeypatch):
+    """Point the stubbed winreg calls at an in-memory {(key, name): value} store."""
+    values: dict[tuple[int, str], str] = {}
+    handles = {"user": pb._USER_KEY, "system": pb._SYSTEM_KEY}
+
+    def query(key, name):
+        try:
+            return values[(key, name)], 1
+        except KeyError:
+            raise FileNotFoundError from None
+
+    def delete(key, name):
+        try:
+            del values[(key, name)]
+        except KeyError:
+            raise OSError("not found") from None
+
+    open_key = mock.MagicMock(side_effect=lambda key, *a: key)
+    set_value = mock.MagicMock(
+        side_effect=lambda key, name, _r, _t, value: values.__setitem__(
+            (key, name), value
+        )
+    )
+    monkeypatch.setattr(pb.winreg, "OpenKey", open_key)
+    monkeypatch.setattr(pb.winreg, "CreateKey", lambda key, _sub: key)
+    monkeypatch.setattr(pb.winreg, "QueryValueEx", query)
+    monkeypatch.setattr(pb.winreg, "SetValueEx", set_value)
+    monkeypatch.setattr(pb.winreg, "DeleteValue", delete)
+    monkeypatch.setattr(pb.winreg, "CloseKey", mock.MagicMock())
+    return types.SimpleNamespace(
+        values=values, handles=handles, open_key=open_key, set_value=set_value
+    )
+
+
+def test_env_transaction_batches_writes(stub_registry):
+    with pb._env_transaction():
+        pb._setenv("user", "A", "1")
+        pb._setenv("user", "A", "2")
+        pb._setenv("user", "B", "3")
+        assert pb._getenv("user", "A") == "2"
+        assert stub_registry.set_value.call_count == 0
+
+    assert stub_registry.open_key.call_count == 1
+    assert stub_registry.set_value.call_count == 2
+    user = stub_registry.handles["user"]
+    assert stub_registry.values == {(user, "A"): "2", (user, "B"): "3"}
+    assert pb._getenv("user", "A") == "2"
+
+
+def test_env_transaction_skips_unchanged_values(stub_registry):
+    user = stub_registry.handles["user"]
+    stub_registry.values[(user, "A")] = "1"
+
+    with pb._env_transaction():
+        pb._setenv("user", "A", "1")
+        pb._delenv("user", "NEVER_SET")
+
+    stub_registry.open_key.assert_not_called()
+
+
+def test_env_transaction_reads_current_values_in_one_round_trip(monkeypatch):
+    store = mock.MagicMock()
+    store.read_many.return_value = {"A": "1", "B": None, "C": None}
+    store.write_many.return_value = {}
+    store.changed.return_value = False
+    monkeypatch.setattr(pb, "_get_store", lambda: store)
+
+    with pb._env_transaction():
+        pb._setenv("user", "A", "1")
+        pb._setenv("user", "B", "2")
+        pb._setenv("user", "C", "3")
+
+    store.read_many.assert_called_once_with("user", ["A", "B", "C"])
+    store.read.assert_not_called()
+    store.write_many.assert_called_once_with("user", {"B": "2", "C": "3"})
+
+
+def test_env_transaction_deletes(stub_registry):
+    user = stub_registry.handles["user"]
+    system = stub_registry.handles["system"]
+    stub_registry.values[(user, "A")] = "1"
+    stub_registry.values[(system, "B")] = "2"
+
+    with pb._env_transaction():
+        pb._delenv("user", "A")
+        pb._setenv("system", "B", "3")
+        assert pb._getenv("user", "A") is None
+
+    assert stub_registry.values == {(system, "B"): "3"}
+    assert stub_registry.open_key.call_count == 2
+
+
+def test_env_transaction_nested_joins_outer(stub_registry):
+    with pb._env_transaction():
+        with pb._env_transaction():
+            pb._setenv("user", "A", "1")
+        assert stub_registry.set_value.call_count == 0
+
+    assert stub_registry.set_value.call_count == 1
+
+
+def test_env_transaction_discards_on_error(stub_registry):
+    with pytest.raises(RuntimeError):
+        with pb._env_transaction():
+            pb._setenv("user", "A", "1")
+            raise RuntimeError
+
+    assert stub_registry.values == {}
+
+
 def test_delenv_non_windows_platform(monkeypatch):
     monkeypatch.setattr(pb, "_PLATFORM", "linux")
     assert pb._delenv("user", "NAME") is None
 
 
 # ---------------------------------------------------------------------------
-# _set_pynball / _get_pynball
+# VersionRegistry
 # ---------------------------------------------------------------------------
 
 
-def test_set_pynball_writes_string_repr(fake_registry):
-    pb._set_pynball({"3.10": Path("C:/Python310")}, "PYNBALL")
-    assert fake_registry["user"]["PYNBALL"] == str({"3.10": "C:\\Python310"}) or True
-    # The important behavioural contract is that it round-trips through
-    # _get_pynball correctly; exact separator formatting is platform
-    # dependent (Path str), so validate via the getter instead.
-    assert pb._get_pynball("names", "PYNBALL") == ["3.10"]
+def test_version_registry_lookups():
+    registry = pb.VersionRegistry({"3.10": Path("/py310"), "3.9": "/py39"})
+
+    assert "3.10" in registry
+    assert "3.8" not in registry
+    assert len(registry) == 2
+    assert registry.names() == ["3.10", "3.9"]
+    assert registry.path("3.9") == Path("/py39")
+    assert registry.path("3.8") is None
+    assert registry.name_for(Path("/py310")) == "3.10"
+    assert registry.name_for("/py310/") == "3.10"
+    assert registry.name_for("/elsewhere") is None
+
+
+def test_version_registry_set_replaces_reverse_index():
+    registry = pb.VersionRegistry({"3.10": "/old"})
+
+    registry.set("3.10", "/new")
+
+    assert registry.name_for("/old") is None
+    assert registry.name_for("/new") == "3.10"
+    assert registry.to_dict() == {"3.10": "/new"}
+
+
+def test_version_registry_remove():
+    registry = pb.VersionRegistry({"3.10": "/py310"})
+
+    assert registry.remove("3.10") is True
+    assert registry.remove("3.10") is False
+    assert registry.name_for("/py310") is None
+    assert not registry
+
+
+def test_version_registry_copy():
+    registry = pb.VersionRegistry({"3.9": "/a", "3.10": "/b"})
+    duplicate = registry.copy()
+
+    duplicate.remove("3.9")
+    duplicate.set("3.11", "/c")
 
+    assert registry.names() == ["3.10", "3.9"]
+    assert registry.items() == [("3.10", Path("/b")), ("3.9", Path("/a"))]
+    assert duplicate.names() == ["3.11", "3.10"]
 
-def test_get_pynball_invalid_returntype(capsys):
-    assert pb._get_pynball("bogus", "PYNBALL") is None
-    assert "Please use a correct returntype" in capsys.readouterr().out
 
+def test_version_registry_keeps_version_order():
+    registry = pb.VersionRegistry()
+    for name in ("3.9.1", "3.13.0rc1", "3.10", "3.13.0", "pypy3.10", "3.13.0a2"):
+        registry.set(name, f"/{name}")
 
-def test_get_pynball_not_set(fake_registry):
-    assert pb._get_pynball("dict", "PYNBALL") is None
+    assert registry.names() == [
+        "3.13.0",
+        "3.13.0rc1",
+        "3.13.0a2",
+        "3.10",
+        "pypy3.10",
+        "3.9.1",
+    ]
 
 
-def test_get_pynball_string(fake_registry):
-    pb._set_pynball({"3.10": Path("/py310")}, "PYNBALL")
-    result = pb._get_pynball("string", "PYNBALL")
-    assert isinstance(result, str)
-    assert "3.10" in result
+def test_version_registry_update_sorts_once():
+    registry = pb.VersionRegistry({"3.8": "/py38"})
+    registry.update([("3.12", "/py312"), ("3.8", "/new38"), ("3.9", "/py39")])
 
+    assert registry.names() == ["3.12", "3.9", "3.8"]
+    assert registry.path("3.8") == Path("/new38")
+    assert registry.name_for("/py38") is None
 
-def test_get_pynball_dict(fake_registry):
-    pb._set_pynball({"3.10": Path("/py310")}, "PYNBALL")
-    result = pb._get_pynball("dict", "PYNBALL")
-    assert result == {"3.10": str(Path("/py310"))}
+
+@pytest.mark.parametrize(
+    "name,expected",
+    [
+        ("3.10.4", ((3, 10, 4), (3, 0), (True, "cpython"), "3.10.4")),
+        ("3.13.0rc1", ((3, 13, 0), (2, 1), (True, "cpython"), "3.13.0rc1")),
+        ("3.12.0b3", ((3, 12, 0), (1, 3), (True, "cpython"), "3.12.0b3")),
+        ("pypy3.10", ((3, 10), (3, 0), (False, "pypy"), "pypy3.10")),
+        ("old", ((), (-1, 0), (False, ""), "old")),
+        ("3.11-arm64", ((3, 11), (3, 0), (True, "cpython"), "3.11-arm64")),
+        ("3.11-amd64", ((3, 11), (3, 0), (True, "cpython"), "3.11-amd64")),
+        ("3.12.0-arm", ((3, 12, 0), (3, 0), (True, "cpython"), "3.12.0-arm")),
+        ("3.13.0a2-arm64", ((3, 13, 0), (0, 2), (True, "cpython"), "3.13.0a2-arm64")),
+        ("3.13.0rc", ((3, 13, 0), (2, 0), (True, "cpython"), "3.13.0rc")),
+        ("python3.11", ((3, 11), (3, 0), (True, "cpython"), "python3.11")),
+        ("cpython-3.12", ((3, 12), (3, 0), (True, "cpython"), "cpython-3.12")),
+    ],
+)
+def test_version_key(name, expected):
+    assert pb._version_key(name) == expected
 
 
-def test_get_pynball_dict_path_object(fake_registry):
-    pb._set_pynball({"3.10": Path("/py310")}, "PYNBALL")
-    result = pb._get_pynball("dict_path_object", "PYNBALL")
-    assert result == {"3.10": Path("/py310")}
+def test_version_key_orders_mixed_names():
+    names = ["old", "3.9", "3.10", "3.10.0a1", "pypy3.9"]
+    assert sorted(names, key=pb._version_key) == [
+        "old",
+        "pypy3.9",
+        "3.9",
+        "3.10",
+        "3.10.0a1",
+    ]
 
 
-def test_get_pynball_names(fake_registry):
-    pb._set_pynball({"3.10": Path("/py310"), "3.9": Path("/py39")}, "PYNBALL")
-    result = pb._get_pynball("names", "PYNBALL")
-    assert set(result) == {"3.10", "3.9"}
+def test_version_key_sorts_platform_builds_as_final_releases():
+    names = ["3.12.0rc1", "3.12.0-arm", "3.12.0b2", "3.11-amd64"]
+    assert sorted(names, key=pb._version_key) == [
+        "3.11-amd64",
+        "3.12.0b2",
+        "3.12.0rc1",
+        "3.12.0-arm",
+    ]
 
 
-def test_get_pynball_paths(fake_registry):
-    pb._set_pynball({"3.10": Path("/py310"), "3.9": Path("/py39")}, "PYNBALL")
-    result = pb._get_pynball("paths", "PYNBALL")
-    assert set(result) == {str(Path("/py310")), str(Path("/py39"))}
+def test_version_registry_has_no_instance_dict():
+    assert not hasattr(pb.VersionRegistry(), "__dict__")
+
+
+# ---------------------------------------------------------------------------
+# _set_registry / _get_registry
+# ---------------------------------------------------------------------------
+
+
+def test_set_registry_round_trips(fake_registry):
+    pb._set_registry(pb.VersionRegistry({"3.10": Path("C:/Python310")}), "PYNBALL")
+    assert pb._get_registry("PYNBALL").to_dict() == {"3.10": str(Path("C:/Python310"))}
+
+
+def test_get_registry_items_are_paths(fake_registry):
+    pb._set_registry(pb.VersionRegistry({"3.10": Path("/py310")}), "PYNBALL")
+    assert dict(pb._get_registry("PYNBALL").items()) == {"3.10": Path("/py310")}
+
+
+def test_get_registry_names_and_paths(fake_registry):
+    versions = {"3.10": Path("/py310"), "3.9": Path("/py39")}
+    pb._set_registry(pb.VersionRegistry(versions), "PYNBALL")
+    registry = pb._get_registry("PYNBALL")
+    assert registry.names() == pb._get_index("PYNBALL") == ["3.10", "3.9"]
+    assert registry.paths() == [str(Path("/py310")), str(Path("/py39"))]
+
+
+def test_get_registry_parses_each_value_once(fake_registry, monkeypatch):
+    fake_registry["user"]["PYNBALL"] = pb._encode_pynball(
+        pb.VersionRegistry({"3.10": Path("/py310")})
+    )
+    decode = mock.MagicMock(wraps=pb._decode_pynball)
+    monkeypatch.setattr(pb, "_decode_pynball", decode)
+
+    pb._get_registry("PYNBALL")
+    pb._get_index("PYNBALL")
+    pb._get_registry("PYNBALL")
+
+    assert decode.call_count == 1
+    assert len(pb._PYNBALL_PARSE_CACHE) == 2  # the single value and the shards
+
+
+def test_set_registry_writes_index_and_shards(fake_registry):
+    versions = {"3.9": Path("/py39"), "3.10": Path("/py310")}
+    pb._set_registry(pb.VersionRegistry(versions), "PYNBALL")
+    stored = fake_registry["user"]["PYNBALL"]
+    assert stored[0] == pb._PYNBALL_INDEX_FORMAT
+    assert json.loads(stored[1:]) == ["3.10", "3.9"]
+    assert fake_registry["pynball"] == {
+        "PYNBALL:3.10": str(Path("/py310")),
+        "PYNBALL:3.9": str(Path("/py39")),
+    }
+
+
+def test_set_registry_deletes_stale_shards(fake_registry):
+    versions = {"3.9": Path("/py39"), "3.10": Path("/py310")}
+    pb._set_registry(pb.VersionRegistry(versions), "PYNBALL")
+    pb._set_registry(pb.VersionRegistry({"3.11": Path("/py311")}), "PYNBALL")
+    assert fake_registry["pynball"] == {"PYNBALL:3.11": str(Path("/py311"))}
+
+
+def test_get_registry_migrates_legacy_format(fake_registry):
+    legacy = {"3.10": str(Path("/py310")), "3.9": str(Path("/py39"))}
+    fake_registry["user"]["PYNBALL"] = str(legacy)
+
+    registry = pb._get_registry("PYNBALL")
+
+    assert registry.to_dict() == legacy
+    assert registry.names() == ["3.10", "3.9"]
+    assert fake_registry["user"]["PYNBALL"] == pb._encode_index(["3.10", "3.9"])
+    assert fake_registry["pynball"]["PYNBALL:3.9"] == str(Path("/py39"))
+
+
+def test_get_registry_migrates_single_value_format(fake_registry):
+    registry = pb.VersionRegistry({"3.10": "/py310"})
+    fake_registry["user"]["PYNBALL"] = pb._encode_pynball(registry)
+
+    assert pb._get_index("PYNBALL") == ["3.10"]
+    assert fake_registry["user"]["PYNBALL"] == pb._encode_index(["3.10"])
+
+
+def test_get_index_reads_only_index(fake_registry, monkeypatch):
+    versions = {"3.9": Path("/py39"), "3.10": Path("/py310")}
+    pb._set_registry(pb.VersionRegistry(versions), "PYNBALL")
+    getenv = mock.MagicMock(wraps=pb._getenv)
+    monkeypatch.setattr(pb, "_getenv", getenv)
+
+    assert pb._get_index("PYNBALL") == ["3.10", "3.9"]
+    getenv.assert_called_once_with("user", "PYNBALL")
+
+
+def test_encode_pynball_of_registry_is_single_value_format(fake_registry):
+    pb._set_registry(pb.VersionRegistry({"3.10": Path("/py310")}), "PYNBALL")
+    exported = pb._encode_pynball(pb._get_registry("PYNBALL"))
+    assert exported[0] == pb._PYNBALL_FORMAT
+    assert pb._decode_pynball(exported).to_dict() == {"3.10": str(Path("/py310"))}
+
+
+def test_get_version_path_reads_one_shard(fake_registry, monkeypatch):
+    versions = {"3.9": Path("/py39"), "3.10": Path("/py310")}
+    pb._set_registry(pb.VersionRegistry(versions), "PYNBALL")
+    getenv = mock.MagicMock(wraps=pb._getenv)
+    monkeypatch.setattr(pb, "_getenv", getenv)
+
+    assert pb._get_version_path("3.9", "PYNBALL") == Path("/py39")
+    assert pb._get_version_path("3.8", "PYNBALL") is None
+    assert getenv.call_args_list == [
+        mock.call("user", "PYNBALL"),
+        mock.call("pynball", "PYNBALL:3.9"),
+        mock.call("user", "PYNBALL"),
+    ]
+
+
+def test_remove_version(fake_registry):
+    versions = {"3.9": Path("/py39"), "3.10": Path("/py310")}
+    pb._set_registry(pb.VersionRegistry(versions), "PYNBALL")
+
+    assert pb._remove_version("3.9", "PYNBALL") is True
+    assert pb._remove_version("3.9", "PYNBALL") is False
+
+    assert fake_registry["user"]["PYNBALL"] == pb._encode_index(["3.10"])
+    assert list(fake_registry["pynball"]) == ["PYNBALL:3.10"]
+
+
+def test_prefetch_env_reads_missing_values_once(monkeypatch):
+    store = mock.MagicMock()
+    store.read_many.return_value = {"A": "1", "B": None}
+    store.changed.return_value = False
+    monkeypatch.setattr(pb, "_get_store", lambda: store)
+
+    pb._prefetch_env("pynball", ["A", "B"])
+    pb._prefetch_env("pynball", ["A", "B"])
+
+    store.read_many.assert_called_once_with("pynball", ["A", "B"])
+    assert pb._getenv("pynball", "A") == "1"
+    assert pb._getenv("pynball", "B") is None
+    store.read.assert_not_called()
+
+
+def test_get_registry_unknown_format_exits(fake_registry, capsys):
+    fake_registry["user"]["PYNBALL"] = "9[]"
+    with pytest.raises(SystemExit):
+        pb._get_registry("PYNBALL")
+    assert "Unknown Pynball configuration format" in capsys.readouterr().out
+
+
+def test_encode_decode_round_trip():
+    registry = pb.VersionRegistry({"3.10": "C:\\Python\\3.10", "pypy": "/opt/pypy"})
+    decoded = pb._decode_pynball(pb._encode_pynball(registry))
+    assert decoded.to_dict() == registry.to_dict()
+    assert decoded.names() == registry.names()
+
+
+def test_get_registry_not_set(fake_registry):
+    assert pb._get_registry("PYNBALL") is None
+
+
+def test_get_registry_is_a_private_copy(fake_registry):
+    pb._set_registry(pb.VersionRegistry({"3.10": Path("/py310")}), "PYNBALL")
+    pb._get_registry("PYNBALL").remove("3.10")
+    assert pb._get_registry("PYNBALL").names() == ["3.10"]
 
 
 # ---------------------------------------------------------------------------
@@ -416,7 +1042,7 @@ def test_get_system_path_with_matching_pynball(fake_registry, tmp_path):
     p1 = tmp_path / "py1"
     make_python_exe(p1)
     fake_registry["system"]["PATH"] = str(p1)
-    pb._set_pynball({"3.11": p1}, "PYNBALL")
+    pb._set_registry(pb.VersionRegistry({"3.11": p1}), "PYNBALL")
 
     paths, names = pb._get_system_path()
 
@@ -438,3 +1064,426 @@ def test_get_system_path_ignores_empty_or_missing_exe(fake_registry, tmp_path):
     paths, _ = pb._get_system_path()
 
     assert paths == [str(p3)]
+
+
+def test_get_system_interpreters_dedupes_entries(fake_registry, tmp_path):
+    p1 = tmp_path / "py1"
+    make_python_exe(p1)
+    fake_registry["system"]["PATH"] = ";".join(
+        [str(p1), f'"{p1}"', str(p1) + os.sep, "", str(tmp_path / "other")]
+    )
+
+    assert pb._get_system_interpreters() == [str(p1)]
+
+
+def test_get_system_interpreters_stats_once_per_entry(
+    fake_registry, tmp_path, monkeypatch
+):
+    p1 = tmp_path / "py1"
+    make_python_exe(p1)
+    fake_registry["system"]["PATH"] = ";".join([str(p1), str(tmp_path / "py2")])
+    os_stat = mock.MagicMock(wraps=os.stat)
+    monkeypatch.setattr(pb.os, "stat", os_stat)
+
+    pb._get_system_interpreters()
+    pb._get_system_interpreters()
+
+    assert os_stat.call_count == 2
+
+
+def test_get_system_interpreters_rescans_changed_path(fake_registry, tmp_path):
+    p1 = tmp_path / "py1"
+    make_python_exe(p1)
+    fake_registry["system"]["PATH"] = str(tmp_path)
+    assert pb._get_system_interpreters() == []
+
+    pb._setenv("system", "PATH", str(p1))
+
+    assert pb._get_system_interpreters() == [str(p1)]
+
+
+def test_get_system_interpreters_reports_slow_entries(
+    fake_registry, tmp_path, monkeypatch, capsys
+):
+    fast, slow, dead = tmp_path / "fast", tmp_path / "slow", tmp_path / "dead"
+    for directory in (fast, slow, dead):
+        make_python_exe(directory)
+    fake_registry["system"]["PATH"] = ";".join([str(fast), str(slow), str(dead)])
+    real_stat = os.stat
+    release = threading.Event()
+
+    def os_stat(path, *args, **kwargs):
+        if Path(path).parent == slow:
+            time.sleep(0.05)
+        elif Path(path).parent == dead:
+            release.wait(5)
+        return real_stat(path, *args, **kwargs)
+
+    monkeypatch.setattr(pb.os, "stat", os_stat)
+    monkeypatch.setattr(pb, "_PATH_SLOW_SECONDS", 0.04)
+    monkeypatch.setattr(pb, "_PATH_STAT_TIMEOUT", 0.5)
+    monkeypatch.setattr(pb, "_IDLEMODE", 1)
+
+    try:
+        assert pb._get_system_interpreters() == [str(fast), str(slow)]
+    finally:
+        release.set()
+
+    output = capsys.readouterr().out
+    assert f"PATH entry '{slow}' is slow" in output
+    assert f"PATH entry '{dead}' did not respond within 0.5s" in output
+    assert f"'{fast}'" not in output
+
+
+# ---------------------------------------------------------------------------
+# _static_version / _probe_interpreter
+# ---------------------------------------------------------------------------
+
+
+def make_pe_exe(directory: Path, major: int, minor: int, field3: int) -> None:
+    """Write a python.exe carrying a VS_FIXEDFILEINFO version block."""
+    directory.mkdir(parents=True, exist_ok=True)
+    info = struct.pack("<IIII", 0xFEEF04BD, 0x10000, major << 16 | minor, field3 << 16)
+    (directory / "python.exe").write_bytes(b"MZ" + b"\0" * 200 + info + b"\0" * 40)
+
+
+def make_patchlevel(header: Path, version: str) -> None:
+    header.parent.mkdir(parents=True, exist_ok=True)
+    header.write_text(f'#define PY_MINOR_VERSION 0\n#define PY_VERSION "{version}"\n')
+
+
+def test_static_version_from_patchlevel(tmp_path):
+    make_python_exe(tmp_path)
+    make_patchlevel(tmp_path / "include" / "patchlevel.h", "3.11.7")
+    (tmp_path / "python311.dll").touch()
+    (tmp_path / "python3.dll").touch()
+
+    assert pb._static_version(tmp_path) == "3.11.7"
+
+
+def test_static_version_from_posix_layout(tmp_path):
+    make_python_exe(tmp_path)
+    make_patchlevel(tmp_path / "include" / "python3.12" / "patchlevel.h", "3.12.1rc1")
+    (tmp_path / "lib" / "python3.12").mkdir(parents=True)
+    (tmp_path / "lib" / "libpython3.12.so.1.0").touch()
+
+    assert pb._static_version(tmp_path) == "3.12.1rc1"
+
+
+def test_static_version_from_pe_resource(tmp_path):
+    make_pe_exe(tmp_path, 3, 10, 11150)
+
+    assert pb._static_version(tmp_path) == "3.10.11"
+
+
+@pytest.mark.parametrize(
+    ("field3", "version"),
+    [(121, "3.13.0rc1"), (102, "3.13.0a2"), (113, "3.13.0b3"), (150, "3.13.0")],
+)
+def test_static_version_keeps_pre_release_level(tmp_path, field3, version):
+    make_pe_exe(tmp_path, 3, 13, field3)
+    make_patchlevel(tmp_path / "include" / "patchlevel.h", version)
+    (tmp_path / "python313.dll").touch()
+
+    assert pb._static_version(tmp_path) == version
+
+
+def test_static_version_ambiguous_sources(tmp_path):
+    make_pe_exe(tmp_path, 3, 10, 11150)
+    make_patchlevel(tmp_path / "include" / "patchlevel.h", "3.11.7")
+
+    assert pb._static_version(tmp_path) is None
+
+
+def test_static_version_series_mismatch(tmp_path):
+    make_python_exe(tmp_path)
+    make_patchlevel(tmp_path / "include" / "patchlevel.h", "3.11.7")
+    (tmp_path / "python310.dll").touch()
+
+    assert pb._static_version(tmp_path) is None
+
+
+def test_static_version_series_only(tmp_path):
+    make_python_exe(tmp_path)
+    (tmp_path / "python311.dll").touch()
+
+    assert pb._static_version(tmp_path) is None
+
+
+def test_probe_interpreter_does_not_spawn_when_static(tmp_path, monkeypatch):
+    make_python_exe(tmp_path)
+    make_patchlevel(tmp_path / "include" / "patchlevel.h", "3.11.7")
+    execute = mock.MagicMock()
+    monkeypatch.setattr(pb, "_execute", execute)
+
+    metadata, error = pb._probe_interpreter(tmp_path)
+
+    assert (metadata["version"], error) == ("3.11.7", None)
+    execute.assert_not_called()
+
+
+def test_probe_interpreter_falls_back_to_subprocess(tmp_path, monkeypatch):
+    make_python_exe(tmp_path)
+    monkeypatch.setattr(pb, "_execute", lambda *a, **k: "Python 3.9.13\r\n")
+
+    metadata, error = pb._probe_interpreter(tmp_path)
+
+    assert (metadata["version"], error) == ("3.9.13", None)
+
+
+def test_run_probe_real_interpreter():
+    probe, error = pb._run_probe(Path(sys.executable))
+
+    assert error is None
+    assert probe["version_info"][:3] == list(sys.version_info[:3])
+    assert probe["version"] == "{}.{}.{}".format(*sys.version_info[:3])
+    assert probe["implementation"] == sys.implementation.name
+    assert probe["pointer_size"] == struct.calcsize("P") * 8
+    assert probe["platform"] == sysconfig.get_platform()
+    assert set(probe["paths"]) >= {"stdlib", "purelib", "scripts"}
+
+
+@pytest.mark.skipif(os.name == "nt", reason="POSIX shell script")
+def test_run_probe_times_out_on_stuck_interpreter(tmp_path, monkeypatch):
+    exe = tmp_path / "python"
+    exe.write_text("#!/bin/sh\nsleep 30\n")
+    exe.chmod(0o755)
+    monkeypatch.setattr(pb, "_PROBE_TIMEOUT", 0.5)
+    start = time.perf_counter()
+
+    probe, error = pb._run_probe(exe)
+
+    assert probe is None
+    assert "timed out after 0.5s" in error
+    assert time.perf_counter() - start < 10
+
+
+def test_run_probe_keeps_pre_release_level(tmp_path, monkeypatch):
+    probe = {"version_info": [3, 13, 0, "candidate", 1]}
+    monkeypatch.setattr(pb, "_execute", lambda *a, **k: json.dumps(probe))
+
+    assert pb._run_probe(tmp_path / "python.exe")[0]["version"] == "3.13.0rc1"
+
+    monkeypatch.setattr(pb, "_execute", lambda *a, **k: "Python 3.14.0b2\r\n")
+
+    assert pb._run_probe(tmp_path / "python.exe") == ({"version": "3.14.0b2"}, None)
+
+
+def test_probe_interpreter_spawns_once(tmp_path, monkeypatch):
+    make_python_exe(tmp_path)
+    probe = {
+        "version_info": [3, 13, 1, "final", 0],
+        "implementation": "cpython",
+        "pointer_size": 64,
+        "platform": "win-arm64",
+        "abiflags": "t",
+        "paths": {"stdlib": "Lib"},
+        "venv": True,
+        "ensurepip": False,
+    }
+    execute = mock.MagicMock(return_value=json.dumps(probe))
+    monkeypatch.setattr(pb, "_execute", execute)
+
+    metadata, error = pb._probe_interpreter(tmp_path)
+
+    assert error is None
+    execute.assert_called_once_with(
+        tmp_path / "python.exe",
+        "-I",
+        "-S",
+        "-c",
+        pb._PROBE_SCRIPT,
+        timeout=pb._PROBE_TIMEOUT,
+    )
+    assert metadata == {
+        "version": "3.13.1",
+        "architecture": "ARM64",
+        "implementation": "cpython",
+        "venv_base": True,
+        "pointer_size": 64,
+        "abiflags": "t",
+        "paths": {"stdlib": "Lib"},
+        "ensurepip": False,
+    }
+
+
+def test_probe_interpreter_reports_probe_failure(tmp_path, monkeypatch):
+    make_python_exe(tmp_path)
+
+    def execute(*args, **kwargs):
+        raise Exception("Unknown option: -I")
+
+    monkeypatch.setattr(pb, "_execute", execute)
+
+    assert pb._probe_interpreter(tmp_path) == (None, "Unknown option: -I")
+
+
+# ---------------------------------------------------------------------------
+# interpreter metadata / _InterpreterCache
+# ---------------------------------------------------------------------------
+
+
+def make_pe_machine_exe(directory: Path, machine: int) -> None:
+    directory.mkdir(parents=True, exist_ok=True)
+    header = bytearray(b"MZ" + b"\0" * 126)
+    struct.pack_into("<I", header, 0x3C, 64)
+    header[64:70] = b"PE\0\0" + struct.pack("<H", machine)
+    (directory / "python.exe").write_bytes(bytes(header))
+
+
+@pytest.mark.parametrize(
+    "machine, expected", [(0x8664, "AMD64"), (0x014C, "x86"), (0xAA64, "ARM64")]
+)
+def test_pe_machine(tmp_path, machine, expected):
+    make_pe_machine_exe(tmp_path, machine)
+    assert pb._pe_machine(tmp_path / "python.exe") == expected
+
+
+def test_pe_machine_not_pe(tmp_path):
+    make_python_exe(tmp_path)
+    assert pb._pe_machine(tmp_path / "python.exe") is None
+
+
+def test_probe_interpreter_metadata(tmp_path, monkeypatch):
+    make_pe_machine_exe(tmp_path / "pypy", 0x8664)
+    (tmp_path / "pypy" / "libpypy3.10-c.dll").touch()
+    make_python_exe(tmp_path / "venv" / "Scripts")
+    (tmp_path / "venv" / "pyvenv.cfg").touch()
+    monkeypatch.setattr(pb, "_execute", lambda *a, **k: "Python 3.10.12")
+
+    assert pb._probe_interpreter(tmp_path / "pypy") == (
+        {
+            "version": "3.10.12",
+            "architecture": "AMD64",
+            "implementation": "pypy",
+            "venv_base": True,
+        },
+        None,
+    )
+    metadata, _ = pb._probe_interpreter(tmp_path / "venv" / "Scripts")
+    assert metadata["implementation"] == "cpython"
+    assert metadata["venv_base"] is False
+
+
+def test_probe_interpreter_missing(tmp_path):
+    assert pb._probe_interpreter(tmp_path) == (None, None)
+
+
+def test_interpreter_cache_round_trip(tmp_path):
+    make_python_exe(tmp_path / "3.11")
+    fingerprint = pb._InterpreterCache.fingerprint(tmp_path / "3.11")
+    cache = pb._InterpreterCache(tmp_path / "cache.json")
+    cache.put(tmp_path / "3.11", fingerprint, {"version": "3.11.7"})
+    cache.save()
+
+    reloaded = pb._InterpreterCache(tmp_path / "cache.json")
+    assert reloaded.get(tmp_path / "3.11", fingerprint) == {"version": "3.11.7"}
+
+
+def test_interpreter_cache_misses_on_changed_fingerprint(tmp_path):
+    make_python_exe(tmp_path / "3.11")
+    fingerprint = pb._InterpreterCache.fingerprint(tmp_path / "3.11")
+    cache = pb._InterpreterCache(tmp_path / "cache.json")
+    cache.put(tmp_path / "3.11", fingerprint, {"version": "3.11.7"})
+
+    make_python_exe(tmp_path / "3.11", size=20)
+
+    changed = pb._InterpreterCache.fingerprint(tmp_path / "3.11")
+    assert changed != fingerprint
+    assert cache.get(tmp_path / "3.11", changed) is None
+
+
+def test_interpreter_cache_evicts_least_recently_used(tmp_path):
+    cache = pb._InterpreterCache(tmp_path / "cache.json", limit=2)
+    cache.put(tmp_path / "a", [1, 1, 1], {"version": "a"})
+    cache.put(tmp_path / "b", [2, 2, 2], {"version": "b"})
+    cache.get(tmp_path / "a", [1, 1, 1])
+    cache.put(tmp_path / "c", [3, 3, 3], {"version": "c"})
+
+    assert len(cache) == 2
+    assert cache.get(tmp_path / "b", [2, 2, 2]) is None
+    assert cache.get(tmp_path / "a", [1, 1, 1]) == {"version": "a"}
+
+
+def test_interpreter_cache_hits_do_not_rewrite_file(tmp_path, monkeypatch):
+    cache = pb._InterpreterCache(tmp_path / "cache.json")
+    cache.put(tmp_path / "a", [1, 1, 1], {"version": "a"})
+    cache.put(tmp_path / "b", [2, 2, 2], {"version": "b"})
+    cache.save()
+    write_atomic = mock.MagicMock()
+    monkeypatch.setattr(pb, "_write_atomic", write_atomic)
+
+    reloaded = pb._InterpreterCache(tmp_path / "cache.json")
+    assert reloaded.get(tmp_path / "a", [1, 1, 1]) == {"version": "a"}
+    reloaded.save()
+
+    write_atomic.assert_not_called()
+
+
+def test_interpreter_cache_ignores_unreadable_file(tmp_path):
+    (tmp_path / "cache.json").write_text("not json")
+    assert len(pb._InterpreterCache(tmp_path / "cache.json")) == 0
+
+
+# ---------------------------------------------------------------------------
+# _walk_installations / _discover_interpreters
+# ---------------------------------------------------------------------------
+
+
+def test_walk_installations_multiple_roots_and_depth(tmp_path):
+    make_python_exe(tmp_path / "a" / "3.11")
+    make_python_exe(tmp_path / "a" / "vendor" / "pypy" / "3.10")
+    (tmp_path / "a" / "empty").mkdir()
+    make_python_exe(tmp_path / "b" / "3.9")
+
+    roots = [tmp_path / "a", tmp_path / "b"]
+
+    assert list(pb._walk_installations(roots, 1)) == [
+        (tmp_path / "a" / "3.11", True),
+        (tmp_path / "a" / "empty", False),
+        (tmp_path / "a" / "vendor", False),
+        (tmp_path / "b" / "3.9", True),
+    ]
+    assert (tmp_path / "a" / "vendor" / "pypy" / "3.10", True) in list(
+        pb._walk_installations(roots, 3)
+    )
+
+
+def test_walk_installations_prunes(tmp_path):
+    make_python_exe(tmp_path / "3.11")
+    make_python_exe(tmp_path / "3.11" / "nested")
+    make_python_exe(tmp_path / "Lib" / "hidden")
+    make_python_exe(tmp_path / ".git" / "hidden")
+    make_python_exe(tmp_path / "envs" / "Scripts")
+
+    found = [path for path, is_install in pb._walk_installations([tmp_path], 5)]
+
+    assert found == [tmp_path / "3.11"]
+
+
+def test_walk_installations_is_lazy(tmp_path, monkeypatch):
+    make_python_exe(tmp_path / "3.10")
+    make_python_exe(tmp_path / "3.11")
+    scandir = mock.MagicMock(wraps=os.scandir)
+    monkeypatch.setattr(pb.os, "scandir", scandir)
+
+    walk = pb._walk_installations([tmp_path], 1)
+    assert next(walk) == (tmp_path / "3.10", True)
+    assert scandir.call_count == 2
+
+
+def test_walk_installations_ignores_missing_root(tmp_path):
+    assert list(pb._walk_installations([tmp_path / "missing"], 2)) == []
+
+
+def test_discover_interpreters_keeps_walk_order(tmp_path, monkeypatch):
+    monkeypatch.setattr(pb, "_probe_interpreter", lambda d: ({"version": d.name}, None))
+    found = [(tmp_path / "b", True), (tmp_path / "x", False), (tmp_path / "a", True)]
+
+    results = list(pb._discover_interpreters(found, jobs=2))
+
+    assert results == [
+        (tmp_path / "b", {"version": "b"}, None),
+        (tmp_path / "x", None, None),
+        (tmp_path / "a", {"version": "a"}, None),
+    ]
@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
+import os
 import shutil
+import time
 from pathlib import Path
 from unittest import mock
 
@@ -19,22 +21,26 @@ def runner() -> CliRunner:
 
 @pytest.fixture()
 def fake_registry(monkeypatch):
-    store: dict[str, dict[str, str]] = {"user": {}, "system": {"PATH": ""}}
+    store: dict[str, dict[str, str]] = {
+        "user": {},
+        "system": {"PATH": ""},
+        "pynball": {},
+    }
 
     def fake_getenv(scope, name):
-        if scope not in ("user", "system"):
+        if scope not in store:
             pb._feedback("Scope value must be 'user' or 'system'", "warning")
             return None
         return store[scope].get(name)
 
     def fake_setenv(scope, name, value):
-        if scope not in ("user", "system"):
+        if scope not in store:
             pb._feedback("Scope value must be 'user' or 'system'", "warning")
             return
         store[scope][name] = value
 
     def fake_delenv(scope, name):
-        if scope not in ("user", "system"):
+        if scope not in store:
             pb._feedback("Scope value must be 'user' or 'system'", "warning")
             return
         store[scope].pop(name, None)
@@ -60,7 +66,7 @@ def test_add_no_python_exe(runner, fake_registry, tmp_path):
     bad_path.mkdir()
     result = runner.invoke(pb.cli, ["add", "3.10", str(bad_path)])
     assert "no Python Interpreter" in result.output
-    assert pb._get_pynball("dict", "PYNBALL") is None
+    assert pb._get_registry("PYNBALL") is None
 
 
 def test_add_first_entry(runner, fake_registry, tmp_path):
@@ -68,7 +74,7 @@ def test_add_first_entry(runner, fake_registry, tmp_path):
     make_python_exe(path310)
     result = runner.invoke(pb.cli, ["add", "3.10", str(path310)])
     assert "Successfully added" in result.output
-    assert pb._get_pynball("dict", "PYNBALL") == {"3.10": str(path310)}
+    assert pb._get_registry("PYNBALL").to_dict() == {"3.10": str(path310)}
 
 
 def test_add_duplicate_path(runner, fake_registry, tmp_path):
@@ -79,6 +85,14 @@ def test_add_duplicate_path(runner, fake_registry, tmp_path):
     assert "already added to configuration as '3.10'" in result.output
 
 
+def test_add_duplicate_path_is_normalised(runner, fake_registry, tmp_path):
+    path310 = tmp_path / "py310"
+    make_python_exe(path310)
+    runner.invoke(pb.cli, ["add", "3.10", str(path310)])
+    result = runner.invoke(pb.cli, ["add", "3.10-again", str(path310) + os.sep])
+    assert "already added to configuration as '3.10'" in result.output
+
+
 def test_add_second_entry_sorts_versions(runner, fake_registry, tmp_path):
     path39 = tmp_path / "py39"
     make_python_exe(path39)
@@ -89,12 +103,21 @@ def test_add_second_entry_sorts_versions(runner, fake_registry, tmp_path):
     result = runner.invoke(pb.cli, ["add", "3.10", str(path310)])
 
     assert "Successfully added" in result.output
-    stored = pb._get_pynball("dict", "PYNBALL")
+    stored = pb._get_registry("PYNBALL").to_dict()
     assert stored == {"3.10": str(path310), "3.9": str(path39)}
     # sorted reverse numerically: 3.10 before 3.9
     assert list(stored.keys()) == ["3.10", "3.9"]
 
 
+def test_add_handles_non_numeric_names(runner, fake_registry, tmp_path):
+    for name in ("3.12.0", "pypy3.10", "3.13.0rc1"):
+        make_python_exe(tmp_path / name)
+        result = runner.invoke(pb.cli, ["add", name, str(tmp_path / name)])
+        assert "Successfully added" in result.output
+
+    assert pb._get_index("PYNBALL") == ["3.13.0rc1", "3.12.0", "pypy3.10"]
+
+
 # ---------------------------------------------------------------------------
 # addall
 # ---------------------------------------------------------------------------
@@ -113,11 +136,237 @@ def test_addall_uses_env_var(runner, fake_registry, tmp_path, monkeypatch):
     result = runner.invoke(pb.cli, ["addall"])
 
     assert result.exit_code == 0
-    stored = pb._get_pynball("dict", "PYNBALL")
+    stored = pb._get_registry("PYNBALL").to_dict()
     assert stored == {"3.10.1": str(v1)}
     assert fake_registry["user"]["PYNBALL_HOME"] == str(home)
 
 
+def test_addall_merges_in_one_sorted_write(
+    runner, fake_registry, tmp_path, monkeypatch
+):
+    home = tmp_path / "installs"
+    for ver in ("3.9.7", "3.11.2", "3.10.4"):
+        make_python_exe(home / ver)
+    (home / "docs").mkdir()
+    monkeypatch.setenv("PYNBALL_HOME", str(home))
+    monkeypatch.setattr(
+        pb, "_execute", lambda exe, *a, **k: f"Python {exe.parent.name}"
+    )
+    set_registry = mock.MagicMock(wraps=pb._set_registry)
+    monkeypatch.setattr(pb, "_set_registry", set_registry)
+
+    result = runner.invoke(pb.cli, ["addall"])
+
+    assert result.exit_code == 0
+    set_registry.assert_called_once()
+    assert pb._get_index("PYNBALL") == ["3.11.2", "3.10.4", "3.9.7"]
+    assert "Added: 3, Skipped: 1, Duplicated: 0" in result.output
+
+
+def test_addall_reports_duplicates(runner, fake_registry, tmp_path, monkeypatch):
+    home = tmp_path / "installs"
+    existing = home / "3.10.1"
+    make_python_exe(existing)
+    make_python_exe(home / "copy-of-3.10.1")
+    make_python_exe(home / "3.12.0")
+    pb._set_registry(pb.VersionRegistry({"3.10": existing}), "PYNBALL")
+    monkeypatch.setenv("PYNBALL_HOME", str(home))
+    monkeypatch.setattr(
+        pb, "_execute", lambda exe, *a, **k: f"Python {exe.parent.name[-6:]}"
+    )
+
+    result = runner.invoke(pb.cli, ["addall"])
+
+    assert result.exit_code == 0
+    assert "'3.10.1' already added to configuration as '3.10'" in result.output
+    assert "Added: 2, Skipped: 0, Duplicated: 1" in result.output
+    assert pb._get_registry("PYNBALL").to_dict() == {
+        "3.12.0": str(home / "3.12.0"),
+        "3.10.1": str(home / "copy-of-3.10.1"),
+        "3.10": str(existing),
+    }
+
+
+def test_addall_probe_failure_does_not_stop_others(
+    runner, fake_registry, tmp_path, monkeypatch
+):
+    home = tmp_path / "installs"
+    for ver in ("3.9.7", "3.10.4", "3.11.2"):
+        make_python_exe(home / ver)
+
+    def execute(exe, *a, **k):
+        if exe.parent.name == "3.10.4":
+            raise Exception("access denied")
+        return f"Python {exe.parent.name}"
+
+    monkeypatch.setenv("PYNBALL_HOME", str(home))
+    monkeypatch.setattr(pb, "_execute", execute)
+
+    result = runner.invoke(pb.cli, ["addall"])
+
+    assert result.exit_code == 0
+    assert f"Could not probe '{home / '3.10.4'}'" in result.output
+    assert "access denied" in result.output
+    assert pb._get_index("PYNBALL") == ["3.11.2", "3.9.7"]
+    assert "Added: 2, Skipped: 1, Duplicated: 0" in result.output
+
+
+def test_addall_output_order_is_deterministic(
+    runner, fake_registry, tmp_path, monkeypatch
+):
+    home = tmp_path / "installs"
+    versions = ["3.8.1", "3.9.7", "3.10.4", "3.11.2"]
+    for ver in versions:
+        make_python_exe(home / ver)
+
+    def execute(exe, *a, **k):
+        # the first directories finish last
+        time.sleep(0.05 * (len(versions) - sorted(versions).index(exe.parent.name)))
+        return f"Python {exe.parent.name}"
+
+    monkeypatch.setenv("PYNBALL_HOME", str(home))
+    monkeypatch.setattr(pb, "_execute", execute)
+
+    result = runner.invoke(pb.cli, ["addall", "--jobs", "4"])
+
+    assert result.exit_code == 0
+    added = [line for line in result.output.splitlines() if "added" in line]
+    assert added == [
+        f"'{ver}' Successfully added to configuration" for ver in sorted(versions)
+    ]
+
+
+def test_addall_uses_metadata_cache(runner, fake_registry, tmp_path, monkeypatch):
+    home = tmp_path / "installs"
+    make_python_exe(home / "3.10.4")
+    monkeypatch.setenv("PYNBALL_HOME", str(home))
+    execute = mock.MagicMock(return_value="Python 3.10.4")
+    monkeypatch.setattr(pb, "_execute", execute)
+
+    runner.invoke(pb.cli, ["addall"])
+    runner.invoke(pb.cli, ["addall"])
+    assert execute.call_count == 1
+
+    result = runner.invoke(pb.cli, ["addall", "--refresh"])
+    assert execute.call_count == 2
+    assert "Added: 0, Skipped: 0, Duplicated: 1" in result.output
+
+
+def test_addall_reprobes_changed_interpreter(
+    runner, fake_registry, tmp_path, monkeypatch
+):
+    home = tmp_path / "installs"
+    make_python_exe(home / "3.10")
+    monkeypatch.setenv("PYNBALL_HOME", str(home))
+    monkeypatch.setattr(pb, "_execute", lambda *a, **k: "Python 3.10.4")
+    runner.invoke(pb.cli, ["addall"])
+
+    make_python_exe(home / "3.10", size=20)
+    monkeypatch.setattr(pb, "_execute", lambda *a, **k: "Python 3.10.5")
+    result = runner.invoke(pb.cli, ["addall"])
+
+    assert "'3.10.5' already added to configuration as '3.10.4'" in result.output
+
+
+def test_addall_searches_roots_to_depth(runner, fake_registry, tmp_path, monkeypatch):
+    first = tmp_path / "first"
+    second = tmp_path / "second"
+    make_python_exe(first / "3.10.4")
+    make_python_exe(second / "cpython" / "3.11.2")
+    monkeypatch.setattr(
+        pb, "_execute", lambda exe, *a, **k: f"Python {exe.parent.name}"
+    )
+
+    result = runner.invoke(
+        pb.cli, ["addall", "-r", str(first), "-r", str(second), "--depth", "2"]
+    )
+
+    assert result.exit_code == 0
+    assert pb._get_index("PYNBALL") == ["3.11.2", "3.10.4"]
+    assert fake_registry["user"]["PYNBALL_HOME"] == os.pathsep.join(
+        [str(first), str(second)]
+    )
+
+
+def test_addall_splits_pynball_home(runner, fake_registry, tmp_path, monkeypatch):
+    make_python_exe(tmp_path / "first" / "3.10.4")
+    make_python_exe(tmp_path / "second" / "3.11.2")
+    roots = os.pathsep.join([str(tmp_path / "first"), str(tmp_path / "second")])
+    monkeypatch.setenv("PYNBALL_HOME", roots)
+    monkeypatch.setattr(
+        pb, "_execute", lambda exe, *a, **k: f"Python {exe.parent.name}"
+    )
+
+    result = runner.invoke(pb.cli, ["addall"])
+
+    assert "Added: 2, Skipped: 0, Duplicated: 0" in result.output
+
+
+@pytest.mark.parametrize("use_option", [True, False])
+def test_addall_stores_absolute_roots(
+    runner, fake_registry, tmp_path, monkeypatch, use_option
+):
+    make_python_exe(tmp_path / "home" / "3.13.0")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("PYNBALL_HOME", "home")
+    monkeypatch.setattr(
+        pb, "_execute", lambda exe, *a, **k: f"Python {exe.parent.name}"
+    )
+
+    args = ["addall", "-r", "home"] if use_option else ["addall"]
+    result = runner.invoke(pb.cli, args)
+
+    assert result.exit_code == 0, result.output
+    home = (tmp_path / "home").resolve()
+    assert pb._get_registry("PYNBALL").to_dict() == {"3.13.0": str(home / "3.13.0")}
+    assert fake_registry["user"]["PYNBALL_HOME"] == str(home)
+
+
+def test_addall_keeps_release_candidate_apart(
+    runner, fake_registry, tmp_path, monkeypatch
+):
+    for name, version in (("final", "3.13.0"), ("candidate", "3.13.0rc1")):
+        make_python_exe(tmp_path / name)
+        header = tmp_path / name / "include" / "patchlevel.h"
+        header.parent.mkdir()
+        header.write_text(f'#define PY_VERSION "{version}"\n')
+    execute = mock.MagicMock()
+    monkeypatch.setattr(pb, "_execute", execute)
+
+    result = runner.invoke(pb.cli, ["addall", "-r", str(tmp_path)])
+
+    assert "Added: 2, Skipped: 0, Duplicated: 0" in result.output
+    assert pb._get_registry("PYNBALL").names() == ["3.13.0", "3.13.0rc1"]
+    execute.assert_not_called()
+
+
+def test_addall_fail_fast_cancels_remaining_probes(
+    runner, fake_registry, tmp_path, monkeypatch
+):
+    home = tmp_path / "installs"
+    for ver in ("3.10.4", "3.11.2", "3.9.7"):
+        make_python_exe(home / ver)
+
+    def execute(exe, *a, **k):
+        raise Exception("access denied")
+
+    monkeypatch.setenv("PYNBALL_HOME", str(home))
+    monkeypatch.setattr(pb, "_execute", execute)
+
+    result = runner.invoke(pb.cli, ["--jobs", "1", "--fail-fast", "addall"])
+
+    assert result.exit_code == 0
+    assert result.output.count("access denied") == 1
+    assert result.output.count("cancelled") == 2
+    assert "Added: 0, Skipped: 3, Duplicated: 0" in result.output
+
+
+def test_addall_rejects_zero_jobs(runner, fake_registry):
+    result = runner.invoke(pb.cli, ["addall", "--jobs", "0"])
+
+    assert result.exit_code != 0
+
+
 def test_addall_no_active_dirs_skips_pynball_home_write(
     runner, fake_registry, tmp_path, monkeypatch
 ):
@@ -162,7 +411,7 @@ def test_addall_prompts_until_valid_path(
     result = runner.invoke(pb.cli, ["addall"])
 
     assert result.exit_code == 0
-    assert pb._get_pynball("dict", "PYNBALL") == {"3.11.0": str(v1)}
+    assert pb._get_registry("PYNBALL").to_dict() == {"3.11.0": str(v1)}
 
 
 # ---------------------------------------------------------------------------
@@ -178,7 +427,22 @@ def test_delete_removes_entry(runner, fake_registry, tmp_path):
     result = runner.invoke(pb.cli, ["delete", "3.10"])
 
     assert result.exit_code == 0
-    assert pb._get_pynball("dict", "PYNBALL") == {}
+    assert pb._get_registry("PYNBALL").to_dict() == {}
+
+
+def test_delete_unknown_name_does_not_write(
+    runner, fake_registry, tmp_path, monkeypatch
+):
+    path310 = tmp_path / "py310"
+    make_python_exe(path310)
+    runner.invoke(pb.cli, ["add", "3.10", str(path310)])
+    set_registry = mock.MagicMock()
+    monkeypatch.setattr(pb, "_set_registry", set_registry)
+
+    result = runner.invoke(pb.cli, ["delete", "3.99"])
+
+    assert "3.99 is not in Pynballs' configuration" in result.output
+    set_registry.assert_not_called()
 
 
 def test_delete_refuses_system_interpreter(runner, fake_registry, tmp_path):
@@ -190,7 +454,7 @@ def test_delete_refuses_system_interpreter(runner, fake_registry, tmp_path):
     result = runner.invoke(pb.cli, ["delete", "3.10"])
 
     assert "Cannot delete System Interpreter" in result.output
-    assert pb._get_pynball("dict", "PYNBALL") == {"3.10": str(path310)}
+    assert pb._get_registry("PYNBALL").to_dict() == {"3.10": str(path310)}
 
 
 # ---------------------------------------------------------------------------
@@ -207,6 +471,7 @@ def test_reset(runner, fake_registry, tmp_path):
 
     assert result.exit_code == 0
     assert "PYNBALL" not in fake_registry["user"]
+    assert fake_registry["pynball"] == {}
 
 
 # ---------------------------------------------------------------------------
@@ -238,7 +503,7 @@ def test_versions_system_not_in_pynball_config(runner, fake_registry, tmp_path):
 
     other_path = tmp_path / "other"
     make_python_exe(other_path)
-    pb._set_pynball({"3.9": other_path}, "PYNBALL")
+    pb._set_registry(pb.VersionRegistry({"3.9": other_path}), "PYNBALL")
 
     result = runner.invoke(pb.cli, ["versions"])
 
@@ -250,7 +515,7 @@ def test_versions_system_matches_pynball_entry(runner, fake_registry, tmp_path):
     sys_path = tmp_path / "sysinterp"
     make_python_exe(sys_path)
     fake_registry["system"]["PATH"] = str(sys_path)
-    pb._set_pynball({"3.11": sys_path}, "PYNBALL")
+    pb._set_registry(pb.VersionRegistry({"3.11": sys_path}), "PYNBALL")
 
     result = runner.invoke(pb.cli, ["versions"])
 
@@ -266,7 +531,7 @@ def test_versions_system_matches_pynball_entry(runner, fake_registry, tmp_path):
 def test_system_name_not_configured(runner, fake_registry, tmp_path):
     other_path = tmp_path / "other"
     make_python_exe(other_path)
-    pb._set_pynball({"3.10": other_path}, "PYNBALL")
+    pb._set_registry(pb.VersionRegistry({"3.10": other_path}), "PYNBALL")
 
     result = runner.invoke(pb.cli, ["system", "3.99"])
     assert "is not in Pynballs' configuration" in result.output
@@ -278,7 +543,7 @@ def test_system_multiple_interpreters_detected(runner, fake_registry, tmp_path):
     p2 = tmp_path / "py2"
     make_python_exe(p2)
     fake_registry["system"]["PATH"] = ";".join([str(p1), str(p2)])
-    pb._set_pynball({"3.10": p1, "3.11": p2}, "PYNBALL")
+    pb._set_registry(pb.VersionRegistry({"3.10": p1, "3.11": p2}), "PYNBALL")
 
     result = runner.invoke(pb.cli, ["system", "3.10"])
 
@@ -289,7 +554,7 @@ def test_system_already_configured(runner, fake_registry, tmp_path):
     p1 = tmp_path / "py1"
     make_python_exe(p1)
     fake_registry["system"]["PATH"] = str(p1)
-    pb._set_pynball({"3.10": p1}, "PYNBALL")
+    pb._set_registry(pb.VersionRegistry({"3.10": p1}), "PYNBALL")
 
     result = runner.invoke(pb.cli, ["system", "3.10"])
 
@@ -303,7 +568,7 @@ def test_system_switch_from_existing(runner, fake_registry, tmp_path):
     make_python_exe(new_path)
 
     fake_registry["system"]["PATH"] = f"{old_path};C:\\Windows"
-    pb._set_pynball({"old": old_path, "new": new_path}, "PYNBALL")
+    pb._set_registry(pb.VersionRegistry({"old": old_path, "new": new_path}), "PYNBALL")
 
     # Only "old" is currently on PATH so only "old" resolves as system version.
     result = runner.invoke(pb.cli, ["system", "new"])
@@ -317,7 +582,7 @@ def test_system_no_existing_interpreter_prepends(runner, fake_registry, tmp_path
     new_path = tmp_path / "new"
     make_python_exe(new_path)
     fake_registry["system"]["PATH"] = "C:\\Windows"
-    pb._set_pynball({"new": new_path}, "PYNBALL")
+    pb._set_registry(pb.VersionRegistry({"new": new_path}), "PYNBALL")
 
     result = runner.invoke(pb.cli, ["system", "new"])
 
@@ -325,6 +590,81 @@ def test_system_no_existing_interpreter_prepends(runner, fake_registry, tmp_path
     assert fake_registry["system"]["PATH"].startswith(str(new_path))
 
 
+# ---------------------------------------------------------------------------
+# which
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture()
+def configured_versions(fake_registry, tmp_path):
+    paths = {
+        name: tmp_path / name
+        for name in ("3.10.11", "3.11.4", "3.11.9", "3.12.2", "pypy3.10", "work")
+    }
+    pb._set_registry(pb.VersionRegistry(paths), "PYNBALL")
+    return paths
+
+
+@pytest.mark.parametrize(
+    "spec, expected",
+    [
+        ("3.11", "3.11.9"),
+        ("3", "3.12.2"),
+        (">=3.10,<3.12", "3.11.9"),
+        ("<3.11", "3.10.11"),
+        ("==3.11.4", "3.11.4"),
+        ("~=3.11.0", "3.11.9"),
+        ("pypy3", "pypy3.10"),
+        ("work", "work"),
+    ],
+)
+def test_which_resolves_spec(runner, configured_versions, spec, expected):
+    result = runner.invoke(pb.cli, ["which", spec])
+
+    assert result.exit_code == 0
+    assert result.output == f"{configured_versions[expected]}\n"
+
+
+def test_which_avoids_path_scan_and_subprocesses(
+    runner, configured_versions, monkeypatch
+):
+    def forbidden(*args, **kwargs):
+        raise AssertionError("not allowed")
+
+    monkeypatch.setattr(pb, "_get_system_interpreters", forbidden)
+    monkeypatch.setattr(pb, "_execute", forbidden)
+    monkeypatch.setattr(pb.subprocess, "Popen", forbidden)
+
+    result = runner.invoke(pb.cli, ["which", "3.11"])
+
+    assert result.exit_code == 0
+
+
+@pytest.mark.parametrize("spec", ["3.11", "python3.11", "cpython3.11"])
+def test_which_matches_python_prefixed_names(runner, fake_registry, tmp_path, spec):
+    versions = {"python3.11": tmp_path / "py311", "3.11-arm64": tmp_path / "arm"}
+    pb._set_registry(pb.VersionRegistry(versions), "PYNBALL")
+
+    result = runner.invoke(pb.cli, ["which", spec])
+
+    assert result.exit_code == 0
+    assert result.output == f"{tmp_path / 'py311'}\n"
+
+
+def test_which_no_match(runner, configured_versions):
+    result = runner.invoke(pb.cli, ["which", "3.9"])
+
+    assert result.exit_code == 1
+    assert "No configured installation matches '3.9'" in result.output
+
+
+def test_which_invalid_spec(runner, configured_versions):
+    result = runner.invoke(pb.cli, ["which", ">=three"])
+
+    assert result.exit_code == 1
+    assert "not a valid version specifier" in result.output
+
+
 # ---------------------------------------------------------------------------
 # pyenv
 # ---------------------------------------------------------------------------
@@ -344,12 +684,12 @@ def test_pyenv_use_adds_new_versions(runner, fake_registry, tmp_path, monkeypatc
 
     unrelated_path = tmp_path / "unrelated"
     make_python_exe(unrelated_path)
-    pb._set_pynball({"3.5": unrelated_path}, "PYNBALL")
+    pb._set_registry(pb.VersionRegistry({"3.5": unrelated_path}), "PYNBALL")
 
     result = runner.invoke(pb.cli, ["pyenv", "-u"])
 
     assert result.exit_code == 0
-    assert set(pb._get_pynball("names", "PYNBALL")) == {"3.5", "3.12.0"}
+    assert set(pb._get_index("PYNBALL")) == {"3.5", "3.12.0"}
 
 
 def test_pyenv_use_skips_system_version(runner, fake_registry, tmp_path, monkeypatch):
@@ -359,13 +699,13 @@ def test_pyenv_use_skips_system_version(runner, fake_registry, tmp_path, monkeyp
     make_python_exe(sysver_dir)
     monkeypatch.setattr(pb, "_PYENV_HOME", pyenv_home)
     fake_registry["system"]["PATH"] = str(sysver_dir)
-    pb._set_pynball({"3.12.0": sysver_dir}, "PYNBALL")
+    pb._set_registry(pb.VersionRegistry({"3.12.0": sysver_dir}), "PYNBALL")
 
     result = runner.invoke(pb.cli, ["pyenv", "-u"])
 
     assert result.exit_code == 0
     # Still just the one, untouched, entry - not duplicated / errored.
-    assert pb._get_pynball("names", "PYNBALL") == ["3.12.0"]
+    assert pb._get_index("PYNBALL") == ["3.12.0"]
 
 
 def test_pyenv_use_noforce_keeps_manual_entry(
@@ -378,12 +718,12 @@ def test_pyenv_use_noforce_keeps_manual_entry(
 
     manual_path = tmp_path / "manual312"
     make_python_exe(manual_path)
-    pb._set_pynball({"3.12.0": manual_path}, "PYNBALL")
+    pb._set_registry(pb.VersionRegistry({"3.12.0": manual_path}), "PYNBALL")
 
     result = runner.invoke(pb.cli, ["pyenv", "-u", "--noforce"])
 
     assert result.exit_code == 0
-    assert pb._get_pynball("dict", "PYNBALL") == {"3.12.0": str(manual_path)}
+    assert pb._get_registry("PYNBALL").to_dict() == {"3.12.0": str(manual_path)}
 
 
 def test_pyenv_use_force_overrides_manual_entry(
@@ -397,12 +737,77 @@ def test_pyenv_use_force_overrides_manual_entry(
 
     manual_path = tmp_path / "manual312"
     make_python_exe(manual_path)
-    pb._set_pynball({"3.12.0": manual_path}, "PYNBALL")
+    pb._set_registry(pb.VersionRegistry({"3.12.0": manual_path}), "PYNBALL")
 
     result = runner.invoke(pb.cli, ["pyenv", "-u", "-f"])
 
     assert result.exit_code == 0
-    assert pb._get_pynball("dict", "PYNBALL") == {"3.12.0": str(pyenv_path)}
+    assert pb._get_registry("PYNBALL").to_dict() == {"3.12.0": str(pyenv_path)}
+
+
+def test_pyenv_use_applies_diff_in_one_write(
+    runner, fake_registry, tmp_path, monkeypatch
+):
+    pyenv_home = tmp_path / "pyenv"
+    versions_dir = pyenv_home / "versions"
+    for minor in range(40):
+        make_python_exe(versions_dir / f"3.{minor}.0")
+    monkeypatch.setattr(pb, "_PYENV_HOME", pyenv_home)
+    pb._set_registry(pb.VersionRegistry({"3.0.0": versions_dir / "3.0.0"}), "PYNBALL")
+    set_registry = mock.MagicMock(wraps=pb._set_registry)
+    monkeypatch.setattr(pb, "_set_registry", set_registry)
+
+    result = runner.invoke(pb.cli, ["pyenv", "-u"])
+
+    assert result.exit_code == 0
+    set_registry.assert_called_once()
+    assert len(pb._get_index("PYNBALL")) == 40
+    assert result.output.count("Successfully added") == 39
+    assert "'3.0.0'" not in result.output
+
+
+def test_pyenv_use_prints_only_delta(runner, fake_registry, tmp_path, monkeypatch):
+    pyenv_home = tmp_path / "pyenv"
+    versions_dir = pyenv_home / "versions"
+    make_python_exe(versions_dir / "3.12.0")
+    make_python_exe(versions_dir / "3.11.0")
+    (versions_dir / "3.10.0").mkdir()
+    monkeypatch.setattr(pb, "_PYENV_HOME", pyenv_home)
+    manual_path = tmp_path / "manual312"
+    make_python_exe(manual_path)
+    versions = {"3.12.0": manual_path, "3.11": versions_dir / "3.11.0"}
+    pb._set_registry(pb.VersionRegistry(versions), "PYNBALL")
+
+    result = runner.invoke(pb.cli, ["pyenv", "-u", "-f"])
+
+    assert result.output.splitlines() == [
+        f"'3.12.0' now points to '{versions_dir / '3.12.0'}'",
+        "WARNING: '3.11.0' already added to configuration as '3.11'",
+        f"WARNING: There is no Python Interpreter in '{versions_dir / '3.10.0'}'",
+    ]
+
+    result = runner.invoke(pb.cli, ["pyenv", "-u", "-f"])
+
+    assert "now points to" not in result.output
+
+
+def test_pyenv_default_removes_entries_by_path(
+    runner, fake_registry, tmp_path, monkeypatch
+):
+    pyenv_home = tmp_path / "pyenv"
+    versions_dir = pyenv_home / "versions"
+    make_python_exe(versions_dir / "3.12.0")
+    monkeypatch.setattr(pb, "_PYENV_HOME", pyenv_home)
+    pb._set_registry(pb.VersionRegistry({"3.12": versions_dir / "3.12.0"}), "PYNBALL")
+
+    result = runner.invoke(pb.cli, ["pyenv"])
+
+    assert result.output.splitlines() == ["'3.12' removed from configuration"]
+    assert pb._get_registry("PYNBALL").to_dict() == {}
+
+    result = runner.invoke(pb.cli, ["pyenv"])
+
+    assert "already in sync with pyenv" in result.output
 
 
 def test_pyenv_default_removes_matching_entries(
@@ -413,12 +818,12 @@ def test_pyenv_default_removes_matching_entries(
     pyenv_path = versions_dir / "3.12.0"
     make_python_exe(pyenv_path)
     monkeypatch.setattr(pb, "_PYENV_HOME", pyenv_home)
-    pb._set_pynball({"3.12.0": pyenv_path}, "PYNBALL")
+    pb._set_registry(pb.VersionRegistry({"3.12.0": pyenv_path}), "PYNBALL")
 
     result = runner.invoke(pb.cli, ["pyenv"])
 
     assert result.exit_code == 0
-    assert pb._get_pynball("dict", "PYNBALL") == {}
+    assert pb._get_registry("PYNBALL").to_dict() == {}
 
 
 def test_pyenv_default_skips_system_version(
@@ -430,13 +835,13 @@ def test_pyenv_default_skips_system_version(
     make_python_exe(pyenv_path)
     monkeypatch.setattr(pb, "_PYENV_HOME", pyenv_home)
     fake_registry["system"]["PATH"] = str(pyenv_path)
-    pb._set_pynball({"3.12.0": pyenv_path}, "PYNBALL")
+    pb._set_registry(pb.VersionRegistry({"3.12.0": pyenv_path}), "PYNBALL")
 
     result = runner.invoke(pb.cli, ["pyenv"])
 
     assert result.exit_code == 0
     # system version must survive the "prune" pass
-    assert pb._get_pynball("dict", "PYNBALL") == {"3.12.0": str(pyenv_path)}
+    assert pb._get_registry("PYNBALL").to_dict() == {"3.12.0": str(pyenv_path)}
 
 
 def test_pyenv_default_no_matching_paths_noop(
@@ -449,9 +854,9 @@ def test_pyenv_default_no_matching_paths_noop(
 
     unrelated_path = tmp_path / "unrelated"
     make_python_exe(unrelated_path)
-    pb._set_pynball({"3.5": unrelated_path}, "PYNBALL")
+    pb._set_registry(pb.VersionRegistry({"3.5": unrelated_path}), "PYNBALL")
 
     result = runner.invoke(pb.cli, ["pyenv"])
 
     assert result.exit_code == 0
-    assert pb._get_pynball("dict", "PYNBALL") == {"3.5": str(unrelated_path)}
+    assert pb._get_registry("PYNBALL").to_dict() == {"3.5": str(unrelated_path)}
@@ -52,3 +52,30 @@ def test_platform_guard_exits_on_non_windows():
     assert result.returncode == 1
     assert "not supported" in result.stdout
 
+
+
+def test_platform_guard_allows_file_store(tmp_path):
+    script = textwrap.dedent(
+        """
+        import sys
+
+        sys.platform = "linux"
+
+        from pynball import pynball
+
+        print(type(pynball._get_store()).__name__)
+        """
+    )
+    import os
+
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(sys.path)
+    env["PYNBALL_STORE"] = str(tmp_path / "pynball.json")
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "_FileStore"
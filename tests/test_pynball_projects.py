@@ -2,8 +2,13 @@
 
 from __future__ import annotations
 
+import os
 import shutil
+import sys
+import time
+import types
 from pathlib import Path
+from unittest import mock
 
 import pytest
 from click.testing import CliRunner
@@ -18,22 +23,26 @@ def runner() -> CliRunner:
 
 @pytest.fixture()
 def fake_registry(monkeypatch):
-    store: dict[str, dict[str, str]] = {"user": {}, "system": {"PATH": ""}}
+    store: dict[str, dict[str, str]] = {
+        "user": {},
+        "system": {"PATH": ""},
+        "pynball": {},
+    }
 
     def fake_getenv(scope, name):
-        if scope not in ("user", "system"):
+        if scope not in store:
             pb._feedback("Scope value must be 'user' or 'system'", "warning")
             return None
         return store[scope].get(name)
 
     def fake_setenv(scope, name, value):
-        if scope not in ("user", "system"):
+        if scope not in store:
             pb._feedback("Scope value must be 'user' or 'system'", "warning")
             return
         store[scope][name] = value
 
     def fake_delenv(scope, name):
-        if scope not in ("user", "system"):
+        if scope not in store:
             pb._feedback("Scope value must be 'user' or 'system'", "warning")
             return
         store[scope].pop(name, None)
@@ -86,7 +95,7 @@ def test_mkproject_not_configured(runner, monkeypatch):
 
 def test_mkproject_version_not_configured(runner, fake_registry, venv_dirs, tmp_path):
     other_path = tmp_path / "other"
-    pb._set_pynball({"3.9": other_path}, "PYNBALL")
+    pb._set_registry(pb.VersionRegistry({"3.9": other_path}), "PYNBALL")
     result = runner.invoke(pb.cli, ["mkproject", "3.10", "myproj"])
     assert "not configured in Pynball" in result.output
 
@@ -96,7 +105,7 @@ def test_mkproject_success_creates_both_dirs(
 ):
     workon, project = venv_dirs
     py_path = tmp_path / "py310"
-    pb._set_pynball({"3.10": py_path}, "PYNBALL")
+    pb._set_registry(pb.VersionRegistry({"3.10": py_path}), "PYNBALL")
     monkeypatch.setattr(pb, "_execute", lambda *a, **k: "ok")
 
     result = runner.invoke(pb.cli, ["mkproject", "3.10", "myproj"])
@@ -112,7 +121,7 @@ def test_mkproject_noall_skips_project_dir(
 ):
     workon, project = venv_dirs
     py_path = tmp_path / "py310"
-    pb._set_pynball({"3.10": py_path}, "PYNBALL")
+    pb._set_registry(pb.VersionRegistry({"3.10": py_path}), "PYNBALL")
     monkeypatch.setattr(pb, "_execute", lambda *a, **k: "ok")
 
     result = runner.invoke(pb.cli, ["mkproject", "-n", "3.10", "myproj"])
@@ -128,7 +137,7 @@ def test_mkproject_file_exists_error(
     workon, project = venv_dirs
     (workon / "myproj").mkdir()
     py_path = tmp_path / "py310"
-    pb._set_pynball({"3.10": py_path}, "PYNBALL")
+    pb._set_registry(pb.VersionRegistry({"3.10": py_path}), "PYNBALL")
 
     result = runner.invoke(pb.cli, ["mkproject", "3.10", "myproj"])
 
@@ -147,13 +156,1105 @@ def test_mkproject_file_not_found_error(
     monkeypatch.setattr(pb, "_WORKON_HOME", workon)
     monkeypatch.setattr(pb, "_PROJECT_HOME", project)
     py_path = tmp_path / "py310"
-    pb._set_pynball({"3.10": py_path}, "PYNBALL")
+    pb._set_registry(pb.VersionRegistry({"3.10": py_path}), "PYNBALL")
 
     result = runner.invoke(pb.cli, ["mkproject", "3.10", "myproj"])
 
     assert "has NOT be created" in result.output
 
 
+# ---------------------------------------------------------------------------
+# _create_venv
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture()
+def no_virtualenv(monkeypatch):
+    find_spec = pb.importlib.util.find_spec
+    monkeypatch.setattr(
+        pb.importlib.util,
+        "find_spec",
+        lambda name, *a: None if name == "virtualenv" else find_spec(name, *a),
+    )
+
+
+@pytest.fixture()
+def fake_virtualenv(monkeypatch):
+    module = types.ModuleType("virtualenv")
+    module.cli_run = mock.MagicMock()
+    monkeypatch.setitem(sys.modules, "virtualenv", module)
+    monkeypatch.setattr(pb.importlib.util, "find_spec", lambda name, *a: object())
+    return module
+
+
+def test_venv_backend_missing_interpreter(tmp_path):
+    assert pb._venv_backend(tmp_path / "python.exe") == "subprocess"
+
+
+def test_venv_backend_running_interpreter(no_virtualenv):
+    assert pb._venv_backend(Path(sys.executable)) == "venv"
+
+
+def test_venv_backend_other_interpreter(no_virtualenv, tmp_path):
+    make_python_exe(tmp_path)
+    assert pb._venv_backend(tmp_path / "python.exe") == "subprocess"
+
+
+def test_venv_backend_prefers_virtualenv_api(fake_virtualenv, tmp_path):
+    make_python_exe(tmp_path)
+    assert pb._venv_backend(tmp_path / "python.exe") == "virtualenv-api"
+
+
+def test_create_venv_in_process_with_stdlib(no_virtualenv, tmp_path, monkeypatch):
+    env_builder = pb.venv.EnvBuilder
+    monkeypatch.setattr(
+        pb.venv, "EnvBuilder", lambda **kw: env_builder(**{**kw, "with_pip": False})
+    )
+    execute = mock.MagicMock()
+    monkeypatch.setattr(pb, "_execute", execute)
+
+    backend = pb._create_venv(Path(sys.executable), tmp_path / "env")
+
+    assert backend == "venv"
+    assert (tmp_path / "env" / "pyvenv.cfg").is_file()
+    execute.assert_not_called()
+
+
+def test_create_venv_with_virtualenv_api(fake_virtualenv, tmp_path, monkeypatch):
+    make_python_exe(tmp_path)
+    execute = mock.MagicMock()
+    monkeypatch.setattr(pb, "_execute", execute)
+
+    backend = pb._create_venv(tmp_path / "python.exe", tmp_path / "env")
+
+    assert backend == "virtualenv-api"
+    fake_virtualenv.cli_run.assert_called_once_with(
+        [str(tmp_path / "env"), f"-p={tmp_path / 'python.exe'}"], setup_logging=False
+    )
+    execute.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "which, expected",
+    [
+        ("/bin/virtualenv", ("virtualenv", "-p={exe}", "{env}")),
+        (None, ("{exe}", "-m", "venv", "{env}")),
+    ],
+)
+def test_create_venv_falls_back_to_subprocess(
+    fake_virtualenv, tmp_path, monkeypatch, which, expected
+):
+    make_python_exe(tmp_path)
+    exe, env = tmp_path / "python.exe", tmp_path / "env"
+    fake_virtualenv.cli_run.side_effect = RuntimeError("cannot seed")
+    monkeypatch.setattr(pb.shutil, "which", lambda name: which)
+    execute = mock.MagicMock()
+    monkeypatch.setattr(pb, "_execute", execute)
+
+    backend = pb._create_venv(exe, env)
+
+    assert backend == "subprocess"
+    args = execute.call_args.args
+    assert [str(arg) for arg in args] == [
+        part.format(exe=exe, env=env) for part in expected
+    ]
+
+
+# ---------------------------------------------------------------------------
+# golden templates
+# ---------------------------------------------------------------------------
+
+
+def fake_create_venv(python_path, venv_path, backend=""):
+    """Writes the files of a minimal virtual environment."""
+    scripts = venv_path / "Scripts"
+    scripts.mkdir(parents=True, exist_ok=True)
+    (venv_path / "pyvenv.cfg").write_text(
+        f"home = {python_path.parent}\ncommand = python -m venv {venv_path}\n"
+    )
+    (scripts / "activate").write_text(
+        f'VIRTUAL_ENV="{venv_path}"\nPS1="({venv_path.name}) ${{PS1:-}}"\n'
+    )
+    (venv_path / "Lib").mkdir(exist_ok=True)
+    (venv_path / "Lib" / "module.py").write_text("value = 1\n")
+    return "venv"
+
+
+@pytest.fixture()
+def counted_create_venv(monkeypatch):
+    create = mock.MagicMock(side_effect=fake_create_venv)
+    monkeypatch.setattr(pb, "_create_venv", create)
+    return create
+
+
+def test_clone_tree_prefers_cheapest_method(tmp_path, monkeypatch):
+    source, target = tmp_path / "source", tmp_path / "target"
+    (source / "sub").mkdir(parents=True)
+    (source / "sub" / "file.txt").write_text("data")
+    (source / pb._TEMPLATE_MARKER).write_text("python")
+
+    def no_reflink(src, dst):
+        raise OSError("not supported")
+
+    monkeypatch.setattr(pb, "_reflink", no_reflink)
+
+    assert pb._clone_tree(source, target) == "hardlink"
+    assert (target / "sub" / "file.txt").read_text() == "data"
+    assert os.path.samefile(target / "sub" / "file.txt", source / "sub" / "file.txt")
+    assert not (target / pb._TEMPLATE_MARKER).exists()
+
+
+def test_clone_tree_falls_back_to_copy(tmp_path, monkeypatch):
+    source, target = tmp_path / "source", tmp_path / "target"
+    source.mkdir()
+    (source / "a.txt").write_text("a")
+    (source / "b.txt").write_text("b")
+    link = mock.MagicMock(side_effect=OSError("cross-device link"))
+    monkeypatch.setattr(pb.os, "link", link)
+
+    assert pb._clone_tree(source, target, ("hardlink",)) == "copy"
+    assert (target / "a.txt").read_text() == "a"
+    assert (target / "b.txt").read_text() == "b"
+    assert not os.path.samefile(target / "a.txt", source / "a.txt")
+    link.assert_called_once()
+
+
+@pytest.mark.skipif(os.name == "nt", reason="needs symlink privileges on Windows")
+def test_clone_tree_recreates_symlinks(tmp_path):
+    source, target = tmp_path / "source", tmp_path / "target"
+    (source / "lib").mkdir(parents=True)
+    (source / "lib64").symlink_to("lib")
+
+    pb._clone_tree(source, target)
+
+    assert os.readlink(target / "lib64") == "lib"
+
+
+def test_patch_venv_leaves_template_untouched(tmp_path):
+    template, clone = tmp_path / "3.10", tmp_path / "myproj"
+    fake_create_venv(tmp_path / "py310" / "python.exe", template)
+    pb._clone_tree(template, clone, ("hardlink",))
+
+    pb._patch_venv(clone, template)
+
+    activate = (clone / "Scripts" / "activate").read_text()
+    assert f'VIRTUAL_ENV="{clone}"' in activate
+    assert "(myproj) " in activate
+    assert f"-m venv {clone}" in (clone / "pyvenv.cfg").read_text()
+    assert str(template) in (template / "Scripts" / "activate").read_text()
+    assert os.path.samefile(template / "Lib" / "module.py", clone / "Lib" / "module.py")
+
+
+def test_patch_venv_renames_prompt_of_real_venv(tmp_path):
+    template, clone = tmp_path / "3.13", tmp_path / "beta"
+    pb.venv.EnvBuilder(with_pip=False).create(template)
+    pb._clone_tree(template, clone, ("copy",))
+
+    pb._patch_venv(clone, template)
+
+    scripts = [
+        file
+        for file in clone.glob("*/*")
+        if file.name.lower().startswith("activate") and file.suffix != ".ps1"
+    ]
+    assert scripts
+    for script in scripts:
+        text = script.read_text()
+        assert "beta" in text
+        assert "3.13" not in text, script.name
+
+
+@pytest.mark.parametrize(
+    ("script", "line"),
+    [
+        ("activate", 'VIRTUAL_ENV_PROMPT="3.13"'),
+        ("activate", 'PS1="(3.13) ${PS1:-}"'),
+        ("activate.csh", 'setenv VIRTUAL_ENV_PROMPT "3.13"'),
+        ("activate.fish", 'set -gx VIRTUAL_ENV_PROMPT "3.13"'),
+        ("activate.bat", 'set "VIRTUAL_ENV_PROMPT=3.13"'),
+        ("activate.bat", "set PROMPT=(3.13) %PROMPT%"),
+    ],
+)
+def test_patch_venv_renames_prompt_forms(tmp_path, script, line):
+    template, clone = tmp_path / "3.13", tmp_path / "beta"
+    (clone / "Scripts").mkdir(parents=True)
+    (clone / "pyvenv.cfg").write_text("home = /py313\n")
+    (clone / "Scripts" / script).write_text(line)
+    (clone / "Scripts" / "tool.py").write_text('VERSION = "3.13"')
+
+    pb._patch_venv(clone, template)
+
+    assert (clone / "Scripts" / script).read_text() == line.replace("3.13", "beta")
+    assert (clone / "Scripts" / "tool.py").read_text() == 'VERSION = "3.13"'
+
+
+def test_ensure_template_builds_once(venv_dirs, tmp_path, counted_create_venv):
+    python_path = tmp_path / "py310" / "python.exe"
+
+    first = pb._ensure_template("3.10", python_path)
+    second = pb._ensure_template("3.10", python_path)
+
+    assert first == second == pb._template_path("3.10")
+    assert (first / "pyvenv.cfg").is_file()
+    counted_create_venv.assert_called_once()
+
+
+def test_ensure_template_rebuilds_for_new_interpreter(
+    venv_dirs, tmp_path, counted_create_venv
+):
+    pb._ensure_template("3.10", tmp_path / "old" / "python.exe")
+    template = pb._ensure_template("3.10", tmp_path / "new" / "python.exe")
+
+    assert counted_create_venv.call_count == 2
+    assert str(tmp_path / "new") in (template / "pyvenv.cfg").read_text()
+
+
+def test_ensure_template_rebuilds_after_in_place_upgrade(
+    venv_dirs, tmp_path, counted_create_venv
+):
+    make_python_exe(tmp_path / "py310")
+    python_path = tmp_path / "py310" / "python.exe"
+    pb._ensure_template("3.10", python_path)
+    pb._ensure_template("3.10", python_path)
+
+    make_python_exe(tmp_path / "py310", size=20)
+    pb._ensure_template("3.10", python_path)
+
+    assert counted_create_venv.call_count == 2
+
+
+def test_ensure_template_leaves_build_of_another_process_alone(
+    venv_dirs, tmp_path, counted_create_venv
+):
+    template = pb._ensure_template("3.10", tmp_path / "old" / "python.exe")
+    lock = template.with_name(".3.10.lock")
+    lock.touch()
+
+    assert pb._ensure_template("3.10", tmp_path / "new" / "python.exe") is None
+    assert (template / "pyvenv.cfg").is_file()
+    counted_create_venv.assert_called_once()
+
+    hour_ago = time.time() - 3600
+    os.utime(lock, (hour_ago, hour_ago))
+    assert pb._ensure_template("3.10", tmp_path / "new" / "python.exe") == template
+    assert not lock.exists()
+
+
+def test_ensure_template_failure_cleans_up(venv_dirs, tmp_path, monkeypatch):
+    monkeypatch.setattr(pb, "_create_venv", lambda *a, **k: "subprocess")
+
+    assert pb._ensure_template("3.10", tmp_path / "python.exe") is None
+    assert not pb._template_path("3.10").exists()
+
+
+def test_mkproject_clones_template(
+    runner, fake_registry, venv_dirs, tmp_path, counted_create_venv
+):
+    workon, project = venv_dirs
+    pb._set_registry(pb.VersionRegistry({"3.10": tmp_path / "py310"}), "PYNBALL")
+
+    for name in ("first", "second"):
+        result = runner.invoke(pb.cli, ["mkproject", "-n", "3.10", name])
+        assert result.exit_code == 0, result.output
+
+    counted_create_venv.assert_called_once()
+    activate = (workon / "second" / "Scripts" / "activate").read_text()
+    assert str(workon / "second") in activate
+    assert (workon / "second" / ".project").read_text() == str(project / "second")
+
+
+def test_mkproject_no_template_builds_from_scratch(
+    runner, fake_registry, venv_dirs, tmp_path, counted_create_venv
+):
+    workon, project = venv_dirs
+    pb._set_registry(pb.VersionRegistry({"3.10": tmp_path / "py310"}), "PYNBALL")
+
+    result = runner.invoke(pb.cli, ["mkproject", "-n", "--no-template", "3.10", "p"])
+
+    assert result.exit_code == 0, result.output
+    assert counted_create_venv.call_args.args[1] == workon / "p"
+    assert not pb._template_path("3.10").exists()
+
+
+# ---------------------------------------------------------------------------
+# mkproject --from
+# ---------------------------------------------------------------------------
+
+
+def write_manifest(path: Path, *entries: str) -> Path:
+    path.write_text("".join(f"[[project]]\n{entry}\n" for entry in entries))
+    return path
+
+
+def test_mkproject_from_manifest_creates_all(
+    runner, fake_registry, venv_dirs, tmp_path, counted_create_venv, monkeypatch
+):
+    workon, project = venv_dirs
+    versions = {"3.10": tmp_path / "py310", "3.9": tmp_path / "py39"}
+    pb._set_registry(pb.VersionRegistry(versions), "PYNBALL")
+    get_registry = mock.MagicMock(wraps=pb._get_registry)
+    monkeypatch.setattr(pb, "_get_registry", get_registry)
+    manifest = write_manifest(
+        tmp_path / "manifest.toml",
+        'version = "3.10"\nproject = "alpha"',
+        'version = "3.9"\nproject = "beta"\nall = false',
+        'version = "3.10"\nproject = "gamma"\ntemplate = false',
+    )
+
+    result = runner.invoke(pb.cli, ["mkproject", "--from", str(manifest)])
+
+    assert result.exit_code == 0, result.output
+    get_registry.assert_called_once_with("PYNBALL")
+    for name in ("alpha", "beta", "gamma"):
+        assert (workon / name / ".project").read_text() == str(project / name)
+    assert (project / "alpha").is_dir()
+    assert not (project / "beta").exists()
+    lines = result.output.splitlines()
+    assert lines[0].split() == ["Project", "Name", "Version", "Seconds", "Result"]
+    assert lines[2].split()[:2] == ["alpha", "3.10"]
+    assert "created (venv)" in lines[4]
+    assert "3 projects created" in result.output
+
+
+def test_mkproject_from_manifest_validates_before_creating(
+    runner, fake_registry, venv_dirs, tmp_path, counted_create_venv
+):
+    workon, project = venv_dirs
+    pb._set_registry(pb.VersionRegistry({"3.10": tmp_path / "py310"}), "PYNBALL")
+    manifest = write_manifest(
+        tmp_path / "manifest.toml",
+        'version = "3.10"\nproject = "alpha"',
+        'version = "2.7"\nproject = "beta"',
+    )
+
+    result = runner.invoke(pb.cli, ["mkproject", "--from", str(manifest)])
+
+    assert result.exit_code == 1
+    assert "Project 2: 2.7 is not configured in Pynball" in result.output
+    assert list(workon.iterdir()) == []
+    counted_create_venv.assert_not_called()
+
+
+def test_mkproject_from_manifest_reports_invalid_entries(
+    runner, fake_registry, venv_dirs, tmp_path
+):
+    manifest = write_manifest(
+        tmp_path / "manifest.toml",
+        'version = "3.10"\nproject = "alpha"\ncolour = "red"',
+        'version = "3.10"\nproject = "alpha"\nall = "no"',
+        'project = "beta"',
+    )
+
+    result = runner.invoke(pb.cli, ["mkproject", "--from", str(manifest)])
+
+    assert result.exit_code == 1
+    assert "Project 1: unknown key 'colour'" in result.output
+    assert "Project 2: 'all' must be a bool" in result.output
+    assert "Project 2: 'alpha' is listed more than once" in result.output
+    assert "Project 3: 'version' is missing" in result.output
+
+
+def test_mkproject_from_manifest_project_must_be_a_string(
+    runner, fake_registry, venv_dirs, tmp_path
+):
+    manifest = write_manifest(
+        tmp_path / "manifest.toml", 'version = "3.10"\nproject = ["alpha"]'
+    )
+
+    result = runner.invoke(pb.cli, ["mkproject", "--from", str(manifest)])
+
+    assert result.exit_code == 1
+    assert "Project 1: 'project' must be a str" in result.output
+
+
+def test_mkproject_from_manifest_uses_options_as_defaults(
+    runner, fake_registry, venv_dirs, tmp_path, counted_create_venv
+):
+    workon, project = venv_dirs
+    pb._set_registry(pb.VersionRegistry({"3.10": tmp_path / "py310"}), "PYNBALL")
+    manifest = write_manifest(
+        tmp_path / "manifest.toml",
+        'version = "3.10"\nproject = "alpha"',
+        'version = "3.10"\nproject = "beta"\nall = true\ntemplate = true',
+    )
+
+    result = runner.invoke(
+        pb.cli, ["mkproject", "--noall", "--no-template", "--from", str(manifest)]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert not (project / "alpha").exists()
+    assert (project / "beta").is_dir()
+    built = [call.args[1] for call in counted_create_venv.call_args_list]
+    assert workon / "alpha" in built
+    assert pb._template_path("3.10").is_dir()
+
+
+def test_mkproject_from_manifest_bad_toml(runner, fake_registry, venv_dirs, tmp_path):
+    manifest = tmp_path / "manifest.toml"
+    manifest.write_text("[[project]\n")
+
+    result = runner.invoke(pb.cli, ["mkproject", "--from", str(manifest)])
+
+    assert result.exit_code == 1
+    assert f"Cannot read '{manifest}'" in result.output
+
+
+def test_mkproject_from_manifest_keeps_going_after_failure(
+    runner, fake_registry, venv_dirs, tmp_path, counted_create_venv
+):
+    workon, project = venv_dirs
+    (workon / "alpha").mkdir()
+    pb._set_registry(pb.VersionRegistry({"3.10": tmp_path / "py310"}), "PYNBALL")
+    manifest = write_manifest(
+        tmp_path / "manifest.toml",
+        'version = "3.10"\nproject = "alpha"',
+        'version = "3.10"\nproject = "beta"',
+    )
+
+    result = runner.invoke(pb.cli, ["mkproject", "--from", str(manifest)])
+
+    assert result.exit_code == 1
+    assert f"{workon / 'alpha'} already exists" in result.output
+    assert "1 of 2 projects were NOT created" in result.output
+    assert (workon / "beta" / ".project").is_file()
+
+
+def test_mkproject_needs_arguments_or_manifest(runner, venv_dirs, tmp_path):
+    manifest = write_manifest(tmp_path / "m.toml", 'version = "3.10"\nproject = "a"')
+
+    both = runner.invoke(pb.cli, ["mkproject", "--from", str(manifest), "3.10", "a"])
+    neither = runner.invoke(pb.cli, ["mkproject", "3.10"])
+
+    assert both.exit_code == neither.exit_code == 2
+    assert "either NAME and PROJECT_NAME or --from FILE" in both.output
+
+
+# ---------------------------------------------------------------------------
+# requirements and sync
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture()
+def pip(monkeypatch):
+    execute = mock.MagicMock(return_value="")
+    monkeypatch.setattr(pb, "_execute", execute)
+    return execute
+
+
+@pytest.fixture()
+def synced_venv(venv_dirs, tmp_path):
+    workon, project = venv_dirs
+    venv_path = workon / "myproj"
+    fake_create_venv(tmp_path / "py310" / "python.exe", venv_path)
+    requirements = tmp_path / "requirements.txt"
+    requirements.write_text("click==8.1.7\n")
+    wheelhouse = tmp_path / "wheels"
+    wheelhouse.mkdir()
+    return venv_path, requirements, wheelhouse
+
+
+def test_sync_requirements_installs_offline(synced_venv, pip):
+    venv_path, requirements, wheelhouse = synced_venv
+
+    assert pb._sync_requirements(venv_path, requirements, wheelhouse)
+
+    args = [str(arg) for arg in pip.call_args.args]
+    assert args[:4] == [str(pb._venv_python(venv_path)), "-m", "pip", "install"]
+    assert args[-5:] == [
+        "--no-index",
+        "--find-links",
+        str(wheelhouse.resolve()),
+        "-r",
+        str(requirements.resolve()),
+    ]
+    stamp = pb._read_sync_stamp(venv_path)
+    assert stamp["requirements"] == str(requirements.resolve())
+    assert stamp["wheelhouse"] == str(wheelhouse.resolve())
+
+
+def test_sync_requirements_skips_when_unchanged(synced_venv, pip):
+    venv_path, requirements, wheelhouse = synced_venv
+
+    pb._sync_requirements(venv_path, requirements, wheelhouse)
+    assert not pb._sync_requirements(venv_path, requirements, wheelhouse)
+    assert pb._sync_requirements(venv_path, requirements, wheelhouse, force=True)
+
+    assert pip.call_count == 2
+
+
+@pytest.mark.parametrize(
+    "change",
+    [
+        lambda venv_path, requirements: requirements.write_text("click==8.1.8\n"),
+        lambda venv_path, requirements: (venv_path / "pyvenv.cfg").write_text(
+            "home = /other/python\n"
+        ),
+    ],
+    ids=["requirements", "interpreter"],
+)
+def test_sync_requirements_reinstalls_after_change(synced_venv, pip, change):
+    venv_path, requirements, wheelhouse = synced_venv
+    pb._sync_requirements(venv_path, requirements, wheelhouse)
+
+    change(venv_path, requirements)
+
+    assert pb._sync_requirements(venv_path, requirements, wheelhouse)
+    assert pip.call_count == 2
+
+
+def test_sync_requirements_pip_failure_records_nothing(synced_venv, pip):
+    venv_path, requirements, wheelhouse = synced_venv
+    pip.side_effect = Exception("No matching distribution found for click")
+
+    with pytest.raises(Exception, match="No matching distribution"):
+        pb._sync_requirements(venv_path, requirements, wheelhouse)
+
+    assert pb._read_sync_stamp(venv_path) == {}
+
+
+def test_mkproject_installs_requirements(
+    runner, fake_registry, venv_dirs, tmp_path, counted_create_venv, pip
+):
+    workon, project = venv_dirs
+    pb._set_registry(pb.VersionRegistry({"3.10": tmp_path / "py310"}), "PYNBALL")
+    requirements = tmp_path / "requirements.txt"
+    requirements.write_text("click\n")
+    wheelhouse = tmp_path / "wheels"
+    wheelhouse.mkdir()
+
+    result = runner.invoke(
+        pb.cli,
+        ["mkproject", "-r", str(requirements), "-w", str(wheelhouse), "3.10", "p"],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "--no-index" in pip.call_args.args
+    assert pb._read_sync_stamp(workon / "p")["hash"]
+
+
+def test_mkproject_finishes_project_when_requirements_fail(
+    runner, fake_registry, venv_dirs, tmp_path, counted_create_venv, pip
+):
+    workon, project = venv_dirs
+    pb._set_registry(pb.VersionRegistry({"3.10": tmp_path / "py310"}), "PYNBALL")
+    requirements = tmp_path / "requirements.txt"
+    requirements.write_text("nosuchpackage\n")
+    pip.side_effect = Exception("No matching distribution found")
+
+    result = runner.invoke(pb.cli, ["mkproject", "-r", str(requirements), "3.10", "p"])
+
+    assert result.exit_code == 0, result.output
+    assert "Requirements of 'p' have NOT been installed" in result.output
+    assert "No matching distribution found" in result.output
+    assert "'p' created" in result.output
+    assert (workon / "p" / "pyvenv.cfg").is_file()
+    assert (project / "p").is_dir()
+    assert not pb._read_sync_stamp(workon / "p")
+
+
+def test_mkproject_removes_venv_when_creation_fails(
+    runner, fake_registry, venv_dirs, tmp_path, monkeypatch
+):
+    workon, project = venv_dirs
+    pb._set_registry(pb.VersionRegistry({"3.10": tmp_path / "py310"}), "PYNBALL")
+
+    def broken_create_venv(python_path, venv_path, backend=""):
+        (venv_path / "pyvenv.cfg").write_text("home = /py310\n")
+        raise Exception("virtualenv crashed")
+
+    monkeypatch.setattr(pb, "_create_venv", broken_create_venv)
+    result = runner.invoke(pb.cli, ["mkproject", "--no-template", "3.10", "p"])
+
+    assert "has NOT been created - virtualenv crashed" in result.output
+    assert not (workon / "p").exists()
+
+    monkeypatch.setattr(pb, "_create_venv", fake_create_venv)
+    result = runner.invoke(pb.cli, ["mkproject", "--no-template", "3.10", "p"])
+
+    assert "'p' created" in result.output
+
+
+def test_mkproject_from_manifest_installs_relative_requirements(
+    runner, fake_registry, venv_dirs, tmp_path, counted_create_venv, pip
+):
+    workon, project = venv_dirs
+    pb._set_registry(pb.VersionRegistry({"3.10": tmp_path / "py310"}), "PYNBALL")
+    (tmp_path / "requirements.txt").write_text("click\n")
+    (tmp_path / "wheels").mkdir()
+    manifest = write_manifest(
+        tmp_path / "manifest.toml",
+        'version = "3.10"\nproject = "alpha"\n'
+        'requirements = "requirements.txt"\nwheelhouse = "wheels"',
+    )
+
+    result = runner.invoke(pb.cli, ["mkproject", "--from", str(manifest)])
+
+    assert result.exit_code == 0, result.output
+    stamp = pb._read_sync_stamp(workon / "alpha")
+    assert stamp["wheelhouse"] == str((tmp_path / "wheels").resolve())
+
+
+def test_mkproject_wheelhouse_needs_requirements(runner, venv_dirs, tmp_path):
+    result = runner.invoke(pb.cli, ["mkproject", "-w", str(tmp_path), "3.10", "myproj"])
+
+    assert result.exit_code == 2
+    assert "--wheelhouse needs --requirements" in result.output
+
+
+def test_sync_command_uses_recorded_requirements(runner, synced_venv, pip):
+    venv_path, requirements, wheelhouse = synced_venv
+    pb._sync_requirements(venv_path, requirements, wheelhouse)
+
+    unchanged = runner.invoke(pb.cli, ["sync", "myproj"])
+    requirements.write_text("click==8.1.8\n")
+    changed = runner.invoke(pb.cli, ["sync", "myproj"])
+
+    assert "'myproj' is already in sync" in unchanged.output
+    assert "Requirements of 'myproj' installed" in changed.output
+    assert pip.call_count == 2
+    assert str(wheelhouse.resolve()) in pip.call_args.args
+
+
+def test_sync_command_failure_exits(runner, synced_venv, pip):
+    venv_path, requirements, wheelhouse = synced_venv
+    pip.side_effect = Exception("network is unreachable")
+
+    result = runner.invoke(pb.cli, ["sync", "-r", str(requirements), "myproj"])
+
+    assert result.exit_code == 1
+    assert "have NOT been installed - network is unreachable" in result.output
+
+
+def test_sync_command_without_requirements(runner, synced_venv, pip):
+    result = runner.invoke(pb.cli, ["sync", "myproj"])
+
+    assert "No requirements are recorded for 'myproj'" in result.output
+    pip.assert_not_called()
+
+
+def test_sync_command_missing_project(runner, venv_dirs, pip):
+    result = runner.invoke(pb.cli, ["sync", "nothere"])
+
+    assert "Project: 'nothere' does not exist" in result.output
+
+
+# ---------------------------------------------------------------------------
+# pool
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture()
+def refill(monkeypatch):
+    refill = mock.MagicMock()
+    monkeypatch.setattr(pb, "_refill_pool_later", refill)
+    return refill
+
+
+@pytest.fixture()
+def warm_pool(venv_dirs, tmp_path, counted_create_venv):
+    python_path = tmp_path / "py310" / "python.exe"
+    results, evicted = pb._warm_pool("3.10", python_path, 2, 7.0)
+    assert all(job.ok for job in results)
+    return python_path
+
+
+def test_warm_pool_builds_spares(warm_pool, counted_create_venv):
+    spares = pb._pool_spares("3.10")
+
+    assert len(spares) == 2
+    stamp = pb._interpreter_stamp(warm_pool)
+    assert all(spare_stamp == stamp for _, spare_stamp, _ in spares)
+    assert pb._read_pool_settings("3.10")["size"] == 2
+    # Spares are cloned from the golden template, which is built only once
+    counted_create_venv.assert_called_once()
+
+
+def test_warm_pool_tops_up_and_evicts(warm_pool, tmp_path):
+    oldest, newest = (spare for spare, _, _ in pb._pool_spares("3.10"))
+    month_ago = time.time() - 30 * 86400
+    os.utime(oldest / pb._TEMPLATE_MARKER, (month_ago, month_ago))
+
+    results, evicted = pb._warm_pool("3.10", warm_pool, 1, 7.0)
+
+    assert evicted == 1
+    assert results == []
+    assert [spare for spare, _, _ in pb._pool_spares("3.10")] == [newest]
+
+
+def test_warm_pool_evicts_spares_of_another_interpreter(warm_pool, tmp_path):
+    other = tmp_path / "other" / "python.exe"
+
+    results, evicted = pb._warm_pool("3.10", other, 2, 7.0)
+
+    assert evicted == 2
+    assert len(results) == 2
+    assert {stamp for _, stamp, _ in pb._pool_spares("3.10")} == {
+        pb._interpreter_stamp(other)
+    }
+
+
+def test_warm_pool_evicts_spares_of_upgraded_interpreter(
+    venv_dirs, tmp_path, counted_create_venv
+):
+    make_python_exe(tmp_path / "py310")
+    python_path = tmp_path / "py310" / "python.exe"
+    pb._warm_pool("3.10", python_path, 2, 7.0)
+
+    make_python_exe(tmp_path / "py310", size=20)
+    results, evicted = pb._warm_pool("3.10", python_path, 2, 7.0)
+
+    assert evicted == 2
+    assert len(results) == 2
+    # The template was rebuilt too, before the new spares were cloned from it
+    assert counted_create_venv.call_count == 2
+
+
+def test_warm_pool_removes_abandoned_builds(warm_pool):
+    pool = pb._pool_path("3.10")
+    fresh, abandoned = pool / "spare-fresh", pool / "spare-abandoned"
+    fresh.mkdir()
+    abandoned.mkdir()
+    hour_ago = time.time() - 3600
+    os.utime(abandoned, (hour_ago, hour_ago))
+
+    pb._warm_pool("3.10", warm_pool, 2, 7.0)
+
+    assert fresh.exists()
+    assert not abandoned.exists()
+
+
+def test_warm_pool_skips_when_locked(warm_pool):
+    lock = pb._pool_path("3.10") / pb._POOL_LOCK
+    lock.touch()
+
+    assert pb._warm_pool("3.10", warm_pool, 3, 7.0) is None
+
+    hour_ago = time.time() - 3600
+    os.utime(lock, (hour_ago, hour_ago))
+    results, evicted = pb._warm_pool("3.10", warm_pool, 3, 7.0)
+    assert len(results) == 1
+    assert not lock.exists()
+
+
+def test_mkproject_claims_spare(runner, fake_registry, warm_pool, refill, venv_dirs):
+    workon, project = venv_dirs
+    pb._set_registry(pb.VersionRegistry({"3.10": warm_pool.parent}), "PYNBALL")
+    (oldest, _, _), (newest, _, _) = pb._pool_spares("3.10")
+
+    result = runner.invoke(pb.cli, ["mkproject", "3.10", "myproj"])
+
+    assert result.exit_code == 0, result.output
+    venv_path = workon / "myproj"
+    assert not oldest.exists()
+    assert [spare for spare, _, _ in pb._pool_spares("3.10")] == [newest]
+    assert not (venv_path / pb._TEMPLATE_MARKER).exists()
+    activate = (venv_path / "Scripts" / "activate").read_text()
+    assert f'VIRTUAL_ENV="{venv_path}"' in activate
+    assert "(myproj) " in activate
+    assert (venv_path / ".project").read_text() == str(project / "myproj")
+    refill.assert_called_once_with("3.10")
+
+
+def test_mkproject_discards_spares_past_max_age(
+    runner, fake_registry, warm_pool, refill, venv_dirs
+):
+    pb._set_registry(pb.VersionRegistry({"3.10": warm_pool.parent}), "PYNBALL")
+    (oldest, _, _), (newest, _, _) = pb._pool_spares("3.10")
+    month_ago = time.time() - 30 * 86400
+    os.utime(oldest / pb._TEMPLATE_MARKER, (month_ago, month_ago))
+
+    result = runner.invoke(pb.cli, ["mkproject", "3.10", "myproj"])
+
+    assert result.exit_code == 0, result.output
+    assert "created (pool" in result.output
+    assert not oldest.exists()
+    assert not newest.exists()
+    assert pb._pool_spares("3.10") == []
+
+
+@pytest.mark.skipif(os.name == "nt", reason="POSIX permissions")
+def test_spares_get_the_pool_mode(warm_pool):
+    pool_mode = pb._pool_path("3.10").stat().st_mode
+    for spare, _, _ in pb._pool_spares("3.10"):
+        assert spare.stat().st_mode == pool_mode
+
+
+def test_pool_lock_gives_up_when_stale_lock_keeps_returning(venv_dirs, monkeypatch):
+    pool = pb._pool_path("3.10")
+    pool.mkdir(parents=True)
+    lock = pool / pb._POOL_LOCK
+    hour_ago = time.time() - 3600
+    real_open = os.open
+
+    def recreate_stale_lock(*args):
+        os.close(real_open(lock, os.O_CREAT | os.O_WRONLY))
+        os.utime(lock, (hour_ago, hour_ago))
+        raise FileExistsError(str(lock))
+
+    monkeypatch.setattr(pb.os, "open", recreate_stale_lock)
+
+    with pb._pool_lock("3.10") as locked:
+        assert not locked
+
+
+def test_mkproject_empty_pool_falls_back(
+    runner, fake_registry, venv_dirs, tmp_path, counted_create_venv, refill
+):
+    workon, project = venv_dirs
+    python_path = tmp_path / "py310" / "python.exe"
+    pb._set_registry(pb.VersionRegistry({"3.10": python_path.parent}), "PYNBALL")
+    pb._warm_pool("3.10", python_path, 0, 7.0)
+
+    result = runner.invoke(pb.cli, ["mkproject", "3.10", "myproj"])
+
+    assert result.exit_code == 0, result.output
+    assert (workon / "myproj" / "pyvenv.cfg").is_file()
+    refill.assert_called_once_with("3.10")
+
+
+def test_mkproject_without_pool_does_not_refill(
+    runner, fake_registry, venv_dirs, tmp_path, counted_create_venv, refill
+):
+    pb._set_registry(pb.VersionRegistry({"3.10": tmp_path / "py310"}), "PYNBALL")
+
+    result = runner.invoke(pb.cli, ["mkproject", "3.10", "myproj"])
+
+    assert result.exit_code == 0, result.output
+    refill.assert_not_called()
+
+
+def test_mkproject_no_template_skips_pool(
+    runner, fake_registry, warm_pool, refill, venv_dirs
+):
+    pb._set_registry(pb.VersionRegistry({"3.10": warm_pool.parent}), "PYNBALL")
+
+    result = runner.invoke(pb.cli, ["mkproject", "--no-template", "3.10", "myproj"])
+
+    assert result.exit_code == 0, result.output
+    assert len(pb._pool_spares("3.10")) == 2
+    refill.assert_not_called()
+
+
+def test_refill_pool_later_detaches(venv_dirs, monkeypatch):
+    workon, project = venv_dirs
+    popen = mock.MagicMock()
+    monkeypatch.setattr(pb.subprocess, "Popen", popen)
+
+    pb._refill_pool_later("3.10")
+
+    args, kwargs = popen.call_args
+    assert args[0][0] == sys.executable
+    assert args[0][-3:] == ["pool", "warm", "3.10"]
+    assert kwargs["env"]["WORKON_HOME"] == str(workon)
+    assert kwargs["stdout"] == pb.subprocess.DEVNULL
+
+
+def test_pool_warm_command_remembers_settings(
+    runner, fake_registry, venv_dirs, tmp_path, counted_create_venv
+):
+    pb._set_registry(pb.VersionRegistry({"3.10": tmp_path / "py310"}), "PYNBALL")
+
+    first = runner.invoke(pb.cli, ["pool", "warm", "--size", "3", "3.10"])
+    second = runner.invoke(pb.cli, ["pool", "warm", "3.10"])
+
+    assert "holds 3 of 3 spares (3 created, 0 evicted)" in first.output
+    assert "holds 3 of 3 spares (0 created, 0 evicted)" in second.output
+
+
+def test_pool_warm_command_unknown_version(runner, fake_registry, venv_dirs):
+    result = runner.invoke(pb.cli, ["pool", "warm", "3.10"])
+
+    assert "3.10 is not configured in Pynball" in result.output
+
+
+def test_pool_list_and_clear(runner, warm_pool):
+    listed = runner.invoke(pb.cli, ["pool", "list"])
+    cleared = runner.invoke(pb.cli, ["pool", "clear", "3.10"])
+    missing = runner.invoke(pb.cli, ["pool", "clear", "3.10"])
+
+    assert listed.output.splitlines()[2].split()[:3] == ["3.10", "2/2", "7.0d"]
+    assert "The pool of 3.10 has been deleted" in cleared.output
+    assert not pb._pool_path("3.10").exists()
+    assert "There is no pool for 3.10" in missing.output
+
+
+# ---------------------------------------------------------------------------
+# bytecode precompilation
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture()
+def compiled_venv(venv_dirs, monkeypatch):
+    """A project whose virtual environment runs the test interpreter."""
+    workon, project = venv_dirs
+    venv_path = workon / "myproj"
+    site_packages = venv_path / "Lib" / "site-packages"
+    site_packages.mkdir(parents=True)
+    (venv_path / "Scripts").mkdir()
+    (venv_path / "pyvenv.cfg").write_text("home = /usr\n")
+    (site_packages / "installed.py").write_text("value = 1\n")
+    (project / "myproj").mkdir()
+    (project / "myproj" / "app.py").write_text("import installed\n")
+    monkeypatch.setattr(pb, "_venv_python", lambda venv_path: Path(sys.executable))
+    return venv_path, site_packages, project / "myproj"
+
+
+def test_compile_targets_layouts(tmp_path):
+    windows, posix, project = tmp_path / "win", tmp_path / "posix", tmp_path / "proj"
+    (windows / "Scripts").mkdir(parents=True)
+    (windows / "Lib" / "site-packages").mkdir(parents=True)
+    (posix / "lib" / "python3.12" / "site-packages").mkdir(parents=True)
+    project.mkdir()
+
+    assert pb._compile_targets(windows, project) == [
+        windows / "Lib" / "site-packages",
+        project,
+    ]
+    assert pb._compile_targets(posix, tmp_path / "missing") == [
+        posix / "lib" / "python3.12" / "site-packages"
+    ]
+
+
+def test_compile_venv_without_interpreter(tmp_path):
+    assert pb._compile_venv(tmp_path) is None
+
+
+def test_compile_venv_uses_parallel_workers(compiled_venv, monkeypatch):
+    venv_path, site_packages, project_path = compiled_venv
+    pb._JOB_SETTINGS["workers"] = 3
+    run = mock.MagicMock(return_value=pb.CommandResult(("python",), 0, "", "", 0.5))
+    monkeypatch.setattr(pb, "_run", run)
+
+    compiled = pb._compile_venv(venv_path, project_path)
+
+    assert [target for target, _ in compiled] == [site_packages, project_path]
+    args = [str(arg) for arg in run.call_args_list[0].args]
+    assert args == [sys.executable, "-m", "compileall", "-q", "-j", "3"] + [
+        str(site_packages)
+    ]
+
+
+def test_compile_venv_writes_bytecode(compiled_venv):
+    venv_path, site_packages, project_path = compiled_venv
+
+    compiled = pb._compile_venv(venv_path, project_path)
+
+    assert all(result.ok for _, result in compiled)
+    assert list((site_packages / "__pycache__").glob("installed.*.pyc"))
+    assert list((project_path / "__pycache__").glob("app.*.pyc"))
+
+
+def test_compile_command_reports_timings_and_errors(runner, compiled_venv):
+    venv_path, site_packages, project_path = compiled_venv
+    (project_path / "broken.py").write_text("def (\n")
+
+    result = runner.invoke(pb.cli, ["compile", "myproj"])
+
+    assert result.exit_code == 0, result.output
+    lines = result.output.splitlines()
+    assert lines[0].endswith(f"s  {site_packages}")
+    assert lines[1].endswith(f"s  {project_path}")
+    assert f"Some modules in '{project_path}' could not be compiled" in result.output
+    assert "'myproj' compiled in" in result.output
+
+
+def test_compile_command_missing_project(runner, venv_dirs):
+    result = runner.invoke(pb.cli, ["compile", "nothere"])
+
+    assert "Project: 'nothere' does not exist" in result.output
+
+
+def test_mkproject_from_manifest_no_compile_default(
+    runner, fake_registry, venv_dirs, tmp_path, counted_create_venv, monkeypatch
+):
+    pb._set_registry(pb.VersionRegistry({"3.10": tmp_path / "py310"}), "PYNBALL")
+    compile_venv = mock.MagicMock(return_value=None)
+    monkeypatch.setattr(pb, "_compile_venv", compile_venv)
+    manifest = write_manifest(
+        tmp_path / "manifest.toml",
+        'version = "3.10"\nproject = "alpha"',
+        'version = "3.10"\nproject = "beta"\ncompile = true',
+    )
+
+    result = runner.invoke(
+        pb.cli, ["mkproject", "--no-compile", "--from", str(manifest)]
+    )
+
+    assert result.exit_code == 0, result.output
+    projects = [call.args[0].name for call in compile_venv.call_args_list]
+    assert projects == ["3.10", "beta"]
+
+
+def test_mkproject_compiles_bytecode(
+    runner, fake_registry, venv_dirs, tmp_path, counted_create_venv, monkeypatch
+):
+    pb._set_registry(pb.VersionRegistry({"3.10": tmp_path / "py310"}), "PYNBALL")
+    result_ok = pb.CommandResult(("python",), 0, "", "", 0.25)
+    compile_venv = mock.MagicMock(return_value=[(tmp_path, result_ok)] * 2)
+    monkeypatch.setattr(pb, "_compile_venv", compile_venv)
+
+    compiled = runner.invoke(pb.cli, ["mkproject", "3.10", "one"])
+    skipped = runner.invoke(pb.cli, ["mkproject", "--no-compile", "3.10", "two"])
+
+    assert "'one' created (hardlink, compiled in 0.50s) in" in compiled.output
+    assert "'two' created (hardlink) in" in skipped.output
+    template, project = compile_venv.call_args_list
+    assert template.args == (pb._template_path("3.10"),)
+    assert project.args[0].name == "one"
+    assert project.kwargs == {"site_packages": False, "jobs": None}
+
+
+def test_mkproject_from_scratch_compiles_site_packages(
+    runner, fake_registry, venv_dirs, tmp_path, counted_create_venv, monkeypatch
+):
+    pb._set_registry(pb.VersionRegistry({"3.10": tmp_path / "py310"}), "PYNBALL")
+    compile_venv = mock.MagicMock(return_value=None)
+    monkeypatch.setattr(pb, "_compile_venv", compile_venv)
+
+    result = runner.invoke(pb.cli, ["mkproject", "--no-template", "3.10", "one"])
+
+    assert result.exit_code == 0, result.output
+    compile_venv.assert_called_once()
+    assert compile_venv.call_args.kwargs["site_packages"] is True
+
+
+def test_build_spare_compiles_site_packages_only_when_not_cloned(
+    venv_dirs, tmp_path, counted_create_venv, monkeypatch
+):
+    compile_venv = mock.MagicMock(return_value=None)
+    monkeypatch.setattr(pb, "_compile_venv", compile_venv)
+    pb._pool_path("3.10").mkdir(parents=True)
+
+    cloned = pb._build_spare("3.10", tmp_path / "py310" / "python.exe")
+    monkeypatch.setattr(pb, "_ensure_template", lambda name, python_path: None)
+    built = pb._build_spare("3.10", tmp_path / "py310" / "python.exe")
+
+    assert cloned in pb._CLONE_METHODS
+    assert built in pb._VENV_BACKENDS
+    template, spare = (call.args[0] for call in compile_venv.call_args_list)
+    assert template == pb._template_path("3.10")
+    assert spare.parent == pb._pool_path("3.10")
+
+
+def test_mkproject_from_manifest_shares_compile_workers(
+    runner, fake_registry, venv_dirs, tmp_path, counted_create_venv, monkeypatch
+):
+    pb._set_registry(pb.VersionRegistry({"3.10": tmp_path / "py310"}), "PYNBALL")
+    compile_venv = mock.MagicMock(return_value=None)
+    monkeypatch.setattr(pb, "_compile_venv", compile_venv)
+    manifest = write_manifest(
+        tmp_path / "manifest.toml",
+        *(f'version = "3.10"\nproject = "p{number}"' for number in range(4)),
+    )
+
+    result = runner.invoke(pb.cli, ["-j", "8", "mkproject", "--from", str(manifest)])
+
+    assert result.exit_code == 0, result.output
+    jobs = [call.kwargs["jobs"] for call in compile_venv.call_args_list if call.kwargs]
+    assert jobs == [2] * 4
+
+
 # ---------------------------------------------------------------------------
 # rmproject
 # ---------------------------------------------------------------------------
@@ -258,6 +1359,16 @@ def test_lsproject_lists_projects(runner, venv_dirs):
     assert "missing virtual configuration" in result.output
 
 
+def test_lsproject_skips_pynball_state(runner, venv_dirs):
+    workon, project = venv_dirs
+    (workon / pb._STATE_DIR_NAME / "templates" / "3.10").mkdir(parents=True)
+
+    result = runner.invoke(pb.cli, ["lsproject"])
+
+    assert pb._STATE_DIR_NAME not in result.output
+    assert "missing virtual configuration" not in result.output
+
+
 # ---------------------------------------------------------------------------
 # mvproject
 # ---------------------------------------------------------------------------
@@ -305,7 +1416,7 @@ def test_mvproject_success_renames_and_recreates(
     (venv / "pyvenv.cfg").write_text("home = /usr\nversion_info = 3.10.5\n")
 
     py_path = tmp_path / "py310"
-    pb._set_pynball({"3.10.5": py_path}, "PYNBALL")
+    pb._set_registry(pb.VersionRegistry({"3.10.5": py_path}), "PYNBALL")
     monkeypatch.setattr(pb, "_execute", lambda *a, **k: "ok")
 
     result = runner.invoke(pb.cli, ["mvproject", "oldname", "newname"])
@@ -345,7 +1456,7 @@ def test_mvproject_rmtree_file_not_found(
     (venv / "pyvenv.cfg").write_text("version_info = 3.10.5\n")
 
     py_path = tmp_path / "py310"
-    pb._set_pynball({"3.10.5": py_path}, "PYNBALL")
+    pb._set_registry(pb.VersionRegistry({"3.10.5": py_path}), "PYNBALL")
     monkeypatch.setattr(pb, "_execute", lambda *a, **k: "ok")
 
     def raise_fnf(*a, **k):
@@ -370,7 +1481,7 @@ def test_mvproject_rmtree_permission_error(
     (venv / "pyvenv.cfg").write_text("version_info = 3.10.5\n")
 
     py_path = tmp_path / "py310"
-    pb._set_pynball({"3.10.5": py_path}, "PYNBALL")
+    pb._set_registry(pb.VersionRegistry({"3.10.5": py_path}), "PYNBALL")
     monkeypatch.setattr(pb, "_execute", lambda *a, **k: "ok")
 
     def raise_perm(*a, **k):
@@ -390,7 +1501,7 @@ def raise_perm(*a, **k):
 
 
 def test_exportconf_writes_ini(runner, fake_registry, tmp_path):
-    pb._set_pynball({"3.10": Path("/py310")}, "PYNBALL")
+    pb._set_registry(pb.VersionRegistry({"3.10": Path("/py310")}), "PYNBALL")
 
     with runner.isolated_filesystem(temp_dir=tmp_path):
         result = runner.invoke(pb.cli, ["exportconf"])
@@ -407,7 +1518,47 @@ def test_importconf_success(runner, fake_registry, tmp_path):
     result = runner.invoke(pb.cli, ["importconf", str(ini_path)])
 
     assert result.exit_code == 0
-    assert fake_registry["user"]["PYNBALL"] == "{'3.10': '/py310'}"
+    assert pb._get_registry("PYNBALL").to_dict() == {"3.10": "/py310"}
+
+
+def test_importconf_replaces_configured_versions(runner, fake_registry, tmp_path):
+    versions = {"3.11": Path("/py311"), "3.12": Path("/py312")}
+    pb._set_registry(pb.VersionRegistry(versions), "PYNBALL")
+    ini_path = tmp_path / "backup.ini"
+    ini_path.write_text("[PYNBALL]\nPYNBALL = {'3.10': '/py310'}\n\n")
+
+    runner.invoke(pb.cli, ["importconf", str(ini_path)])
+
+    assert pb._get_registry("PYNBALL").to_dict() == {"3.10": "/py310"}
+    assert set(fake_registry["pynball"]) == {"PYNBALL:3.10"}
+    runner.invoke(pb.cli, ["reset"])
+    assert fake_registry["pynball"] == {}
+
+
+def test_importconf_unreadable_value(runner, fake_registry, tmp_path):
+    ini_path = tmp_path / "backup.ini"
+    ini_path.write_text("[PYNBALL]\nPYNBALL = {'3.10': \n\n")
+
+    result = runner.invoke(pb.cli, ["importconf", str(ini_path)])
+
+    assert "problem with file" in result.output
+    assert "PYNBALL" not in fake_registry["user"]
+
+
+def test_exportconf_importconf_round_trip(runner, fake_registry, tmp_path):
+    versions = {"3.10": Path("/py310"), "3.9": Path("/py39")}
+    pb._set_registry(pb.VersionRegistry(versions), "PYNBALL")
+
+    with runner.isolated_filesystem(temp_dir=tmp_path):
+        runner.invoke(pb.cli, ["exportconf"])
+        runner.invoke(pb.cli, ["reset"])
+        result = runner.invoke(pb.cli, ["importconf", "pynball.ini"])
+
+    assert result.exit_code == 0
+    assert pb._get_registry("PYNBALL").to_dict() == {
+        "3.10": str(Path("/py310")),
+        "3.9": str(Path("/py39")),
+    }
 
 
 def test_importconf_bad_file(runner, fake_registry, tmp_path):
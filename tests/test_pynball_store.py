@@ -0,0 +1,343 @@
+"""Tests for pynball's storage backends.
+
+The same contract is run against the registry backend (with the stubbed
+winreg module backed by an in-memory dict) and the file backend.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from unittest import mock
+
+import pytest
+from click.testing import CliRunner
+
+from pynball import pynball as pb
+
+
+@pytest.fixture()
+def runner() -> CliRunner:
+    return CliRunner()
+
+
+@pytest.fixture()
+def registry_store(monkeypatch):
+    """Point the stubbed winreg calls at an in-memory {(key, name): value} store."""
+    values: dict[tuple[int, str], str] = {}
+
+    def query(key, name):
+        try:
+            return values[(key, name)], 1
+        except KeyError:
+            raise FileNotFoundError from None
+
+    def delete(key, name):
+        try:
+            del values[(key, name)]
+        except KeyError:
+            raise OSError("not found") from None
+
+    def set_value(key, name, _reserved, _type, value):
+        values[(key, name)] = value
+
+    monkeypatch.setattr(pb.winreg, "OpenKey", lambda key, *a: key)
+    monkeypatch.setattr(pb.winreg, "CreateKey", lambda key, _sub: key)
+    monkeypatch.setattr(pb.winreg, "QueryValueEx", query)
+    monkeypatch.setattr(pb.winreg, "SetValueEx", set_value)
+    monkeypatch.setattr(pb.winreg, "DeleteValue", delete)
+    monkeypatch.setattr(pb.winreg, "CloseKey", mock.MagicMock())
+    monkeypatch.setattr(pb, "_STORE_PATH", Path(""))
+    return pb._get_store()
+
+
+@pytest.fixture()
+def file_store(monkeypatch, tmp_path):
+    store_path = tmp_path / "config" / "pynball.json"
+    monkeypatch.setattr(pb, "_STORE_PATH", store_path)
+    monkeypatch.setattr(pb, "_FILE_STORES", {})
+    return pb._get_store()
+
+
+@pytest.fixture(params=["registry", "file"])
+def store(request):
+    return request.getfixturevalue(f"{request.param}_store")
+
+
+def make_python_exe(directory: Path, size: int = 10) -> None:
+    directory.mkdir(parents=True, exist_ok=True)
+    (directory / "python.exe").write_bytes(b"0" * size)
+
+
+# ---------------------------------------------------------------------------
+# backend selection
+# ---------------------------------------------------------------------------
+
+
+def test_get_store_defaults_to_registry(registry_store):
+    assert isinstance(registry_store, pb._RegistryStore)
+
+
+def test_get_store_uses_file_when_configured(file_store):
+    assert isinstance(file_store, pb._FileStore)
+    assert pb._get_store() is file_store
+
+
+def test_get_store_none_off_windows(monkeypatch):
+    monkeypatch.setattr(pb, "_STORE_PATH", Path(""))
+    monkeypatch.setattr(pb, "_PLATFORM", "linux")
+    assert pb._get_store() is None
+
+
+# ---------------------------------------------------------------------------
+# backend contract
+# ---------------------------------------------------------------------------
+
+
+def test_store_read_missing(store):
+    assert store.read("user", "MISSING") is None
+
+
+def test_store_write_read(store):
+    store.write("user", "NAME", "value")
+    store.write("system", "NAME", "other")
+    assert store.read("user", "NAME") == "value"
+    assert store.read("system", "NAME") == "other"
+
+
+def test_store_delete(store):
+    store.write("user", "NAME", "value")
+    store.delete("user", "NAME")
+    assert store.read("user", "NAME") is None
+
+
+def test_store_delete_missing_raises(store):
+    with pytest.raises(OSError):
+        store.delete("user", "MISSING")
+
+
+def test_store_write_many(store):
+    store.write("user", "OLD", "1")
+    failures = store.write_many("user", {"OLD": None, "NEW": "2", "GONE": None})
+    assert list(failures) == ["GONE"]
+    assert store.read("user", "OLD") is None
+    assert store.read("user", "NEW") == "2"
+
+
+def test_store_read_many(store):
+    store.write("pynball", "PYNBALL:3.10", "/py310")
+    assert store.read_many("pynball", ["PYNBALL:3.10", "PYNBALL:3.9"]) == {
+        "PYNBALL:3.10": "/py310",
+        "PYNBALL:3.9": None,
+    }
+
+
+def test_registry_store_keeps_shards_out_of_environment(registry_store, monkeypatch):
+    create_key = mock.MagicMock(return_value="HKEY")
+    monkeypatch.setattr(pb.winreg, "CreateKey", create_key)
+    monkeypatch.setattr(pb.winreg, "QueryValueEx", mock.MagicMock(return_value=("", 1)))
+
+    registry_store.read_many("pynball", ["PYNBALL:3.10"])
+
+    create_key.assert_called_once_with(pb._USER_KEY, pb._PYNBALL_SUBKEY)
+
+
+def test_env_functions_round_trip(store):
+    pb._setenv("user", "NAME", "value")
+    pb._clear_env_cache()
+    assert pb._getenv("user", "NAME") == "value"
+    pb._delenv("user", "NAME")
+    pb._clear_env_cache()
+    assert pb._getenv("user", "NAME") is None
+
+
+def test_env_transaction_flushes_to_store(store):
+    store.write("user", "KEEP", "1")
+    with pb._env_transaction():
+        pb._setenv("user", "A", "1")
+        pb._setenv("system", "B", "2")
+        pb._delenv("user", "KEEP")
+    assert store.read("user", "A") == "1"
+    assert store.read("system", "B") == "2"
+    assert store.read("user", "KEEP") is None
+
+
+def test_commands_against_store(store, runner, tmp_path):
+    py310 = tmp_path / "py310"
+    make_python_exe(py310)
+    py39 = tmp_path / "py39"
+    make_python_exe(py39)
+    store.write("system", "PATH", str(py39))
+
+    runner.invoke(pb.cli, ["add", "3.10", str(py310)])
+    runner.invoke(pb.cli, ["add", "3.9", str(py39)])
+    pb._clear_env_cache()
+    result = runner.invoke(pb.cli, ["versions"])
+
+    assert result.exit_code == 0
+    assert f"3.9       {py39} : --> System Interpreter" in result.output
+
+    runner.invoke(pb.cli, ["system", "3.10"])
+    runner.invoke(pb.cli, ["delete", "3.9"])
+    pb._clear_env_cache()
+
+    assert store.read("system", "PATH") == str(py310)
+    assert pb._get_index("PYNBALL") == ["3.10"]
+
+
+# ---------------------------------------------------------------------------
+# _FileStore
+# ---------------------------------------------------------------------------
+
+
+def test_file_store_layout(file_store):
+    file_store.write("user", "NAME", "value")
+    assert json.loads(file_store.path.read_text()) == {"user": {"NAME": "value"}}
+
+
+def test_file_store_empty_file(file_store):
+    file_store.path.parent.mkdir(parents=True)
+    file_store.path.write_text("")
+    assert file_store.read("user", "NAME") is None
+
+
+def test_file_store_write_replaces_atomically(file_store, monkeypatch):
+    file_store.write("user", "NAME", "value")
+    replace = mock.MagicMock(wraps=os.replace)
+    monkeypatch.setattr(pb.os, "replace", replace)
+
+    file_store.write("user", "NAME", "new")
+
+    replace.assert_called_once()
+    source, target = replace.call_args.args
+    assert Path(target) == file_store.path
+    assert Path(source).parent == file_store.path.parent
+    assert list(file_store.path.parent.iterdir()) == [file_store.path]
+
+
+def test_file_store_failed_write_leaves_original(file_store, monkeypatch):
+    file_store.write("user", "NAME", "value")
+    monkeypatch.setattr(pb.os, "replace", mock.MagicMock(side_effect=OSError))
+
+    with pytest.raises(OSError):
+        file_store.write("user", "NAME", "new")
+
+    assert json.loads(file_store.path.read_text()) == {"user": {"NAME": "value"}}
+    assert list(file_store.path.parent.iterdir()) == [file_store.path]
+
+
+def test_file_store_reparses_only_on_change(file_store, monkeypatch):
+    file_store.write("user", "NAME", "value")
+    other = pb._FileStore(file_store.path)
+    loads = mock.MagicMock(wraps=json.loads)
+    monkeypatch.setattr(pb.json, "loads", loads)
+
+    assert other.read("user", "NAME") == "value"
+    assert other.read("user", "NAME") == "value"
+    assert loads.call_count == 1
+
+    file_store.write("user", "NAME", "changed value")
+
+    assert other.read("user", "NAME") == "changed value"
+    assert loads.call_count == 2
+
+
+# ---------------------------------------------------------------------------
+# change notification
+# ---------------------------------------------------------------------------
+
+
+def test_file_store_changed_after_external_write(file_store):
+    assert file_store.changed() is False
+    pb._FileStore(file_store.path).write("user", "NAME", "value")
+
+    assert file_store.changed() is True
+    assert file_store.changed() is False
+
+
+def test_file_store_falls_back_to_stat_polling(file_store, monkeypatch):
+    def no_inotify(_path):
+        raise OSError("inotify unavailable")
+
+    monkeypatch.setattr(pb, "_InotifyWatcher", no_inotify)
+    file_store.changed()
+    assert isinstance(file_store._watcher, pb._StatWatcher)
+
+    pb._FileStore(file_store.path).write("user", "NAME", "value")
+    assert file_store.changed() is True
+    assert file_store.changed() is False
+
+
+def test_external_change_invalidates_env_cache(file_store):
+    pb._setenv("user", "NAME", "value")
+    assert pb._getenv("user", "NAME") == "value"
+
+    pb._FileStore(file_store.path).write("user", "NAME", "changed value")
+
+    assert pb._getenv("user", "NAME") == "changed value"
+    assert pb._ENV_CACHE_STATS["invalidations"] == 1
+
+
+def test_write_back_after_external_change(file_store):
+    pb._setenv("user", "NAME", "value")
+
+    pb._FileStore(file_store.path).write("user", "NAME", "changed value")
+    pb._setenv("user", "NAME", "value")
+
+    assert pb._FileStore(file_store.path).read("user", "NAME") == "value"
+
+
+def test_registry_read_checks_for_changes_once_per_batch(file_store, monkeypatch):
+    pb._set_registry(
+        pb.VersionRegistry({f"3.{minor}": f"/py3{minor}" for minor in range(1000)}),
+        "PYNBALL",
+    )
+    pb._ENV_CACHE.clear()
+    checks = []
+    file_store_changed = pb._FileStore.changed
+
+    def changed(store):
+        checks.append(store)
+        return file_store_changed(store)
+
+    monkeypatch.setattr(pb._FileStore, "changed", changed)
+
+    assert len(pb._get_registry("PYNBALL")) == 1000
+    assert len(checks) <= 2
+
+
+def test_own_writes_keep_env_cache(file_store):
+    pb._getenv("user", "NAME")
+    pb._setenv("user", "NAME", "value")
+    with pb._env_transaction():
+        pb._setenv("user", "OTHER", "value")
+    pb._delenv("user", "NAME")
+    reads = pb._ENV_CACHE_STATS["reads"]
+
+    assert pb._getenv("user", "OTHER") == "value"
+    assert pb._getenv("user", "NAME") is None
+    assert pb._ENV_CACHE_STATS["reads"] == reads
+    assert pb._ENV_CACHE_STATS["invalidations"] == 0
+
+
+def test_registry_store_without_notifications_never_changes(monkeypatch):
+    store = pb._RegistryStore()
+
+    def unavailable(_keys):
+        raise OSError("RegNotifyChangeKeyValue unavailable")
+
+    monkeypatch.setattr(pb, "_RegistryWatcher", unavailable)
+
+    assert store.changed() is False
+    assert store.changed() is False
+
+
+def test_registry_store_reports_watcher_changes(monkeypatch):
+    store = pb._RegistryStore()
+    watcher = mock.MagicMock()
+    watcher.changed.return_value = True
+    monkeypatch.setattr(pb, "_RegistryWatcher", lambda _keys: watcher)
+
+    assert store.changed() is False
+    assert store.changed() is True